@@ -7,7 +7,8 @@ import json
 from datetime import datetime, timezone
 from urllib.parse import quote
 
-from utils.auth import get_clerk_user_id
+from utils.auth import get_clerk_user_id, invalidate_clerk_user
+from utils.request_cache import get_cached_founder_id, set_cached_founder_id
 from utils.validation import sanitize_string, validate_integer, sanitize_list, validate_enum
 from utils.logger import log_error, log_warning, log_info, sanitize_error_for_user
 from utils.rate_limit import init_rate_limiter, RATE_LIMITS
@@ -33,6 +34,7 @@ CORS(app, resources={
         ],
         "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
         "allow_headers": ["Content-Type", "X-Clerk-User-Id", "X-User-Email", "X-User-Name"],
+        "expose_headers": ["X-Total-Count", "X-Next-Cursor"],
         "supports_credentials": True
     }
 })
@@ -59,10 +61,14 @@ def _get_founder_id_from_clerk(clerk_user_id):
     """Get founder ID from clerk_user_id. Returns (founder_id, error_response) tuple.
     If successful, error_response is None. If failed, founder_id is None.
     """
+    founder_id = get_cached_founder_id(clerk_user_id)
+    if founder_id:
+        return founder_id, None
     supabase = get_supabase()
     founder = supabase.table('founders').select('id').eq('clerk_user_id', clerk_user_id).execute()
     if not founder.data:
         return None, (jsonify({"error": "Founder not found"}), 404)
+    set_cached_founder_id(clerk_user_id, founder.data[0]['id'])
     return founder.data[0]['id'], None
 
 @app.route('/')
@@ -637,6 +643,7 @@ def save_onboarding():
             
             if not result.data:
                 return jsonify({"error": "Failed to update founder"}), 500
+            subscription_service.invalidate_checkout_contact(clerk_user_id)
             
             # Add projects if provided (only add new ones, skip if already exists)
             if data.get('projects'):
@@ -714,6 +721,7 @@ def save_onboarding():
             
             if not result.data:
                 return jsonify({"error": "Failed to create founder"}), 500
+            subscription_service.invalidate_checkout_contact(clerk_user_id)
             
             founder_id = result.data[0]['id']
 
@@ -1422,6 +1430,7 @@ def delete_account():
         
         # 8. Remove from workspace participants
         supabase.table('workspace_participants').delete().eq('user_id', founder_id).execute()
+        workspace_service.invalidate_workspace_access(clerk_user_id=clerk_user_id)
         
         # 9. Delete messages sent by this user
         supabase.table('messages').delete().eq('sender_id', founder_id).execute()
@@ -1478,6 +1487,8 @@ def delete_account():
             'looking_for_description': None,
             'compatibility_answers': None,
         }).eq('id', founder_id).execute()
+        invalidate_clerk_user(clerk_user_id)
+        subscription_service.invalidate_checkout_contact(clerk_user_id)
         
         log_info(f"Account deleted: {founder_id} ({founder_name})")
         
@@ -1851,19 +1862,18 @@ def get_unread_count():
 @limiter.limit(RATE_LIMITS['strict'])
 def handle_subscription_webhook():
     """Handle Dodo Payments webhook events for subscriptions using Standard Webhooks"""
-    import json as json_module
-    
     try:
-        # Get raw body for signature verification (must be done before parsing JSON)
-        body = request.get_data()
-        headers = dict(request.headers)
+        # Get raw body bytes for signature verification (must be done before parsing JSON).
+        # Not cached on the request: the bytes are passed straight through to verification.
+        body = request.get_data(cache=False)
+        headers = request.headers
         
         # Log incoming webhook for debugging
         log_info(f"Received Dodo billing webhook, content-length: {len(body)}")
         
         # Always log the raw payload for debugging (truncated)
         try:
-            raw_payload = json_module.loads(body)
+            raw_payload = subscription_service.parse_webhook_body(body)
             event_type_raw = raw_payload.get('type', 'unknown')
             log_info(f"Raw webhook event: {event_type_raw}")
             
@@ -1887,7 +1897,7 @@ def handle_subscription_webhook():
             log_error("Webhook validation failed - attempting fallback")
             # Fallback: try parsing JSON directly (for debugging only)
             try:
-                webhook_data = json_module.loads(body)
+                webhook_data = subscription_service.parse_webhook_body(body)
                 log_info("Using fallback JSON parsing (signature not verified)")
             except:
                 log_error("Fallback JSON parsing also failed")
@@ -1896,11 +1906,18 @@ def handle_subscription_webhook():
         event_type = webhook_data.get('type', 'unknown')
         log_info(f"Webhook event type: {event_type}")
         
-        # Handle subscription webhook event
+        # Handle subscription webhook event. Processing stays in the request so
+        # nothing is acknowledged before it is persisted; a transient failure
+        # gets a non-2xx so Dodo redelivers it.
         result = subscription_service.handle_subscription_webhook(webhook_data)
         
         log_info(f"Webhook processing result: {result}")
         
+        if result.get('status') == 'error':
+            if result.get('retryable', True):
+                return jsonify(result), 500
+            # Bad payload (e.g. missing metadata): a retry can never succeed
+            log_error(f"Dropping unprocessable {event_type} webhook: {result.get('message')}")
         return jsonify(result), 200
     except Exception as e:
         error_trace = traceback.format_exc()
@@ -3338,9 +3355,17 @@ def get_workspace_feed(workspace_id):
         
         limit = request.args.get('limit', 50, type=int)
         offset = request.args.get('offset', 0, type=int)
+        before = request.args.get('before')
         
-        posts = feed_service.get_feed_posts(clerk_user_id, workspace_id, limit, offset)
-        return jsonify(posts), 200
+        posts, total, next_cursor = feed_service.get_feed_posts(
+            clerk_user_id, workspace_id, limit, offset, before
+        )
+        response = jsonify(posts)
+        # Paging metadata travels in headers so the body stays a plain list
+        response.headers['X-Total-Count'] = str(total)
+        if next_cursor:
+            response.headers['X-Next-Cursor'] = next_cursor
+        return response, 200
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
@@ -4637,6 +4662,8 @@ def subscribe_plan():
         checkout = subscription_service.create_subscription_checkout(clerk_user_id, new_plan)
         
         return jsonify(checkout), 200
+    except subscription_service.PaymentProviderUnavailable as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": str(e.retry_after)}
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
@@ -4741,6 +4768,8 @@ def subscribe_advisor_pro():
             clerk_user_id, billing_cycle
         )
         return jsonify(checkout), 200
+    except subscription_service.PaymentProviderUnavailable as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": str(e.retry_after)}
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
@@ -4923,45 +4952,24 @@ def purchase_credits():
         pack = packs[pack_key]
         
         # Map pack to Dodo product ID (reusing existing products)
-        DODO_PRODUCT_PRO_ID = os.getenv('DODO_PRODUCT_PRO_ID')
-        DODO_PRODUCT_PRO_PLUS_ID = os.getenv('DODO_PRODUCT_PRO_PLUS_ID')
-        DODO_PRODUCT_ADVISOR_PROJECT_ID = os.getenv('DODO_PRODUCT_ADVISOR_PROJECT_ID')
-        
-        product_id_map = {
-            'starter': DODO_PRODUCT_PRO_ID,
-            'growth': DODO_PRODUCT_PRO_PLUS_ID,
-            'pro': DODO_PRODUCT_ADVISOR_PROJECT_ID,
-        }
-        
-        product_id = product_id_map.get(pack_key)
+        product_id = subscription_service.CREDIT_PACK_PRODUCT_IDS.get(pack_key)
         if not product_id:
             return jsonify({"error": f"Dodo product not configured for {pack_key}"}), 400
         
         # Get user's email
-        supabase = get_supabase()
-        profile = supabase.table('founders').select('email, name').eq('clerk_user_id', clerk_user_id).execute()
-        
-        user_email = None
-        user_name = ''
-        
-        if profile.data:
-            user_email = profile.data[0].get('email')
-            user_name = profile.data[0].get('name', '')
-        
-        if not user_email or '@' not in user_email:
-            from utils.auth import get_clerk_user_email
-            user_email = get_clerk_user_email(clerk_user_id)
+        from services.subscription_service import _resolve_checkout_contact
+        user_email, user_name, _ = _resolve_checkout_contact(clerk_user_id)
         
         if not user_email or '@' not in user_email:
             return jsonify({"error": "User email not found. Please complete your profile."}), 400
         
         # Create Dodo checkout session
-        from services.subscription_service import _get_dodo_client, DODO_ENVIRONMENT
-        FRONTEND_URL = os.getenv('FRONTEND_URL', 'http://localhost:3000').rstrip('/')
+        from services.subscription_service import _get_dodo_client, FRONTEND_URL
         
         client = _get_dodo_client()
         
-        payment = client.payments.create(
+        payment = subscription_service._call_dodo_checkout(
+            client.payments.create,
             billing={
                 "city": "San Francisco",
                 "country": "US",
@@ -4998,6 +5006,8 @@ def purchase_credits():
             },
         }), 200
         
+    except subscription_service.PaymentProviderUnavailable as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": str(e.retry_after)}
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
@@ -1,7 +1,21 @@
-"""Database configuration and Supabase client initialization"""
+"""Database configuration and Supabase client initialization
+
+All database access goes through PostgREST over HTTP, so connection pooling
+and statement preparation happen inside Supabase. Any direct Postgres
+connection added later (psycopg, asyncpg, SQLAlchemy) must go through the
+Supavisor transaction pooler with prepared statements disabled
+(prepare_threshold=None / statement_cache_size=0) and no app-side pool
+(NullPool), or statements will fail or pile up across pooled backends.
+"""
 import os
+import httpx
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from supabase import create_client, Client, ClientOptions
+
+try:
+    import orjson
+except ImportError:  # optional; fall back to httpx's stdlib json decoding
+    orjson = None
 
 load_dotenv()
 
@@ -17,9 +31,56 @@ if not SUPABASE_URL or not SUPABASE_KEY:
         "Please configure these in your environment or .env file."
     )
 
+# HTTP connection pool per client (per worker process)
+# Sized so concurrent reads (utils.parallel) across request threads don't
+# queue on connection acquisition
+SUPABASE_MAX_CONNECTIONS = int(os.environ.get('SUPABASE_MAX_CONNECTIONS', '100'))
+SUPABASE_MAX_KEEPALIVE = int(os.environ.get('SUPABASE_MAX_KEEPALIVE', '50'))
+SUPABASE_KEEPALIVE_EXPIRY = float(os.environ.get('SUPABASE_KEEPALIVE_EXPIRY', '30'))
+SUPABASE_HTTP_TIMEOUT = float(os.environ.get('SUPABASE_HTTP_TIMEOUT', '120'))
+SUPABASE_CONNECT_TIMEOUT = float(os.environ.get('SUPABASE_CONNECT_TIMEOUT', '3'))
+
+
+class _OrjsonResponse(httpx.Response):
+    """httpx response whose json() decodes with orjson (PostgREST calls json() on every result)"""
+
+    def json(self, **kwargs):
+        if kwargs:
+            return super().json(**kwargs)
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError, which postgrest catches
+        return orjson.loads(self.content)
+
+
+class _OrjsonTransport(httpx.HTTPTransport):
+    """HTTP transport that hands back _OrjsonResponse instances"""
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        response = super().handle_request(request)
+        response.__class__ = _OrjsonResponse
+        return response
+
+
+def _client_options() -> ClientOptions:
+    """Client options with a bounded, keep-alive httpx pool reused by every query"""
+    limits = httpx.Limits(
+        max_connections=SUPABASE_MAX_CONNECTIONS,
+        max_keepalive_connections=SUPABASE_MAX_KEEPALIVE,
+        keepalive_expiry=SUPABASE_KEEPALIVE_EXPIRY,
+    )
+    transport_cls = _OrjsonTransport if orjson is not None else httpx.HTTPTransport
+    http_client = httpx.Client(
+        transport=transport_cls(limits=limits, http2=True),
+        # Fail fast when Supabase is unreachable; keep the long read timeout for slow RPCs
+        timeout=httpx.Timeout(SUPABASE_HTTP_TIMEOUT, connect=SUPABASE_CONNECT_TIMEOUT),
+        follow_redirects=True,
+    )
+    return ClientOptions(httpx_client=http_client)
+
+
 # Initialize Supabase client with anon key (for RLS-protected operations)
+# Created once per process; get_supabase() always returns this instance.
 try:
-    supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY, options=_client_options())
 except Exception as e:
     # Error initializing Supabase client
     supabase = None
@@ -28,7 +89,7 @@ except Exception as e:
 supabase_admin: Client = None
 if SUPABASE_SERVICE_ROLE_KEY:
     try:
-        supabase_admin = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+        supabase_admin = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY, options=_client_options())
     except Exception as e:
         # Error initializing Supabase admin client
         supabase_admin = None
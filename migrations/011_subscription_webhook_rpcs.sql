@@ -0,0 +1,23 @@
+-- Subscription webhook RPCs
+-- Collapse multi-statement webhook writes into single round-trips.
+
+-- subscription.cancelled: mark founder + advisor rows cancelled in one statement.
+-- Returns the affected founder and whether their paid period has already ended,
+-- so the caller only runs the FREE downgrade (workspace cleanup) when needed.
+CREATE OR REPLACE FUNCTION cancel_subscription_by_id(p_subscription_id TEXT)
+RETURNS TABLE (clerk_user_id TEXT, period_ended BOOLEAN)
+LANGUAGE sql
+AS $$
+    WITH advisor AS (
+        UPDATE advisor_profiles
+        SET subscription_status = 'cancelled'
+        WHERE subscription_id = p_subscription_id
+    )
+    UPDATE founders f
+    SET subscription_status = 'canceled'
+    WHERE f.subscription_id = p_subscription_id
+    RETURNING
+        f.clerk_user_id,
+        (f.subscription_current_period_end IS NULL
+            OR f.subscription_current_period_end <= NOW()) AS period_ended;
+$$;
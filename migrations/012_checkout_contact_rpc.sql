@@ -0,0 +1,23 @@
+-- Checkout contact RPC
+-- Read a founder's checkout contact and backfill a missing email in one round-trip.
+-- p_fallback_email is persisted, so only pass an email verified through Clerk (never the X-User-Email header).
+
+CREATE OR REPLACE FUNCTION get_or_sync_founder_email(p_clerk_user_id TEXT, p_fallback_email TEXT)
+RETURNS TABLE (id UUID, email TEXT, name TEXT)
+LANGUAGE sql
+AS $$
+    WITH updated AS (
+        UPDATE founders f
+        SET email = p_fallback_email
+        WHERE f.clerk_user_id = p_clerk_user_id
+          AND p_fallback_email IS NOT NULL
+          AND (f.email IS NULL OR POSITION('@' IN f.email) = 0)
+        RETURNING f.id, f.email, f.name
+    )
+    SELECT u.id::UUID, u.email::TEXT, u.name::TEXT FROM updated u
+    UNION ALL
+    SELECT f.id::UUID, f.email::TEXT, f.name::TEXT
+    FROM founders f
+    WHERE f.clerk_user_id = p_clerk_user_id
+      AND NOT EXISTS (SELECT 1 FROM updated);
+$$;
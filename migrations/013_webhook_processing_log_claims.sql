@@ -0,0 +1,21 @@
+-- Webhook idempotency claims
+-- payment.succeeded claims its webhook_id with INSERT ... ON CONFLICT DO NOTHING,
+-- which needs webhook_id to be unique. The existing on_conflict='webhook_id'
+-- upsert in _log_webhook_success already relies on a unique constraint, so
+-- this only adds an index when no unique index on (webhook_id) exists yet.
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM pg_index i
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+        WHERE i.indrelid = 'webhook_processing_log'::regclass
+          AND i.indisunique
+          AND i.indnkeyatts = 1
+          AND a.attname = 'webhook_id'
+    ) THEN
+        CREATE UNIQUE INDEX idx_webhook_processing_log_webhook_id
+            ON webhook_processing_log (webhook_id);
+    END IF;
+END $$;
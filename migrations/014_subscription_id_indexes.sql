@@ -0,0 +1,11 @@
+-- Subscription ID indexes
+-- Dodo webhooks look up founders and advisor_profiles by subscription_id.
+-- CONCURRENTLY avoids locking the tables; run this file outside a transaction block.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_founders_subscription_id
+    ON founders (subscription_id)
+    WHERE subscription_id IS NOT NULL;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_advisor_profiles_subscription_id
+    ON advisor_profiles (subscription_id)
+    WHERE subscription_id IS NOT NULL;
@@ -0,0 +1,49 @@
+-- Skip project RPC
+-- Run the discovery left-swipe (founder lookup, project check, duplicate check,
+-- swipe insert and swipe_history row) as one transaction in a single round-trip.
+-- Returns one of: 'profile_not_found', 'project_not_found', 'already_skipped', 'skipped'.
+
+CREATE OR REPLACE FUNCTION skip_project_tx(p_clerk_user_id TEXT, p_project_id UUID)
+RETURNS TEXT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_seeker_id UUID;
+    v_project_founder_id UUID;
+BEGIN
+    SELECT f.id INTO v_seeker_id
+    FROM founders f
+    WHERE f.clerk_user_id = p_clerk_user_id
+    LIMIT 1;
+
+    IF v_seeker_id IS NULL THEN
+        RETURN 'profile_not_found';
+    END IF;
+
+    SELECT p.founder_id INTO v_project_founder_id
+    FROM projects p
+    WHERE p.id = p_project_id;
+
+    IF NOT FOUND THEN
+        RETURN 'project_not_found';
+    END IF;
+
+    IF EXISTS (
+        SELECT 1 FROM swipes s
+        WHERE s.swiper_id = v_seeker_id
+          AND s.project_id = p_project_id
+          AND s.swipe_type = 'left'
+    ) THEN
+        RETURN 'already_skipped';
+    END IF;
+
+    INSERT INTO swipes (swiper_id, swiped_id, project_id, swipe_type)
+    VALUES (v_seeker_id, v_project_founder_id, p_project_id, 'left');
+
+    -- swipe_history drives the daily limit window
+    INSERT INTO swipe_history (user_id, swipe_type, project_id, swipe_date)
+    VALUES (v_seeker_id, 'left', p_project_id, NOW());
+
+    RETURN 'skipped';
+END;
+$$;
@@ -0,0 +1,60 @@
+-- Unique left swipe per seeker/project
+-- Lets skip_project_tx merge its duplicate check and insert into one
+-- INSERT ... ON CONFLICT DO NOTHING, which also closes the race where two
+-- concurrent skips both pass the EXISTS check.
+
+-- Drop duplicate left swipes, keeping one row per seeker/project
+DELETE FROM swipes s
+USING swipes d
+WHERE s.swipe_type = 'left'
+  AND d.swipe_type = 'left'
+  AND s.swiper_id = d.swiper_id
+  AND s.project_id = d.project_id
+  AND s.id > d.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS swipes_left_swiper_project_uniq
+    ON swipes (swiper_id, project_id)
+    WHERE swipe_type = 'left';
+
+CREATE OR REPLACE FUNCTION skip_project_tx(p_clerk_user_id TEXT, p_project_id UUID)
+RETURNS TEXT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_seeker_id UUID;
+    v_project_founder_id UUID;
+    v_inserted INTEGER;
+BEGIN
+    SELECT f.id INTO v_seeker_id
+    FROM founders f
+    WHERE f.clerk_user_id = p_clerk_user_id
+    LIMIT 1;
+
+    IF v_seeker_id IS NULL THEN
+        RETURN 'profile_not_found';
+    END IF;
+
+    SELECT p.founder_id INTO v_project_founder_id
+    FROM projects p
+    WHERE p.id = p_project_id;
+
+    IF NOT FOUND THEN
+        RETURN 'project_not_found';
+    END IF;
+
+    INSERT INTO swipes (swiper_id, swiped_id, project_id, swipe_type)
+    VALUES (v_seeker_id, v_project_founder_id, p_project_id, 'left')
+    ON CONFLICT (swiper_id, project_id) WHERE swipe_type = 'left' DO NOTHING;
+
+    GET DIAGNOSTICS v_inserted = ROW_COUNT;
+    IF v_inserted = 0 THEN
+        RETURN 'already_skipped';
+    END IF;
+
+    -- swipe_history drives the daily limit window
+    INSERT INTO swipe_history (user_id, swipe_type, project_id, swipe_date)
+    VALUES (v_seeker_id, 'left', p_project_id, NOW());
+
+    RETURN 'skipped';
+END;
+$$;
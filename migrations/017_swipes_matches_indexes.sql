@@ -0,0 +1,23 @@
+-- Swipe and match lookup indexes
+-- Composite indexes for the hot swipes/matches filters so they stay index
+-- probes as the tables grow. Left-swipe lookups by seeker are already served by
+-- swipes_left_swiper_project_uniq (016).
+-- CONCURRENTLY avoids locking the tables; run this file outside a transaction block.
+
+-- advanced_search_service: swiper_id = ? AND project_id IN (...)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_swipes_swiper_project
+    ON swipes (swiper_id, project_id);
+
+-- project_cleanup_service: project_id = ? AND swipe_type = 'right'
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_swipes_project_type
+    ON swipes (project_id, swipe_type);
+
+-- application_service.respond_to_application: existing match for a pair + project;
+-- the leading founder1_id also serves the founder1 side of get_matches
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_matches_pair_project
+    ON matches (founder1_id, founder2_id, project_id);
+
+-- match_service.get_matches: founder2 side of the OR over active matches
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_matches_founder2_active
+    ON matches (founder2_id)
+    WHERE is_expired = FALSE;
@@ -0,0 +1,11 @@
+-- Unique waitlist email
+-- join_waitlist upserts on email with ON CONFLICT DO NOTHING, which needs a
+-- unique index. Emails are stored lower-cased by the service.
+
+-- Drop duplicate signups, keeping one row per email
+DELETE FROM waitlist w
+USING waitlist d
+WHERE w.email = d.email
+  AND w.ctid > d.ctid;
+
+CREATE UNIQUE INDEX IF NOT EXISTS waitlist_email_uniq ON waitlist (email);
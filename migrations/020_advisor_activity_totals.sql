@@ -0,0 +1,17 @@
+-- Advisor activity totals RPC
+-- get_activity_summary used to pull every activity log, meeting and feed post
+-- row for a workspace just to sum hours and count rows in Python.
+
+CREATE OR REPLACE FUNCTION get_advisor_activity_totals(p_workspace_id UUID)
+RETURNS TABLE (total_hours NUMERIC, total_meetings BIGINT, total_posts BIGINT)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        (SELECT COALESCE(SUM(l.hours), 0) FROM advisor_activity_logs l
+            WHERE l.workspace_id = p_workspace_id),
+        (SELECT COUNT(*) FROM workspace_meetings m
+            WHERE m.workspace_id = p_workspace_id),
+        (SELECT COUNT(*) FROM workspace_feed_posts p
+            WHERE p.workspace_id = p_workspace_id);
+$$;
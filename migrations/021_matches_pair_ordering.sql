@@ -0,0 +1,52 @@
+-- Match pair ordering in the schema
+-- matches stores each founder pair as (founder1_id, founder2_id) with
+-- founder1_id < founder2_id. That convention used to be enforced only by
+-- min()/max() in application code; a trigger now normalizes every write and a
+-- unique index lets callers create matches with INSERT ... ON CONFLICT.
+
+CREATE OR REPLACE FUNCTION normalize_match_pair()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_swap UUID;
+BEGIN
+    IF NEW.founder1_id > NEW.founder2_id THEN
+        v_swap := NEW.founder1_id;
+        NEW.founder1_id := NEW.founder2_id;
+        NEW.founder2_id := v_swap;
+    END IF;
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS matches_normalize_pair ON matches;
+CREATE TRIGGER matches_normalize_pair
+    BEFORE INSERT OR UPDATE OF founder1_id, founder2_id ON matches
+    FOR EACH ROW EXECUTE FUNCTION normalize_match_pair();
+
+-- Duplicate matches are referenced by workspaces and messages, so they are not
+-- deleted here; resolve any reported pairs by hand before re-running.
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM matches
+        WHERE project_id IS NOT NULL
+        GROUP BY LEAST(founder1_id, founder2_id), GREATEST(founder1_id, founder2_id), project_id
+        HAVING COUNT(*) > 1
+    ) THEN
+        RAISE EXCEPTION 'matches has duplicate founder pairs per project; resolve them before adding matches_pair_project_uniq';
+    END IF;
+END;
+$$;
+
+-- Normalize legacy rows written before the trigger existed
+UPDATE matches
+SET founder1_id = founder2_id, founder2_id = founder1_id
+WHERE founder1_id > founder2_id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS matches_pair_project_uniq
+    ON matches (founder1_id, founder2_id, project_id);
+
+-- Superseded by the unique index above (017)
+DROP INDEX IF EXISTS idx_matches_pair_project;
@@ -0,0 +1,19 @@
+-- Case-insensitive founder lookup by email
+-- The _get_founder_id email fallback used to fetch every founder and compare
+-- lower(trim(email)) in Python. This function does the same comparison in
+-- Postgres against a matching expression index.
+-- CONCURRENTLY avoids locking founders; run this file outside a transaction block.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_founders_email_normalized
+    ON founders (lower(btrim(email)));
+
+CREATE OR REPLACE FUNCTION find_founder_by_email(p_email TEXT)
+RETURNS TABLE (id UUID, clerk_user_id TEXT)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT f.id, f.clerk_user_id::TEXT
+    FROM founders f
+    WHERE lower(btrim(f.email)) = lower(btrim(p_email))
+    LIMIT 1;
+$$;
@@ -0,0 +1,23 @@
+-- Workspace access RPC
+-- Resolve the caller's founder id, their participant role and the workspace's
+-- archived flag in one round-trip for workspace_service access checks.
+-- Returns no row when the clerk user has no founder profile.
+
+CREATE OR REPLACE FUNCTION check_workspace_access(p_clerk_user_id TEXT, p_workspace_id UUID)
+RETURNS TABLE (founder_id UUID, is_participant BOOLEAN, role TEXT, is_archived BOOLEAN)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        f.id,
+        wp.id IS NOT NULL,
+        wp.role::TEXT,
+        COALESCE(w.is_archived, FALSE)
+    FROM founders f
+    LEFT JOIN workspace_participants wp
+        ON wp.user_id = f.id AND wp.workspace_id = p_workspace_id
+    LEFT JOIN workspaces w
+        ON w.id = p_workspace_id
+    WHERE f.clerk_user_id = p_clerk_user_id
+    LIMIT 1;
+$$;
@@ -0,0 +1,18 @@
+-- Application status counts RPC
+-- get_application_stats used to fetch every application's status for an owner
+-- and count them in Python; this returns the counts directly.
+
+CREATE OR REPLACE FUNCTION application_status_counts(p_owner_id UUID)
+RETURNS TABLE (total BIGINT, pending BIGINT, accepted BIGINT, rejected BIGINT, withdrawn BIGINT)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        COUNT(*),
+        COUNT(*) FILTER (WHERE status = 'pending'),
+        COUNT(*) FILTER (WHERE status = 'accepted'),
+        COUNT(*) FILTER (WHERE status = 'rejected'),
+        COUNT(*) FILTER (WHERE status = 'withdrawn')
+    FROM applications
+    WHERE project_owner_id = p_owner_id;
+$$;
@@ -0,0 +1,42 @@
+-- Workspace creation RPC
+-- Insert a match's workspace and both participant rows in one transaction, so
+-- a failed participants insert can no longer leave an orphaned workspace.
+-- Plan limits are still checked by the caller (they depend on plan config in
+-- plan_service). Returns the existing workspace id if one was created
+-- concurrently for the same match.
+
+CREATE OR REPLACE FUNCTION create_workspace_for_match_tx(
+    p_match_id UUID,
+    p_project_id UUID,
+    p_founder1_id UUID,
+    p_founder2_id UUID
+)
+RETURNS UUID
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_workspace_id UUID;
+BEGIN
+    -- Serialize concurrent creations for the same match
+    PERFORM 1 FROM matches WHERE id = p_match_id FOR UPDATE;
+
+    SELECT w.id INTO v_workspace_id
+    FROM workspaces w
+    WHERE w.match_id = p_match_id
+    LIMIT 1;
+
+    IF v_workspace_id IS NOT NULL THEN
+        RETURN v_workspace_id;
+    END IF;
+
+    INSERT INTO workspaces (match_id, stage, project_id)
+    VALUES (p_match_id, 'idea', p_project_id)
+    RETURNING id INTO v_workspace_id;
+
+    INSERT INTO workspace_participants (workspace_id, user_id)
+    VALUES (v_workspace_id, p_founder1_id),
+           (v_workspace_id, p_founder2_id);
+
+    RETURN v_workspace_id;
+END;
+$$;
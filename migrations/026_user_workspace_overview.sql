@@ -0,0 +1,42 @@
+-- Workspace list view
+-- One row per (participant, workspace) with the project, its owner and the
+-- other founder of the match already resolved, so list_user_workspaces can
+-- read rows straight through instead of reshaping nested embeds in Python.
+-- security_invoker keeps the caller's RLS policies in force.
+
+CREATE OR REPLACE VIEW user_workspace_overview
+WITH (security_invoker = true) AS
+SELECT
+    wp.user_id AS founder_id,
+    w.id,
+    w.title,
+    COALESCE(p.title, w.title) AS project_title,
+    CASE
+        WHEN NULLIF(pf.name, '') IS NOT NULL THEN ARRAY[pf.name]
+        WHEN other.id IS NOT NULL THEN ARRAY[other.name]
+        ELSE ARRAY['Unknown']
+    END AS founder_names,
+    w.stage,
+    w.created_at,
+    CASE WHEN p.id IS NOT NULL THEN
+        to_jsonb(p) || jsonb_build_object('founder', CASE WHEN pf.id IS NOT NULL THEN
+            jsonb_build_object('id', pf.id, 'name', pf.name, 'clerk_user_id', pf.clerk_user_id)
+        END)
+    END AS project,
+    w.match_id,
+    CASE WHEN other.id IS NOT NULL THEN
+        jsonb_build_object('id', other.id, 'name', other.name, 'email', other.email)
+    END AS other_founder,
+    w.is_archived,
+    w.archived_at,
+    w.dissolution_status,
+    w.dissolution_cooloff_ends_at
+FROM workspace_participants wp
+JOIN workspaces w ON w.id = wp.workspace_id
+LEFT JOIN matches m ON m.id = w.match_id
+LEFT JOIN projects p ON p.id = m.project_id
+LEFT JOIN founders pf ON pf.id = p.founder_id
+LEFT JOIN founders other ON other.id = CASE
+    WHEN m.founder1_id = wp.user_id THEN m.founder2_id
+    WHEN m.founder2_id = wp.user_id THEN m.founder1_id
+END;
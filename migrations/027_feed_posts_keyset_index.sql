@@ -0,0 +1,8 @@
+-- Feed keyset pagination index
+-- get_feed_posts pages by (created_at, id) descending within a workspace;
+-- this index serves both the first page and cursor pages without scanning
+-- and discarding earlier rows.
+-- CONCURRENTLY avoids locking workspace_feed_posts; run this file outside a transaction block.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_feed_posts_workspace_created
+    ON workspace_feed_posts (workspace_id, created_at DESC, id DESC);
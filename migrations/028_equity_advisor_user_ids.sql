@@ -0,0 +1,17 @@
+-- Equity scenario advisor check
+-- create_equity_scenario must reject scenarios that allocate equity to a
+-- workspace advisor. Instead of fetching every participant and mapping roles
+-- in Python, return just the proposed user ids that belong to advisors.
+-- Ids arrive as text because they come straight from the scenario JSON.
+
+CREATE OR REPLACE FUNCTION equity_advisor_user_ids(p_workspace_id UUID, p_user_ids TEXT[])
+RETURNS TABLE (user_id UUID)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT wp.user_id
+    FROM workspace_participants wp
+    WHERE wp.workspace_id = p_workspace_id
+      AND wp.role = 'ADVISOR'
+      AND wp.user_id::TEXT = ANY(p_user_ids);
+$$;
@@ -0,0 +1,25 @@
+-- Unique workspace roles and check-in verdicts
+-- upsert_role and set_checkin_verdict upsert with ON CONFLICT on these
+-- column pairs, which needs a unique index on each. The old select-then-
+-- insert flow could race into duplicates. For roles keep the most recently
+-- updated row of each pair (created_at, then id, break ties). Verdicts have
+-- no write timestamp to order by, so any one row per pair is kept.
+
+DELETE FROM workspace_roles r
+USING workspace_roles d
+WHERE r.workspace_id = d.workspace_id
+  AND r.user_id = d.user_id
+  AND (COALESCE(r.updated_at, r.created_at, '-infinity'), COALESCE(r.created_at, '-infinity'), r.id)
+    < (COALESCE(d.updated_at, d.created_at, '-infinity'), COALESCE(d.created_at, '-infinity'), d.id);
+
+CREATE UNIQUE INDEX IF NOT EXISTS workspace_roles_workspace_user_uniq
+    ON workspace_roles (workspace_id, user_id);
+
+DELETE FROM workspace_checkin_verdicts v
+USING workspace_checkin_verdicts d
+WHERE v.checkin_id = d.checkin_id
+  AND v.user_id = d.user_id
+  AND v.id < d.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS workspace_checkin_verdicts_checkin_user_uniq
+    ON workspace_checkin_verdicts (checkin_id, user_id);
@@ -0,0 +1,60 @@
+-- Equity scenario + approval RPC
+-- create_equity_scenario inserted the scenario, created its approval, then
+-- updated the scenario with the approval id, deleting the scenario by hand
+-- if the approval failed. This does all three writes in one transaction and
+-- returns the finished scenario row along with whoever must approve it.
+-- Returns no row when the workspace has no other participant to approve.
+
+CREATE OR REPLACE FUNCTION create_equity_scenario_with_approval(
+    p_workspace_id UUID,
+    p_proposer_id UUID,
+    p_label TEXT,
+    p_data JSONB,
+    p_proposed_data JSONB
+)
+RETURNS TABLE (scenario JSONB, approval_id UUID, approver_id UUID, proposer_name TEXT)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_approver_id UUID;
+    v_scenario workspace_equity_scenarios%ROWTYPE;
+    v_approval_id UUID;
+BEGIN
+    SELECT f.id INTO v_approver_id
+    FROM workspace_participants wp
+    JOIN founders f ON f.id = wp.user_id
+    WHERE wp.workspace_id = p_workspace_id
+      AND wp.user_id <> p_proposer_id
+    LIMIT 1;
+
+    IF v_approver_id IS NULL THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO workspace_equity_scenarios (
+        workspace_id, label, data, is_current, created_by_user_id, approval_status, status
+    )
+    VALUES (p_workspace_id, p_label, p_data, FALSE, p_proposer_id, 'PENDING', 'active')
+    RETURNING * INTO v_scenario;
+
+    INSERT INTO approvals (
+        workspace_id, entity_type, entity_id, proposed_by_user_id, approver_user_id,
+        proposed_data, status
+    )
+    VALUES (
+        p_workspace_id, 'EQUITY_SCENARIO', v_scenario.id, p_proposer_id, v_approver_id,
+        p_proposed_data, 'PENDING'
+    )
+    RETURNING id INTO v_approval_id;
+
+    UPDATE workspace_equity_scenarios
+    SET approval_id = v_approval_id
+    WHERE id = v_scenario.id
+    RETURNING * INTO v_scenario;
+
+    RETURN QUERY
+    SELECT to_jsonb(v_scenario), v_approval_id, v_approver_id, f.name
+    FROM founders f
+    WHERE f.id = p_proposer_id;
+END;
+$$;
@@ -0,0 +1,19 @@
+-- Set current equity scenario RPC
+-- set_current_equity_scenario cleared is_current on every other scenario in
+-- the workspace and then set it on the chosen one, as two round-trips that
+-- could leave the workspace with no current scenario if the second failed.
+-- A single UPDATE flips all of them at once and returns the chosen row.
+
+CREATE OR REPLACE FUNCTION set_current_equity_scenario_tx(p_workspace_id UUID, p_scenario_id UUID)
+RETURNS SETOF workspace_equity_scenarios
+LANGUAGE sql
+AS $$
+    WITH updated AS (
+        UPDATE workspace_equity_scenarios
+        SET is_current = (id = p_scenario_id),
+            status = CASE WHEN id = p_scenario_id THEN 'active' ELSE 'canceled' END
+        WHERE workspace_id = p_workspace_id
+        RETURNING *
+    )
+    SELECT * FROM updated WHERE id = p_scenario_id;
+$$;
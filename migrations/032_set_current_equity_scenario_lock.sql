@@ -0,0 +1,38 @@
+-- Serialize current equity scenario switches per workspace
+-- The single UPDATE in set_current_equity_scenario_tx (031) already switches
+-- every scenario in one statement. Concurrent "set current" calls for the same
+-- workspace could still interleave with a scenario being inserted or approved
+-- between them. Locking the workspace row first makes switches for a
+-- workspace run one after another. Postgres cannot change a transaction's
+-- isolation level from inside a function, so this uses a row lock rather than
+-- SERIALIZABLE, which also means callers never have to retry on
+-- serialization failures.
+-- Returns no row if the scenario is not in the workspace or not approved.
+
+CREATE OR REPLACE FUNCTION set_current_equity_scenario_tx(p_workspace_id UUID, p_scenario_id UUID)
+RETURNS SETOF workspace_equity_scenarios
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM 1 FROM workspaces WHERE id = p_workspace_id FOR UPDATE;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM workspace_equity_scenarios
+        WHERE id = p_scenario_id
+          AND workspace_id = p_workspace_id
+          AND approval_status = 'APPROVED'
+    ) THEN
+        RETURN;
+    END IF;
+
+    RETURN QUERY
+    WITH updated AS (
+        UPDATE workspace_equity_scenarios
+        SET is_current = (id = p_scenario_id),
+            status = CASE WHEN id = p_scenario_id THEN 'active' ELSE 'canceled' END
+        WHERE workspace_id = p_workspace_id
+        RETURNING *
+    )
+    SELECT * FROM updated WHERE id = p_scenario_id;
+END;
+$$;
@@ -0,0 +1,39 @@
+-- Check-in partner review access RPC
+-- The partner review endpoints checked that the check-in exists in the
+-- workspace, resolved the caller's founder id and participant role, and then
+-- looked up the caller's existing review, one round-trip each. This returns
+-- all of it at once. checkin_workspace_id is NULL when the check-in does not
+-- exist and review_id is NULL when the caller has not reviewed it yet.
+-- Returns no row when the clerk user has no founder profile.
+
+CREATE OR REPLACE FUNCTION check_checkin_review_access(
+    p_clerk_user_id TEXT,
+    p_workspace_id UUID,
+    p_checkin_id UUID
+)
+RETURNS TABLE (
+    founder_id UUID,
+    is_participant BOOLEAN,
+    role TEXT,
+    checkin_workspace_id UUID,
+    review_id UUID
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        f.id,
+        wp.id IS NOT NULL,
+        wp.role::TEXT,
+        c.workspace_id,
+        r.id
+    FROM founders f
+    LEFT JOIN workspace_participants wp
+        ON wp.user_id = f.id AND wp.workspace_id = p_workspace_id
+    LEFT JOIN workspace_checkins c
+        ON c.id = p_checkin_id
+    LEFT JOIN workspace_checkin_partner_reviews r
+        ON r.checkin_id = p_checkin_id AND r.partner_user_id = f.id
+    WHERE f.clerk_user_id = p_clerk_user_id
+    LIMIT 1;
+$$;
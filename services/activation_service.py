@@ -17,6 +17,7 @@ from typing import Dict, Any, List, Optional
 from config.database import get_supabase
 from services import profile_service
 from utils.logger import log_info, log_warning
+from utils.request_cache import cached_founder_id
 
 
 # ============================================================
@@ -152,6 +153,7 @@ BIO_TEMPLATES: List[Dict[str, str]] = [
 # ============================================================
 # Helpers
 # ============================================================
+@cached_founder_id
 def _get_founder_id(clerk_user_id: str) -> Optional[str]:
     supabase = get_supabase()
     result = supabase.table('founders').select('id').eq('clerk_user_id', clerk_user_id).execute()
@@ -1,5 +1,7 @@
 """Advisor service for managing advisor profiles, requests, and workspace access"""
 from config.database import get_supabase
+from utils.auth import fetch_clerk_user_email
+from utils.parallel import gather
 from .notification_service import NotificationService
 from .advisor_verification_service import verify_advisor_profile
 from datetime import datetime, timedelta, timezone
@@ -111,14 +113,29 @@ def create_advisor_profile(clerk_user_id, data, user_name=None, user_email=None)
     
     supabase = get_supabase()
     
-    # Get email from Clerk if not provided
+    def find_existing_profile():
+        # Check if profile exists by clerk_user_id (with fallback via founders for backward compatibility)
+        try:
+            existing = supabase.table('advisor_profiles').select('id, status, max_active_workspaces').eq('clerk_user_id', clerk_user_id).execute()
+            if not existing.data:
+                # Fallback: try via founders table for profiles created before migration
+                founder = supabase.table('founders').select('id').eq('clerk_user_id', clerk_user_id).execute()
+                if founder.data:
+                    existing = supabase.table('advisor_profiles').select('id, status, max_active_workspaces').eq('user_id', founder.data[0]['id']).execute()
+        except Exception as e:
+            raise ValueError("Advisor profiles table not found. Please run database migrations.")
+        return existing
+    
+    # Get email from Clerk if not provided, overlapping the Clerk call with
+    # the profile lookup
     final_email = user_email
     if not final_email or not final_email.strip():
-        try:
-            from utils.auth import get_clerk_user_email
-            final_email = get_clerk_user_email(clerk_user_id)
-        except:
-            pass
+        final_email, existing = gather(
+            lambda: fetch_clerk_user_email(clerk_user_id),
+            find_existing_profile,
+        )
+    else:
+        existing = None
     
     if not final_email or not final_email.strip():
         raise ValueError("Email address is required. Please ensure your account has a valid email address.")
@@ -127,16 +144,8 @@ def create_advisor_profile(clerk_user_id, data, user_name=None, user_email=None)
     if 'headline' not in data or data.get('headline') == '':
         raise ValueError("headline is required")
     
-    # Check if profile exists by clerk_user_id (with fallback via founders for backward compatibility)
-    try:
-        existing = supabase.table('advisor_profiles').select('id, status, max_active_workspaces').eq('clerk_user_id', clerk_user_id).execute()
-        if not existing.data:
-            # Fallback: try via founders table for profiles created before migration
-            founder = supabase.table('founders').select('id').eq('clerk_user_id', clerk_user_id).execute()
-            if founder.data:
-                existing = supabase.table('advisor_profiles').select('id, status, max_active_workspaces').eq('user_id', founder.data[0]['id']).execute()
-    except Exception as e:
-        raise ValueError("Advisor profiles table not found. Please run database migrations.")
+    if existing is None:
+        existing = find_existing_profile()
     
     # Handle max_active_workspaces - required for new profiles, optional for updates
     if existing.data:
@@ -327,8 +336,10 @@ def update_advisor_contact_info(clerk_user_id, contact_info):
     supabase = get_supabase()
     
     # Check if profile exists
-    existing = supabase.table('advisor_profiles').select('id').eq('clerk_user_id', clerk_user_id).execute()
-    if not existing.data:
+    existing = supabase.table('advisor_profiles').select(
+        'id', count='exact', head=True
+    ).eq('clerk_user_id', clerk_user_id).execute()
+    if not existing.count:
         raise ValueError("Advisor profile not found")
     
     update_data = {}
@@ -10,6 +10,7 @@ This service powers the "I have a project" flow where owners:
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any
 from config.database import get_supabase
+from utils import background
 from utils.logger import log_info, log_error
 
 
@@ -256,34 +257,26 @@ def respond_to_application(
     now = datetime.now(timezone.utc).isoformat()
     
     if response == 'accept':
-        # Create match
-        match_data = {
-            'founder1_id': min(owner_id, applicant_id),
-            'founder2_id': max(owner_id, applicant_id),
+        # Create match; the schema orders the founder pair and enforces one
+        # match per pair and project (migrations/021), so an existing match
+        # is a no-op insert
+        match_result = supabase.table('matches').upsert({
+            'founder1_id': owner_id,
+            'founder2_id': applicant_id,
             'project_id': project_id,
-        }
-        
-        # Check if match already exists
-        existing_match = supabase.table('matches').select('id').eq(
-            'founder1_id', match_data['founder1_id']
-        ).eq('founder2_id', match_data['founder2_id']).eq(
-            'project_id', project_id
-        ).execute()
+        }, on_conflict='founder1_id,founder2_id,project_id', ignore_duplicates=True).execute()
         
-        if existing_match.data:
-            match_id = existing_match.data[0]['id']
+        is_new_match = bool(match_result.data)
+        if is_new_match:
+            match_id = match_result.data[0]['id']
         else:
-            match_result = supabase.table('matches').insert(match_data).execute()
-            if not match_result.data:
+            pair = [owner_id, applicant_id]
+            existing_match = supabase.table('matches').select('id').in_(
+                'founder1_id', pair
+            ).in_('founder2_id', pair).eq('project_id', project_id).limit(1).execute()
+            if not existing_match.data:
                 raise ValueError("Failed to create match")
-            match_id = match_result.data[0]['id']
-            
-            # Calculate compatibility score
-            try:
-                from services.compatibility_service import save_compatibility_score
-                save_compatibility_score(match_id, owner_id, applicant_id, project_id)
-            except Exception as e:
-                log_error(f"Failed to calculate compatibility score", error=e)
+            match_id = existing_match.data[0]['id']
         
         # Create workspace
         try:
@@ -295,6 +288,12 @@ def respond_to_application(
             supabase.table('matches').delete().eq('id', match_id).execute()
             raise ValueError("Failed to create workspace for match")
         
+        # Calculate compatibility score off the request path, once the match
+        # is known to survive workspace creation
+        if is_new_match:
+            from services.compatibility_service import save_compatibility_score
+            background.submit(save_compatibility_score, match_id, owner_id, applicant_id, project_id)
+        
         # Mark project as no longer seeking
         supabase.table('projects').update({
             'seeking_cofounder': False
@@ -313,19 +312,11 @@ def respond_to_application(
             'rejection_reason': 'Position has been filled',
         }).eq('project_id', project_id).eq('status', 'pending').execute()
         
-        # Record activation milestones
-        try:
-            from services import activation_service
-            for fid in (owner_id, applicant_id):
-                activation_service.record_milestone(
-                    fid, activation_service.Milestone.FIRST_MATCH,
-                    {'match_id': match_id, 'project_id': project_id},
-                )
-        except Exception:
-            pass
-        
-        # Send notifications to both founders
-        _notify_application_accepted(
+        # Milestones and notifications don't affect the response; run them
+        # in the background so the owner isn't waiting on email delivery
+        background.submit(_record_match_milestones, (owner_id, applicant_id), match_id, project_id)
+        background.submit(
+            _notify_application_accepted,
             applicant_id=applicant_id,
             applicant_email=applicant.get('email'),
             applicant_name=applicant.get('name'),
@@ -350,7 +341,8 @@ def respond_to_application(
         }).eq('id', application_id).execute()
         
         # Send notification
-        _notify_application_rejected(
+        background.submit(
+            _notify_application_rejected,
             applicant_id=applicant_id,
             applicant_email=applicant.get('email'),
             applicant_name=applicant.get('name'),
@@ -376,26 +368,17 @@ def get_application_stats(clerk_user_id: str) -> Dict[str, Any]:
     
     owner_id = owner.data[0]['id']
     
-    # Get counts by status
-    all_apps = supabase.table('applications').select('status').eq(
-        'project_owner_id', owner_id
-    ).execute()
+    # Get counts by status, aggregated in Postgres (migrations/024)
+    counts = supabase.rpc('application_status_counts', {'p_owner_id': owner_id}).execute()
+    row = counts.data[0] if counts.data else {}
     
-    stats = {
-        'total': 0,
-        'pending': 0,
-        'accepted': 0,
-        'rejected': 0,
-        'withdrawn': 0,
+    return {
+        'total': row.get('total', 0),
+        'pending': row.get('pending', 0),
+        'accepted': row.get('accepted', 0),
+        'rejected': row.get('rejected', 0),
+        'withdrawn': row.get('withdrawn', 0),
     }
-    
-    for app in (all_apps.data or []):
-        stats['total'] += 1
-        status = app.get('status', 'pending')
-        if status in stats:
-            stats[status] += 1
-    
-    return stats
 
 
 # ============================================
@@ -418,6 +401,19 @@ def _compute_verification(founder: Dict) -> Dict:
                 'linkedin': False, 'github': False}
 
 
+def _record_match_milestones(founder_ids, match_id: str, project_id: str) -> None:
+    """Record the FIRST_MATCH activation milestone for each founder."""
+    try:
+        from services import activation_service
+        for fid in founder_ids:
+            activation_service.record_milestone(
+                fid, activation_service.Milestone.FIRST_MATCH,
+                {'match_id': match_id, 'project_id': project_id},
+            )
+    except Exception:
+        pass
+
+
 def _notify_application_accepted(
     applicant_id: str,
     applicant_email: str,
@@ -760,11 +760,11 @@ def submit_review(
     supabase = get_supabase()
 
     # Check if already reviewed
-    existing = supabase.table('advisor_consultation_reviews').select('id').eq(
-        'consultation_id', consultation_id
-    ).eq('reviewer_role', reviewer_role).execute()
+    existing = supabase.table('advisor_consultation_reviews').select(
+        'id', count='exact', head=True
+    ).eq('consultation_id', consultation_id).eq('reviewer_role', reviewer_role).execute()
 
-    if existing.data:
+    if existing.count:
         raise ValueError("You have already reviewed this consultation")
 
     payload = {
@@ -952,11 +952,11 @@ def can_review_consultation(clerk_user_id: str, consultation_id: str) -> Dict[st
 
     # Check if already reviewed
     supabase = get_supabase()
-    existing = supabase.table('advisor_consultation_reviews').select('id').eq(
-        'consultation_id', consultation_id
-    ).eq('reviewer_role', reviewer_role).execute()
+    existing = supabase.table('advisor_consultation_reviews').select(
+        'id', count='exact', head=True
+    ).eq('consultation_id', consultation_id).eq('reviewer_role', reviewer_role).execute()
 
-    if existing.data:
+    if existing.count:
         return {
             'can_review': False,
             'reason': 'You have already reviewed this consultation',
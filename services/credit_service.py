@@ -11,6 +11,7 @@ from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any, Tuple
 from config.database import get_supabase
 from utils.logger import log_info, log_error, log_warning
+from utils.request_cache import cached_founder_id
 
 # Signup bonus credits for new users
 SIGNUP_BONUS_CREDITS = 20
@@ -37,6 +38,7 @@ CREDIT_PACKS = {
 }
 
 
+@cached_founder_id
 def _get_founder_id(clerk_user_id: str) -> str:
     """Get founder ID from clerk_user_id."""
     supabase = get_supabase()
@@ -21,15 +21,9 @@ def _verify_founder_access(clerk_user_id, workspace_id):
     founder_id = _get_founder_id(clerk_user_id)
     supabase = get_supabase()
     
-    try:
-        participant = supabase.table('workspace_participants').select('role').eq(
-            'workspace_id', workspace_id
-        ).eq('user_id', founder_id).execute()
-    except Exception:
-        # Fallback if role column doesn't exist yet - assume founder
-        participant = supabase.table('workspace_participants').select('id').eq(
-            'workspace_id', workspace_id
-        ).eq('user_id', founder_id).execute()
+    participant = supabase.table('workspace_participants').select('role').eq(
+        'workspace_id', workspace_id
+    ).eq('user_id', founder_id).execute()
     
     if not participant.data:
         raise ValueError("Access denied: You are not a participant in this workspace")
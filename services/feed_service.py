@@ -1,53 +1,108 @@
 """Feed service for advisor-founder collaboration - activity feed, meetings, check-ins"""
 from config.database import get_supabase
 from datetime import datetime, timezone
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+import base64
+import uuid
 
+from utils.parallel import gather
+from utils.ttl_cache import TTLCache
 
-def _get_founder_id(clerk_user_id: str) -> str:
-    """Get founder ID from clerk user ID"""
-    supabase = get_supabase()
-    founder = supabase.table('founders').select('id').eq('clerk_user_id', clerk_user_id).execute()
-    if not founder.data:
-        raise ValueError("User not found")
-    return founder.data[0]['id']
+
+# (clerk_user_id, workspace_id) -> (founder_id, role); participant rows
+# rarely change, and a short TTL bounds how long a removed user keeps access
+_workspace_access_cache = TTLCache(maxsize=4096, ttl=30)
+
+_POST_TYPES = frozenset({'message', 'meeting_note', 'system'})
+_MEETING_EXPECTATIONS = frozenset({'yes', 'partially', 'no'})
 
 
 def _verify_workspace_access(clerk_user_id: str, workspace_id: str) -> tuple:
     """Verify user has access to workspace and return (founder_id, role)"""
+    cache_key = (clerk_user_id, workspace_id)
+    cached = _workspace_access_cache.get(cache_key)
+    if cached:
+        return cached
+    
     supabase = get_supabase()
-    founder_id = _get_founder_id(clerk_user_id)
     
-    participant = supabase.table('workspace_participants').select('id, role').eq(
-        'workspace_id', workspace_id
-    ).eq('user_id', founder_id).execute()
+    # Resolve the founder and their participant row in one query
+    participant = supabase.table('workspace_participants').select(
+        'user_id, role, user:founders!user_id!inner(clerk_user_id)'
+    ).eq('workspace_id', workspace_id).eq('user.clerk_user_id', clerk_user_id).limit(1).execute()
     
     if not participant.data:
         raise ValueError("Access denied to this workspace")
     
-    role = participant.data[0].get('role', 'FOUNDER').lower()
+    founder_id = participant.data[0]['user_id']
+    role = (participant.data[0].get('role') or 'FOUNDER').lower()
     if role not in ['founder', 'advisor']:
         role = 'founder'
     
+    _workspace_access_cache.set(cache_key, (founder_id, role))
     return founder_id, role
 
 
+def invalidate_workspace_access(workspace_id: Optional[str] = None,
+                                clerk_user_id: Optional[str] = None) -> None:
+    """Drop cached access entries for a workspace and/or user after participants change"""
+    _workspace_access_cache.delete_where(
+        lambda key: (workspace_id is None or key[1] == workspace_id) and
+                    (clerk_user_id is None or key[0] == clerk_user_id)
+    )
+
+
 # ============================================
 # ACTIVITY FEED
 # ============================================
 
-def get_feed_posts(clerk_user_id: str, workspace_id: str, limit: int = 50, offset: int = 0) -> List[Dict]:
-    """Get activity feed posts for a workspace"""
+def _encode_feed_cursor(post: Dict) -> str:
+    """Opaque keyset cursor pointing just past `post`"""
+    raw = f"{post['created_at']}|{post['id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_feed_cursor(cursor: str) -> Tuple[str, str]:
+    """Decode a cursor into (created_at, id)
+    Both parts are validated since they are interpolated into a PostgREST filter.
+    """
+    try:
+        created_at, post_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|', 1)
+        datetime.fromisoformat(created_at)
+        post_id = str(uuid.UUID(post_id))
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+    return created_at, post_id
+
+
+def get_feed_posts(clerk_user_id: str, workspace_id: str, limit: int = 50, offset: int = 0,
+                   before: Optional[str] = None) -> Tuple[List[Dict], int, Optional[str]]:
+    """Get activity feed posts for a workspace
+    Returns (posts, total post count, cursor for the next page or None).
+    Pass the cursor back as `before` to page by keyset instead of offset.
+    """
     founder_id, _ = _verify_workspace_access(clerk_user_id, workspace_id)
     supabase = get_supabase()
     
-    result = supabase.table('workspace_feed_posts').select(
-        '*, author:founders!author_id(id, name, profile_picture)'
-    ).eq('workspace_id', workspace_id).order(
-        'created_at', desc=True
-    ).range(offset, offset + limit - 1).execute()
+    query = supabase.table('workspace_feed_posts').select(
+        '*, author:founders!author_id(id, name, profile_picture)', count='exact'
+    ).eq('workspace_id', workspace_id)
+    
+    if before:
+        # Keyset pagination: (created_at, id) strictly older than the cursor,
+        # served from idx_feed_posts_workspace_created (migrations/027)
+        created_at, post_id = _decode_feed_cursor(before)
+        query = query.or_(
+            f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt.{post_id})'
+        ).order('created_at', desc=True).order('id', desc=True).limit(limit)
+    else:
+        query = query.order('created_at', desc=True).order('id', desc=True).range(offset, offset + limit - 1)
+    
+    result = query.execute()
     
     posts = result.data if result.data else []
+    total = result.count or 0
+    next_cursor = _encode_feed_cursor(posts[-1]) if len(posts) == limit else None
     
     # Fetch replies for each post
     if posts:
@@ -66,7 +121,7 @@ def get_feed_posts(clerk_user_id: str, workspace_id: str, limit: int = 50, offse
         for post in posts:
             post['replies'] = replies_by_post.get(post['id'], [])
     
-    return posts
+    return posts, total, next_cursor
 
 
 def create_feed_post(clerk_user_id: str, workspace_id: str, content: str, 
@@ -78,7 +133,7 @@ def create_feed_post(clerk_user_id: str, workspace_id: str, content: str,
     if not content or not content.strip():
         raise ValueError("Content is required")
     
-    if post_type not in ['message', 'meeting_note', 'system']:
+    if post_type not in _POST_TYPES:
         post_type = 'message'
     
     post_data = {
@@ -90,17 +145,14 @@ def create_feed_post(clerk_user_id: str, workspace_id: str, content: str,
         'metadata': metadata or {},
     }
     
-    result = supabase.table('workspace_feed_posts').insert(post_data).execute()
+    # Return the new row with author info embedded
+    result = supabase.table('workspace_feed_posts').insert(post_data).select(
+        '*, author:founders!author_id(id, name, profile_picture)'
+    ).execute()
     if not result.data:
         raise ValueError("Failed to create post")
     
-    # Fetch with author info
-    post_id = result.data[0]['id']
-    post = supabase.table('workspace_feed_posts').select(
-        '*, author:founders!author_id(id, name, profile_picture)'
-    ).eq('id', post_id).execute()
-    
-    post_data = post.data[0] if post.data else result.data[0]
+    post_data = result.data[0]
     post_data['replies'] = []
     
     # Create notification for other participants
@@ -132,17 +184,14 @@ def create_feed_reply(clerk_user_id: str, workspace_id: str, post_id: str, conte
         'content': content.strip(),
     }
     
-    result = supabase.table('workspace_feed_replies').insert(reply_data).execute()
+    # Return the new row with author info embedded
+    result = supabase.table('workspace_feed_replies').insert(reply_data).select(
+        '*, author:founders!author_id(id, name, profile_picture)'
+    ).execute()
     if not result.data:
         raise ValueError("Failed to create reply")
     
-    # Fetch with author info
-    reply_id = result.data[0]['id']
-    reply = supabase.table('workspace_feed_replies').select(
-        '*, author:founders!author_id(id, name, profile_picture)'
-    ).eq('id', reply_id).execute()
-    
-    return reply.data[0] if reply.data else result.data[0]
+    return result.data[0]
 
 
 def delete_feed_post(clerk_user_id: str, workspace_id: str, post_id: str) -> None:
@@ -337,7 +386,7 @@ def create_checkin(clerk_user_id: str, workspace_id: str, data: Dict) -> Dict:
     
     if not data.get('rating') or not (1 <= data['rating'] <= 5):
         raise ValueError("Rating must be between 1 and 5")
-    if data.get('meeting_expectations') not in ['yes', 'partially', 'no']:
+    if data.get('meeting_expectations') not in _MEETING_EXPECTATIONS:
         raise ValueError("meeting_expectations must be yes, partially, or no")
     
     checkin_data = {
@@ -416,34 +465,25 @@ def get_activity_summary(clerk_user_id: str, workspace_id: str) -> Dict:
     founder_id, _ = _verify_workspace_access(clerk_user_id, workspace_id)
     supabase = get_supabase()
     
-    # Get all activity logs
-    logs = supabase.table('advisor_activity_logs').select('hours, log_date').eq(
-        'workspace_id', workspace_id
-    ).execute()
-    
-    total_hours = sum(float(log['hours']) for log in (logs.data or []))
-    
-    # Get meeting count
-    meetings = supabase.table('workspace_meetings').select('id').eq(
-        'workspace_id', workspace_id
-    ).execute()
-    
-    # Get feed post count
-    posts = supabase.table('workspace_feed_posts').select('id').eq(
-        'workspace_id', workspace_id
-    ).execute()
+    # Totals are aggregated in Postgres (migrations/020); both reads are
+    # independent, so issue them concurrently
+    totals, checkins = gather(
+        lambda: supabase.rpc('get_advisor_activity_totals', {
+            'p_workspace_id': workspace_id,
+        }).execute(),
+        lambda: supabase.table('advisor_engagement_checkins').select(
+            'rating, respondent_role, period_month, period_year'
+        ).eq('workspace_id', workspace_id).order(
+            'period_year', desc=True
+        ).order('period_month', desc=True).limit(4).execute(),
+    )
     
-    # Get latest check-ins
-    checkins = supabase.table('advisor_engagement_checkins').select(
-        'rating, respondent_role, period_month, period_year'
-    ).eq('workspace_id', workspace_id).order(
-        'period_year', desc=True
-    ).order('period_month', desc=True).limit(4).execute()
+    row = totals.data[0] if totals.data else {}
     
     return {
-        'total_hours_logged': round(total_hours, 1),
-        'total_meetings': len(meetings.data or []),
-        'total_posts': len(posts.data or []),
+        'total_hours_logged': round(float(row.get('total_hours') or 0), 1),
+        'total_meetings': row.get('total_meetings') or 0,
+        'total_posts': row.get('total_posts') or 0,
         'recent_checkins': checkins.data or [],
     }
 
@@ -472,22 +512,25 @@ def _create_feed_notification(workspace_id: str, author_id: str, post: Dict) ->
     else:
         title = f"{author_name} posted an update"
     
-    for p in participants.data:
-        try:
-            supabase.table('notifications').insert({
-                'user_id': p['user_id'],
-                'type': 'FEED_POST',
-                'title': title,
-                'message': post.get('content', '')[:100] + ('...' if len(post.get('content', '')) > 100 else ''),
-                'data': {
-                    'workspace_id': workspace_id,
-                    'post_id': post.get('id'),
-                    'post_type': post_type,
-                }
-            }).execute()
-        except Exception as e:
-            # Don't fail if notification creation fails
-            print(f"[NOTIFY] Feed post notification insert failed: {e}")
+    content = post.get('content', '')
+    message = content[:100] + ('...' if len(content) > 100 else '')
+    
+    try:
+        # One multi-row insert for all recipients
+        supabase.table('notifications').insert([{
+            'user_id': p['user_id'],
+            'type': 'FEED_POST',
+            'title': title,
+            'message': message,
+            'data': {
+                'workspace_id': workspace_id,
+                'post_id': post.get('id'),
+                'post_type': post_type,
+            }
+        } for p in participants.data]).execute()
+    except Exception as e:
+        # Don't fail if notification creation fails
+        print(f"[NOTIFY] Feed post notification insert failed: {e}")
 
 
 # ============================================
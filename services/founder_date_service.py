@@ -17,6 +17,7 @@ from typing import Dict, Any, Optional, List, Tuple
 from config.database import get_supabase
 from services.calcom_service import normalize_cal_booking_url
 from utils.logger import log_info, log_error
+from utils.request_cache import cached_founder_id
 
 
 # ============================================================
@@ -100,6 +101,7 @@ def get_stage_definitions() -> List[Dict[str, Any]]:
 # ============================================================
 # Helpers
 # ============================================================
+@cached_founder_id
 def _get_founder_id(clerk_user_id: str) -> str:
     """Resolve clerk_user_id -> founders.id, raising ValueError if missing."""
     supabase = get_supabase()
@@ -22,6 +22,7 @@ import requests
 
 from config.database import get_supabase
 from utils.logger import log_info, log_error, log_warning
+from utils.request_cache import cached_founder_id
 
 
 # GitHub OAuth Configuration
@@ -47,6 +48,7 @@ def is_github_configured() -> bool:
     return bool(GITHUB_CLIENT_ID and GITHUB_CLIENT_SECRET and GITHUB_REDIRECT_URI)
 
 
+@cached_founder_id
 def _get_founder_id(clerk_user_id: str) -> Optional[str]:
     """Get founder ID from clerk user ID."""
     supabase = get_supabase()
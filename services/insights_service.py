@@ -8,6 +8,7 @@ from typing import Dict, Any, Optional, Tuple
 import httpx
 from config.database import get_supabase
 from utils.logger import log_info, log_error, log_warning
+from utils.request_cache import cached_founder_id
 
 # Perplexity API configuration
 PERPLEXITY_API_KEY = os.environ.get('PERPLEXITY_API_KEY')
@@ -22,6 +23,7 @@ INSIGHTS_LIMITS = {
 }
 
 
+@cached_founder_id
 def _get_founder_id(clerk_user_id: str) -> str:
     """Helper to get founder ID from clerk_user_id"""
     supabase = get_supabase()
@@ -12,6 +12,7 @@ from urllib.parse import urlencode
 
 from config.database import get_supabase
 from utils.logger import log_info, log_error, log_warning
+from utils.request_cache import cached_founder_id
 
 
 # LinkedIn OAuth Configuration
@@ -25,6 +26,7 @@ LINKEDIN_TOKEN_URL = 'https://www.linkedin.com/oauth/v2/accessToken'
 LINKEDIN_USERINFO_URL = 'https://api.linkedin.com/v2/userinfo'
 
 
+@cached_founder_id
 def _get_founder_id(clerk_user_id: str) -> Optional[str]:
     """Get founder ID from clerk user ID."""
     supabase = get_supabase()
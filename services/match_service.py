@@ -4,6 +4,7 @@ from typing import Dict, Any, Optional
 from config.database import get_supabase
 from services import email_service
 from utils.logger import log_error, log_info
+from utils.parallel import gather
 
 # Dissolution cooling-off period in days
 DISSOLUTION_COOLOFF_DAYS = 7
@@ -34,16 +35,19 @@ def get_matches(clerk_user_id):
     # Check and mark expired matches
     _check_and_mark_expired_matches()
     
-    # Get matches where current user is founder1 or founder2 (exclude expired)
+    # Get matches where current user is founder1 or founder2 (exclude expired
+    # and legacy matches without a project_id)
     try:
         all_matches_result = supabase.table('matches').select(
             '*, founder1:founders!founder1_id(*), founder2:founders!founder2_id(*)'
-        ).or_(f'founder1_id.eq.{current_user_id},founder2_id.eq.{current_user_id}').eq('is_expired', False).execute()
+        ).or_(f'founder1_id.eq.{current_user_id},founder2_id.eq.{current_user_id}').eq(
+            'is_expired', False
+        ).not_.is_('project_id', 'null').execute()
         all_matches = all_matches_result.data if all_matches_result.data else []
     except (AttributeError, Exception):
         # Fallback to two queries if OR syntax not supported
-        matches1 = supabase.table('matches').select('*, founder1:founders!founder1_id(*), founder2:founders!founder2_id(*)').eq('founder1_id', current_user_id).eq('is_expired', False).execute()
-        matches2 = supabase.table('matches').select('*, founder1:founders!founder1_id(*), founder2:founders!founder2_id(*)').eq('founder2_id', current_user_id).eq('is_expired', False).execute()
+        matches1 = supabase.table('matches').select('*, founder1:founders!founder1_id(*), founder2:founders!founder2_id(*)').eq('founder1_id', current_user_id).eq('is_expired', False).not_.is_('project_id', 'null').execute()
+        matches2 = supabase.table('matches').select('*, founder1:founders!founder1_id(*), founder2:founders!founder2_id(*)').eq('founder2_id', current_user_id).eq('is_expired', False).not_.is_('project_id', 'null').execute()
         all_matches = []
         if matches1.data:
             all_matches.extend(matches1.data)
@@ -61,33 +65,35 @@ def get_matches(clerk_user_id):
         if match.get('project_id'):
             project_ids.add(match['project_id'])
     
-    # Batch fetch founder projects
+    # Batch fetch founder projects and match projects concurrently
+    founder_projects_result, match_projects_result = gather(
+        lambda: (
+            supabase.table('projects').select('*').in_('founder_id', list(founder_ids)).order('display_order').execute()
+            if founder_ids else None
+        ),
+        lambda: (
+            supabase.table('projects').select('*').in_('id', list(project_ids)).execute()
+            if project_ids else None
+        ),
+    )
+    
     founder_projects_map = {}
-    if founder_ids:
-        all_founder_projects = supabase.table('projects').select('*').in_('founder_id', list(founder_ids)).order('display_order').execute()
-        if all_founder_projects.data:
-            for project in all_founder_projects.data:
-                founder_id = project['founder_id']
-                if founder_id not in founder_projects_map:
-                    founder_projects_map[founder_id] = []
-                founder_projects_map[founder_id].append(project)
-    
-    # Batch fetch match projects
+    if founder_projects_result and founder_projects_result.data:
+        for project in founder_projects_result.data:
+            founder_id = project['founder_id']
+            if founder_id not in founder_projects_map:
+                founder_projects_map[founder_id] = []
+            founder_projects_map[founder_id].append(project)
+    
     match_projects_map = {}
-    if project_ids:
-        all_match_projects = supabase.table('projects').select('*').in_('id', list(project_ids)).execute()
-        if all_match_projects.data:
-            for project in all_match_projects.data:
-                match_projects_map[project['id']] = project
+    if match_projects_result and match_projects_result.data:
+        for project in match_projects_result.data:
+            match_projects_map[project['id']] = project
     
     # Format matches
     formatted_matches = []
     for match in all_matches:
-        match_project_id = match.get('project_id')
-        
-        # Skip legacy matches without project_id
-        if not match_project_id:
-            continue
+        match_project_id = match['project_id']
         
         if match['founder1_id'] == current_user_id:
             other_founder = match.get('founder2') or {}
@@ -427,15 +433,14 @@ def cancel_dissolution_request(clerk_user_id: str, match_id: str) -> Dict[str, A
     }).eq('id', match_id).execute()
     
     # Clear on workspace too
-    workspace = supabase.table('workspaces').select('id').eq('match_id', match_id).execute()
-    if workspace.data:
-        supabase.table('workspaces').update({
-            'dissolution_status': 'active',
-            'dissolution_requested_at': None,
-            'dissolution_requested_by': None,
-            'dissolution_reason': None,
-            'dissolution_cooloff_ends_at': None
-        }).eq('id', workspace.data[0]['id']).execute()
+    # Filtering on match_id is a no-op when there is no workspace, so skip the lookup
+    supabase.table('workspaces').update({
+        'dissolution_status': 'active',
+        'dissolution_requested_at': None,
+        'dissolution_requested_by': None,
+        'dissolution_reason': None,
+        'dissolution_cooloff_ends_at': None
+    }).eq('match_id', match_id).execute()
     
     # Notify the other founder
     other_founder = _get_other_founder(match_data, founder_id)
@@ -528,6 +533,9 @@ def _execute_dissolution(
             'dissolution_confirmed_by': confirmed_by
         }).eq('id', workspace_id).execute()
         
+        from services.workspace_service import invalidate_workspace_access
+        invalidate_workspace_access(workspace_id)
+        
         # Free up advisor slots (they're no longer active in this workspace)
         try:
             advisors = supabase.table('workspace_participants').select('user_id').eq(
@@ -15,7 +15,7 @@ def get_messages(clerk_user_id, match_id):
     current_user_id = user_profile.data[0]['id']
     
     # Verify user is part of this match
-    match = supabase.table('matches').select('*').eq('id', match_id).execute()
+    match = supabase.table('matches').select('founder1_id, founder2_id').eq('id', match_id).execute()
     if not match.data:
         raise ValueError("Match not found")
     
@@ -44,7 +44,7 @@ def send_message(clerk_user_id, match_id, content):
     sender_name = user_profile.data[0].get('name', 'Your partner')
     
     # Verify user is part of this match
-    match = supabase.table('matches').select('*').eq('id', match_id).execute()
+    match = supabase.table('matches').select('founder1_id, founder2_id').eq('id', match_id).execute()
     if not match.data:
         raise ValueError("Match not found")
     
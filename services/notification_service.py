@@ -2,35 +2,52 @@
 import boto3
 import os
 from datetime import datetime, timedelta
+from threading import Lock
 from typing import Optional, List, Dict, Any
 from config.database import get_supabase
 import json
 
+# One SES client per process, created on first use; boto3 clients are
+# thread-safe, but building one costs far more than a notification insert
+_ses_client = None
+_ses_client_lock = Lock()
+
+
+def _get_ses_client():
+    """Get the shared AWS SES client"""
+    global _ses_client
+    if _ses_client is None:
+        with _ses_client_lock:
+            if _ses_client is None:
+                # Get AWS configuration from environment
+                aws_access_key = os.environ.get('AWS_ACCESS_KEY_ID')
+                aws_secret_key = os.environ.get('AWS_SECRET_ACCESS_KEY')
+                aws_region = os.environ.get('AWS_REGION', 'us-east-1')
+                if aws_access_key and aws_secret_key:
+                    # Use explicit credentials from environment
+                    _ses_client = boto3.client(
+                        'ses',
+                        region_name=aws_region,
+                        aws_access_key_id=aws_access_key,
+                        aws_secret_access_key=aws_secret_key
+                    )
+                else:
+                    # Fallback to IAM role/default credentials (for EC2/ECS/Lambda)
+                    _ses_client = boto3.client('ses', region_name=aws_region)
+    return _ses_client
+
+
 class NotificationService:
     """Handle notifications and approval workflows"""
     
     def __init__(self):
         self.supabase = get_supabase()
-        
-        # Get AWS configuration from environment
-        aws_access_key = os.environ.get('AWS_ACCESS_KEY_ID')
-        aws_secret_key = os.environ.get('AWS_SECRET_ACCESS_KEY')
-        aws_region = os.environ.get('AWS_REGION', 'us-east-1')
         self.from_email = os.environ.get('SES_FROM_EMAIL', 'noreply@yourapp.com')
         self.from_name = os.environ.get('SES_FROM_NAME', 'Founders Matching')
-        
-        # Initialize AWS SES client
-        if aws_access_key and aws_secret_key:
-            # Use explicit credentials from environment
-            self.ses_client = boto3.client(
-                'ses',
-                region_name=aws_region,
-                aws_access_key_id=aws_access_key,
-                aws_secret_access_key=aws_secret_key
-            )
-        else:
-            # Fallback to IAM role/default credentials (for EC2/ECS/Lambda)
-            self.ses_client = boto3.client('ses', region_name=aws_region)
+    
+    @property
+    def ses_client(self):
+        return _get_ses_client()
         
     def _get_founder_id(self, clerk_user_id: str, email: str = None) -> str:
         """Get founder ID from clerk_user_id.
@@ -52,21 +69,19 @@ class NotificationService:
         if not result.data:
             # If email is provided, check for existing founder by email (case-insensitive)
             if email and email.strip():
-                email_lower = email.strip().lower()
-                all_founders = self.supabase.table('founders').select('id, email, clerk_user_id').execute()
-                if all_founders.data:
-                    for founder in all_founders.data:
-                        founder_email = founder.get('email', '').strip().lower()
-                        if founder_email == email_lower:
-                            # Found existing founder with same email - update clerk_user_id
-                            self.supabase.table('founders').update({'clerk_user_id': clerk_user_id}).eq('id', founder['id']).execute()
-                            # Cache the result
-                            try:
-                                from utils.request_cache import set_cached_founder_id
-                                set_cached_founder_id(clerk_user_id, founder['id'])
-                            except ImportError:
-                                pass
-                            return founder['id']
+                # Case-insensitive match done in Postgres against an index (migrations/022)
+                match = self.supabase.rpc('find_founder_by_email', {'p_email': email}).execute()
+                if match.data:
+                    founder = match.data[0]
+                    # Found existing founder with same email - update clerk_user_id
+                    self.supabase.table('founders').update({'clerk_user_id': clerk_user_id}).eq('id', founder['id']).execute()
+                    # Cache the result
+                    try:
+                        from utils.request_cache import set_cached_founder_id
+                        set_cached_founder_id(clerk_user_id, founder['id'])
+                    except ImportError:
+                        pass
+                    return founder['id']
             
             raise ValueError("Founder not found")
         
@@ -126,6 +141,97 @@ class NotificationService:
         
         return notification_id
     
+    def create_notifications_bulk(self, notifications: List[Dict]) -> List[str]:
+        """Create several notifications with a single insert and optionally queue emails.
+        Each item takes the same keys as create_notification's arguments.
+        """
+        if not notifications:
+            return []
+        
+        rows = [{
+            'workspace_id': n['workspace_id'],
+            'user_id': n['recipient_id'],
+            'actor_user_id': n['actor_id'],
+            'type': n['event_type'],
+            'title': n['title'],
+            'message': n.get('message'),
+            'entity_type': n.get('entity_type'),
+            'entity_id': n.get('entity_id'),
+            'approval_id': n.get('approval_id'),
+            'data': n.get('metadata') or {}
+        } for n in notifications]
+        
+        result = self.supabase.table('notifications').insert(rows).execute()
+        
+        self._check_and_queue_emails_bulk(result.data or [])
+        
+        return [row['id'] for row in (result.data or [])]
+    
+    @staticmethod
+    def _should_send_email(pref: Optional[Dict], event_type: str) -> bool:
+        """Apply a recipient's notification preferences (defaults when unset)"""
+        pref = pref or {}
+        is_approval = event_type in ['APPROVAL_REQUESTED', 'APPROVAL_COMPLETED']
+        return pref.get('email_enabled', True) and (
+            (is_approval and pref.get('approval_emails', True)) or
+            (not is_approval and not pref.get('email_digest', False))
+        )
+    
+    def _check_and_queue_emails_bulk(self, rows: List[Dict]):
+        """Check preferences and queue emails for freshly inserted notification rows
+        Preferences, notification details and workspace names are each read
+        with one query, and the emails are queued with one insert.
+        """
+        email_enabled = os.environ.get('EMAIL_ENABLED', 'false').lower() == 'true'
+        if not email_enabled or not rows:
+            return
+        
+        user_ids = list({row['user_id'] for row in rows})
+        workspace_ids = list({row['workspace_id'] for row in rows})
+        prefs = self.supabase.table('notification_preferences').select(
+            'user_id, workspace_id, email_enabled, email_digest, approval_emails'
+        ).in_('user_id', user_ids).in_('workspace_id', workspace_ids).execute()
+        pref_by_key = {(p['user_id'], p['workspace_id']): p for p in (prefs.data or [])}
+        
+        to_send = [
+            row for row in rows
+            if self._should_send_email(pref_by_key.get((row['user_id'], row['workspace_id'])), row['type'])
+        ]
+        if not to_send:
+            return
+        
+        notifications = self.supabase.table('notifications').select(
+            '*, actor:founders!notifications_actor_user_id_fkey(name), '
+            'recipient:founders!notifications_user_id_fkey(email, name)'
+        ).in_('id', [row['id'] for row in to_send]).execute()
+        
+        workspaces = self.supabase.table('workspaces').select('id, name').in_(
+            'id', list({row['workspace_id'] for row in to_send})
+        ).execute()
+        workspace_names = {w['id']: w['name'] for w in (workspaces.data or [])}
+        
+        emails = []
+        for notif in notifications.data or []:
+            workspace_id = notif['workspace_id']
+            is_approval = notif['type'] in ['APPROVAL_REQUESTED', 'APPROVAL_COMPLETED']
+            template_data = {
+                'notification': notif,
+                'workspace_id': workspace_id,
+                'is_approval': is_approval
+            }
+            emails.append({
+                'to_email': notif['recipient']['email'],
+                'subject': self._email_subject(notif['type'], workspace_names.get(workspace_id) or 'Your workspace'),
+                'body': self._render_email_template('notification', template_data),
+                'template_name': 'notification',
+                'template_data': template_data,
+                'workspace_id': workspace_id,
+                'notification_id': notif['id']
+            })
+        
+        if emails:
+            self.supabase.table('email_queue').insert(emails).execute()
+    
     def _check_and_queue_email(
         self, 
         workspace_id: str, 
@@ -145,23 +251,9 @@ class NotificationService:
             'user_id', recipient_id
         ).eq('workspace_id', workspace_id).execute()
         
-        # Default preferences if not set
-        email_enabled = True
-        email_digest = False
-        approval_emails = True
-        
-        if prefs.data:
-            pref = prefs.data[0]
-            email_enabled = pref.get('email_enabled', True)
-            email_digest = pref.get('email_digest', False)
-            approval_emails = pref.get('approval_emails', True)
-        
-        # Determine if we should send email
+        # Determine if we should send email (defaults apply when not set)
         is_approval = event_type in ['APPROVAL_REQUESTED', 'APPROVAL_COMPLETED']
-        should_send = email_enabled and (
-            (is_approval and approval_emails) or 
-            (not is_approval and not email_digest)
-        )
+        should_send = self._should_send_email(prefs.data[0] if prefs.data else None, event_type)
         
         if should_send:
             # Get notification details
@@ -192,6 +284,11 @@ class NotificationService:
         workspace = self.supabase.table('workspaces').select('name').eq('id', workspace_id).execute()
         workspace_name = workspace.data[0]['name'] if workspace.data else 'Your workspace'
         
+        return self._email_subject(event_type, workspace_name)
+    
+    @staticmethod
+    def _email_subject(event_type: str, workspace_name: str) -> str:
+        """Email subject for an event in a named workspace"""
         subjects = {
             'APPROVAL_REQUESTED': f"Action required: Approval needed in {workspace_name}",
             'EQUITY_PROPOSAL_CREATED': f"New equity proposal in {workspace_name}",
@@ -447,13 +544,31 @@ class ApprovalService:
         
         approval_id = result.data[0]['id']
         
-        # Create notification for approver
+        self.notify_approval_requested(
+            workspace_id, approver['id'], proposer_id, proposer_name,
+            entity_type, entity_id, approval_id, proposed_data
+        )
+        
+        return approval_id
+    
+    def notify_approval_requested(
+        self,
+        workspace_id: str,
+        approver_id: str,
+        proposer_id: str,
+        proposer_name: str,
+        entity_type: str,
+        entity_id: str,
+        approval_id: str,
+        proposed_data: Dict
+    ) -> None:
+        """Notify the approver that a new approval is waiting for them"""
         title = self._get_approval_title(entity_type, proposed_data, proposer_name)
         
         try:
             self.notification_service.create_notification(
                 workspace_id=workspace_id,
-                recipient_id=approver['id'],
+                recipient_id=approver_id,
                 actor_id=proposer_id,
                 event_type='APPROVAL_REQUESTED',
                 title=title,
@@ -465,8 +580,6 @@ class ApprovalService:
             )
         except Exception as e:
             print(f"[NOTIFY] Failed to create approval request notification: {e}")
-        
-        return approval_id
     
     def _get_approval_title(self, entity_type: str, proposed_data: Dict, proposer_name: str) -> str:
         """Generate approval title based on type"""
@@ -4,6 +4,7 @@ Handles OAuth, page creation, and database setup for workspace integrations
 """
 import os
 import requests
+from collections import Counter
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from utils.logger import log_info, log_error
@@ -14,6 +15,10 @@ NOTION_CLIENT_SECRET = (os.getenv('NOTION_CLIENT_SECRET') or '').strip()
 NOTION_REDIRECT_URI = (os.getenv('NOTION_REDIRECT_URI') or '').strip()
 FRONTEND_URL = (os.getenv('FRONTEND_URL') or 'https://guild-space.co').strip()
 
+# Shared session so Notion API calls reuse pooled keep-alive connections
+# instead of a fresh TCP+TLS handshake per request
+_session = requests.Session()
+
 NOTION_TOKEN_URL = 'https://api.notion.com/v1/oauth/token'
 NOTION_API_BASE = 'https://api.notion.com/v1'
 NOTION_VERSION = '2022-06-28'
@@ -273,11 +278,11 @@ def _notion_request(access_token: str, method: str, endpoint: str, data: Dict =
         url = f"{NOTION_API_BASE}{endpoint}"
         
         if method == 'GET':
-            response = requests.get(url, headers=headers)
+            response = _session.get(url, headers=headers)
         elif method == 'POST':
-            response = requests.post(url, headers=headers, json=data)
+            response = _session.post(url, headers=headers, json=data)
         elif method == 'PATCH':
-            response = requests.patch(url, headers=headers, json=data)
+            response = _session.patch(url, headers=headers, json=data)
         else:
             return None
         
@@ -772,21 +777,24 @@ def get_workspace_notion_summary(workspace_id: str) -> Optional[Dict[str, Any]]:
     decisions = fetch_decisions_from_notion(workspace_id) or []
     notes = fetch_meeting_notes_from_notion(workspace_id) or []
     
-    # Calculate task stats
+    # Calculate task stats (single pass over tasks)
+    task_counts = Counter(t.get('status') for t in tasks)
     task_stats = {
         'total': len(tasks),
-        'todo': len([t for t in tasks if t.get('status') == 'To Do']),
-        'in_progress': len([t for t in tasks if t.get('status') == 'In Progress']),
-        'done': len([t for t in tasks if t.get('status') == 'Done']),
-        'blocked': len([t for t in tasks if t.get('status') == 'Blocked']),
+        'todo': task_counts['To Do'],
+        'in_progress': task_counts['In Progress'],
+        'done': task_counts['Done'],
+        'blocked': task_counts['Blocked'],
     }
     
-    # Calculate decision stats
+    # Calculate decision stats (single pass over decisions)
+    decision_counts = Counter(d.get('status') for d in decisions)
+    high_impact = sum(1 for d in decisions if d.get('impact') == 'High')
     decision_stats = {
         'total': len(decisions),
-        'approved': len([d for d in decisions if d.get('status') == 'Approved']),
-        'proposed': len([d for d in decisions if d.get('status') == 'Proposed']),
-        'high_impact': len([d for d in decisions if d.get('impact') == 'High']),
+        'approved': decision_counts['Approved'],
+        'proposed': decision_counts['Proposed'],
+        'high_impact': high_impact,
     }
     
     return {
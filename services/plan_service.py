@@ -1,10 +1,15 @@
 """Plan and billing service for founders and advisors"""
+import sys
+from functools import lru_cache
 from config.database import get_supabase
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Optional, Any, Literal
 from enum import Enum
 from dateutil.relativedelta import relativedelta
 
+from utils.batch_writer import BatchWriter
+from utils.ttl_cache import TTLCache
+
 FounderPlan = Literal["FREE", "PRO", "PRO_PLUS", "PRO_TRIAL"]
 
 FOUNDER_PLANS: Dict[FounderPlan, Dict[str, Any]] = {
@@ -146,6 +151,30 @@ ADVISOR_PRICING = {
     "maxConsultationRateUSD": 1000,
 }
 
+# datetime.fromisoformat() accepts a trailing 'Z' natively from Python 3.11
+_FROMISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)
+
+
+@lru_cache(maxsize=1024)
+def _parse_iso_timestamp(value: str) -> datetime:
+    """Parse an ISO-8601 timestamp string as an aware datetime (UTC if naive)"""
+    if not _FROMISOFORMAT_ACCEPTS_Z:
+        value = value.replace('Z', '+00:00')
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _parse_period_end(value: Any) -> datetime:
+    """Parse a period/trial end (datetime, unix timestamp or ISO string) as an aware datetime"""
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, tz=timezone.utc)
+    return _parse_iso_timestamp(str(value))
+
+
 def _get_founder_id(clerk_user_id: str, email: str = None) -> str:
     """Helper to get founder ID from clerk_user_id - auto-creates minimal record if missing.
     Uses request-scoped caching to avoid redundant queries.
@@ -240,9 +269,7 @@ def get_founder_plan(clerk_user_id: str) -> Dict[str, Any]:
         # Parse the period end date
         if subscription_current_period_end:
             try:
-                period_end = datetime.fromisoformat(subscription_current_period_end.replace('Z', '+00:00'))
-                if period_end.tzinfo is None:
-                    period_end = period_end.replace(tzinfo=timezone.utc)
+                period_end = _parse_period_end(subscription_current_period_end)
                 
                 now = datetime.now(timezone.utc)
                 period_ended = period_end < now
@@ -276,9 +303,7 @@ def get_founder_plan(clerk_user_id: str) -> Dict[str, Any]:
                 trial_end = trial.get('trial_end')
                 if trial_end:
                     try:
-                        end_date = datetime.fromisoformat(trial_end.replace('Z', '+00:00'))
-                        if end_date.tzinfo is None:
-                            end_date = end_date.replace(tzinfo=timezone.utc)
+                        end_date = _parse_period_end(trial_end)
                         if end_date > now:
                             # Active trial found - grant PRO_TRIAL plan
                             plan_id = 'PRO_TRIAL'
@@ -377,9 +402,7 @@ def get_workspace_highest_plan(workspace_id: str) -> FounderPlan:
             # Check expiry date
             elif subscription_current_period_end:
                 try:
-                    period_end = datetime.fromisoformat(subscription_current_period_end.replace('Z', '+00:00'))
-                    if period_end.tzinfo is None:
-                        period_end = period_end.replace(tzinfo=timezone.utc)
+                    period_end = _parse_period_end(subscription_current_period_end)
                     if period_end < now:
                         is_active = False
                 except (ValueError, AttributeError):
@@ -490,13 +513,36 @@ def check_project_limit(clerk_user_id: str) -> tuple[bool, int, int]:
     return (can_create, current_count, max_projects)
 
 
+# clerk_user_id -> (can_swipe, current_count, max_allowed). Back-to-back swipes
+# re-read the same quota; writes below invalidate it, the TTL bounds staleness
+# across workers.
+_discovery_limit_cache = TTLCache(maxsize=10000, ttl=5)
+
+
+def invalidate_discovery_limit(clerk_user_id: str) -> None:
+    """Drop the cached discovery limit after recording a swipe or plan change"""
+    _discovery_limit_cache.delete(clerk_user_id)
+
+
 def check_discovery_limit(clerk_user_id: str) -> tuple[bool, int, int]:
     """
     Check if user can perform more discovery swipes (browsing).
     Uses daily limits for FREE tier, unlimited for paid tiers.
     Counts ALL swipes (left + right) to limit browsing behavior.
+    Cached for a few seconds per user.
     Returns: (can_swipe, current_count, max_allowed)
     """
+    cached = _discovery_limit_cache.get(clerk_user_id)
+    if cached is not None:
+        return cached
+    
+    result = _check_discovery_limit(clerk_user_id)
+    _discovery_limit_cache.set(clerk_user_id, result)
+    return result
+
+
+def _check_discovery_limit(clerk_user_id: str) -> tuple[bool, int, int]:
+    """Uncached discovery limit lookup"""
     founder_id = _get_founder_id(clerk_user_id)
     supabase = get_supabase()
     
@@ -641,6 +687,8 @@ def increment_discovery_usage(clerk_user_id: str) -> None:
                 'month_year': month_year,
                 'swipe_count': 1,
             }).execute()
+    # Invalidate after the write so a concurrent check can't re-cache the old count
+    invalidate_discovery_limit(clerk_user_id)
 
 def record_swipe_in_history(clerk_user_id: str, swipe_type: str, project_id: str = None) -> None:
     """Record swipe in swipe_history table for 30-day rolling window tracking"""
@@ -658,6 +706,8 @@ def record_swipe_in_history(clerk_user_id: str, swipe_type: str, project_id: str
         # Log but don't fail - swipe_history is for tracking, not critical
         from utils.logger import log_warning
         log_warning(f"Failed to record swipe in history: {e}")
+    # After the insert so a concurrent check can't re-cache the old count
+    invalidate_discovery_limit(clerk_user_id)
 
 def update_founder_plan(clerk_user_id: str, new_plan: FounderPlan, subscription_id: Optional[str] = None, subscription_status: Optional[str] = None, current_period_end: Optional[datetime] = None, workspace_to_keep: Optional[str] = None) -> Dict[str, Any]:
     """Update founder's plan and handle workspace limits on downgrade with user consent"""
@@ -738,8 +788,10 @@ def update_founder_plan(clerk_user_id: str, new_plan: FounderPlan, subscription_
                     pass  # History tracking is optional
             
             # Then remove from workspaces
+            from services.workspace_service import invalidate_workspace_access
             for workspace_id in workspaces_to_remove:
                 supabase.table('workspace_participants').delete().eq('workspace_id', workspace_id).eq('user_id', founder_id).execute()
+                invalidate_workspace_access(workspace_id)
     
     # Update plan - do this last to ensure workspace cleanup happens first
     # If plan update fails, at least workspace cleanup is done
@@ -760,6 +812,7 @@ def update_founder_plan(clerk_user_id: str, new_plan: FounderPlan, subscription_
         cache_delete(f'plan:{clerk_user_id}')
     except ImportError:
         pass
+    invalidate_discovery_limit(clerk_user_id)
     
     # Log telemetry
     event_type = 'UPGRADE' if _is_upgrade(old_plan, new_plan) else 'DOWNGRADE' if old_plan != new_plan else 'ACTIVATION'
@@ -772,16 +825,18 @@ def _is_upgrade(old_plan: str, new_plan: str) -> bool:
     plan_order = {'FREE': 0, 'PRO_TRIAL': 1, 'PRO': 1, 'PRO_PLUS': 2}
     return plan_order.get(new_plan, 0) > plan_order.get(old_plan, 0)
 
+# Telemetry rows are inserted in batches off the request path
+_telemetry_writer = BatchWriter('plan_telemetry')
+
 def log_plan_telemetry(user_id: str, event_type: str, from_plan: Optional[str] = None, to_plan: Optional[str] = None, metadata: Optional[Dict] = None) -> None:
-    """Log plan-related events for analytics"""
-    supabase = get_supabase()
-    supabase.table('plan_telemetry').insert({
+    """Queue a plan-related event for analytics"""
+    _telemetry_writer.put({
         'user_id': user_id,
         'event_type': event_type,
         'from_plan': from_plan,
         'to_plan': to_plan,
         'metadata': metadata or {},
-    }).execute()
+    })
 
 def get_advisor_billing_profile(clerk_user_id: str) -> Dict[str, Any]:
     """Get advisor's subscription / billing status.
@@ -841,17 +896,13 @@ def get_advisor_billing_profile(clerk_user_id: str) -> Dict[str, Any]:
         can_accept = True
     elif status == 'trial' and trial_ends_at:
         try:
-            t = trial_ends_at if isinstance(trial_ends_at, datetime) else datetime.fromisoformat(str(trial_ends_at).replace('Z', '+00:00'))
-            if t.tzinfo is None:
-                t = t.replace(tzinfo=timezone.utc)
+            t = _parse_period_end(trial_ends_at)
             can_accept = t > now
         except (ValueError, AttributeError):
             can_accept = False
     elif status == 'active' and period_end:
         try:
-            p = period_end if isinstance(period_end, datetime) else datetime.fromisoformat(str(period_end).replace('Z', '+00:00'))
-            if p.tzinfo is None:
-                p = p.replace(tzinfo=timezone.utc)
+            p = _parse_period_end(period_end)
             can_accept = p > now
         except (ValueError, AttributeError):
             can_accept = False
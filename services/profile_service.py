@@ -3,6 +3,7 @@ import traceback
 from typing import Dict, Any, Optional, List
 from config.database import get_supabase
 from utils.logger import log_info, log_error
+from utils.request_cache import cached_founder_id
 
 
 # Available industry/genre interests
@@ -21,6 +22,7 @@ COMMITMENT_OPTIONS = ['full_time', 'part_time', 'flexible', 'advisory']
 LOCATION_PREFERENCES = ['remote', 'hybrid', 'in_person', 'flexible']
 
 
+@cached_founder_id
 def _get_founder_id(clerk_user_id: str) -> str:
     """Get founder ID from Clerk user ID"""
     supabase = get_supabase()
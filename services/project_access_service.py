@@ -3,6 +3,7 @@ from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Any
 from config.database import get_supabase
 from utils.logger import log_info, log_error
+from utils.request_cache import cached_founder_id
 from services import email_service
 
 # Visibility options
@@ -12,6 +13,7 @@ VISIBILITY_REQUEST_ACCESS = 'request_access'
 VALID_VISIBILITY_OPTIONS = [VISIBILITY_OPEN, VISIBILITY_REQUEST_ACCESS]
 
 
+@cached_founder_id
 def _get_founder_id(clerk_user_id: str) -> str:
     """Get founder ID from Clerk user ID"""
     supabase = get_supabase()
@@ -111,11 +113,11 @@ def check_user_access(clerk_user_id: str, project_id: str) -> Dict[str, Any]:
     # Request access = check for existing grant or pending request
     if visibility == VISIBILITY_REQUEST_ACCESS:
         # Check if access was granted
-        grant = supabase.table('project_access_grants').select('id').eq(
-            'project_id', project_id
-        ).eq('user_id', founder_id).execute()
+        grant = supabase.table('project_access_grants').select(
+            'id', count='exact', head=True
+        ).eq('project_id', project_id).eq('user_id', founder_id).execute()
         
-        if grant.data:
+        if grant.count:
             return {'has_access': True, 'reason': 'granted', 'request_status': None}
         
         # Check for existing request
@@ -215,35 +217,38 @@ def request_project_access(clerk_user_id: str, project_id: str, message: str = N
         'voice_intro_url': voice_intro_url.strip()[:1000] if voice_intro_url else None,
     }
     
+    # The write returns the requester and owner details the email needs
+    returning = 'id, requester:founders!requester_id(name), owner:founders!owner_id(name, email)'
     if existing.data:
         # Update existing declined request
         result = supabase.table('project_access_requests').update(request_data).eq(
             'id', existing.data[0]['id']
-        ).execute()
+        ).select(returning).execute()
     else:
         # Create new request
-        result = supabase.table('project_access_requests').insert(request_data).execute()
+        result = supabase.table('project_access_requests').insert(request_data).select(returning).execute()
     
     log_info(f"Access request created from {requester_id} for project {project_id}")
     
     # Send email notification to project owner
     try:
-        requester = supabase.table('founders').select('name').eq('id', requester_id).execute()
-        owner = supabase.table('founders').select('name, email').eq('id', owner_id).execute()
+        created = result.data[0] if result.data else {}
+        requester = created.get('requester')
+        owner = created.get('owner')
         
-        owner_email = owner.data[0].get('email') if owner.data else None
+        owner_email = owner.get('email') if owner else None
         print(f"[NOTIFY] request_project_access: owner_email={owner_email}")
         
-        if requester.data and owner.data:
+        if requester and owner:
             email_service.send_access_request_email(
                 to_email=owner_email,
-                user_name=owner.data[0].get('name', 'there'),
-                requester_name=requester.data[0].get('name', 'Someone'),
+                user_name=owner.get('name', 'there'),
+                requester_name=requester.get('name', 'Someone'),
                 project_name=project_data.get('title', 'your project'),
                 request_message=message
             )
         else:
-            print(f"[NOTIFY] SKIP: requester.data={bool(requester.data)}, owner.data={bool(owner.data)}")
+            print(f"[NOTIFY] SKIP: requester={bool(requester)}, owner={bool(owner)}")
     except Exception as e:
         print(f"[NOTIFY] EXCEPTION in send_access_request_email: {e}")
         log_error(f"Failed to send access request notification email", error=e)
@@ -9,6 +9,7 @@ This service powers the questionnaire-based discovery where seekers:
 from datetime import datetime, timezone, timedelta
 import hashlib
 import json
+from collections import Counter
 from typing import Dict, List, Optional, Any, Tuple
 
 from config.database import get_supabase
@@ -1160,41 +1161,23 @@ def skip_project(clerk_user_id: str, project_id: str) -> Dict[str, str]:
     
     supabase = get_supabase()
     
-    # Get seeker's founder ID
-    founder = supabase.table('founders').select('id').eq(
-        'clerk_user_id', clerk_user_id
-    ).execute()
+    # Founder lookup, project check, duplicate check, swipe insert and
+    # swipe_history row all run in one transaction (migrations/015)
+    result = supabase.rpc('skip_project_tx', {
+        'p_clerk_user_id': clerk_user_id,
+        'p_project_id': project_id,
+    }).execute()
+    status = result.data
     
-    if not founder.data:
+    if status == 'profile_not_found':
         raise ValueError("Profile not found")
-    
-    seeker_id = founder.data[0]['id']
-    
-    # Verify project exists and get its founder_id
-    project = supabase.table('projects').select('id, founder_id').eq('id', project_id).execute()
-    if not project.data:
+    if status == 'project_not_found':
         raise ValueError("Project not found")
-    
-    project_founder_id = project.data[0].get('founder_id')
-    
-    # Check if already skipped
-    existing = supabase.table('swipes').select('id').eq(
-        'swiper_id', seeker_id
-    ).eq('project_id', project_id).eq('swipe_type', 'left').execute()
-    
-    if existing.data:
+    if status == 'already_skipped':
         return {"message": "Already skipped"}
     
-    # Record the skip (left swipe) in both tables
-    supabase.table('swipes').insert({
-        'swiper_id': seeker_id,
-        'swiped_id': project_founder_id,
-        'project_id': project_id,
-        'swipe_type': 'left',
-    }).execute()
-    
-    # Record in swipe_history for daily limit tracking
-    plan_service.record_swipe_in_history(clerk_user_id, 'left', project_id)
+    # The RPC wrote swipe_history, so the cached daily count is stale
+    plan_service.invalidate_discovery_limit(clerk_user_id)
     
     return {"message": "Project skipped"}
 
@@ -1513,10 +1496,11 @@ def get_project_preview_for_seeker(clerk_user_id: str, project_id: str) -> Dict[
     ).eq('project_id', project_id).execute()
     
     apps = app_stats.data or []
-    pending_apps = len([a for a in apps if a['status'] == 'pending'])
-    accepted_apps = len([a for a in apps if a['status'] == 'accepted'])
-    rejected_apps = len([a for a in apps if a['status'] == 'rejected'])
-    withdrawn_apps = len([a for a in apps if a['status'] == 'withdrawn'])
+    status_counts = Counter(a['status'] for a in apps)
+    pending_apps = status_counts['pending']
+    accepted_apps = status_counts['accepted']
+    rejected_apps = status_counts['rejected']
+    withdrawn_apps = status_counts['withdrawn']
     
     # Calculate response rate (exclude withdrawn - owner couldn't respond to those)
     responded_apps = accepted_apps + rejected_apps
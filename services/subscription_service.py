@@ -1,18 +1,32 @@
 """Subscription service for Dodo Payments integration"""
 import os
+import atexit
+import base64
+import binascii
 import hmac
-import hashlib
 import json
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Optional, Any
+from functools import lru_cache
+from threading import Lock
+from typing import Dict, Optional, Any, Tuple
+from postgrest import ReturnMethod
 from config.database import get_supabase
 from services import plan_service
-from utils.auth import get_clerk_user_email
+from utils.auth import fetch_clerk_user_email, get_clerk_user_email
+from utils.ttl_cache import TTLCache
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Dodo Payments API configuration
 DODO_API_KEY = os.getenv('DODO_PAYMENTS_API_KEY', '').strip('"')
 DODO_ENVIRONMENT = os.getenv('DODO_ENVIRONMENT', 'live_mode')
 DODO_WEBHOOK_SECRET = os.getenv('DODO_WEBHOOK_SECRET', '')
+# Expected webhook signature length: 'v1,' + base64 of a 32-byte HMAC-SHA256 (44 chars)
+_V1_SIGNATURE_LENGTH = len('v1,') + 44
 
 # Strip trailing slash to avoid double slashes in URLs
 FRONTEND_URL = os.getenv('FRONTEND_URL', 'http://localhost:3000').rstrip('/')
@@ -24,20 +38,161 @@ DODO_PRODUCT_PRO_PLUS_ID = os.getenv('DODO_PRODUCT_PRO_PLUS_ID')
 # Advisor "Pro Advisor" subscription products (monthly + yearly billing cycles)
 DODO_PRODUCT_ADVISOR_PRO_MONTHLY_ID = os.getenv('DODO_PRODUCT_ADVISOR_PRO_MONTHLY_ID')
 DODO_PRODUCT_ADVISOR_PRO_YEARLY_ID = os.getenv('DODO_PRODUCT_ADVISOR_PRO_YEARLY_ID')
+
+# Credit packs reuse existing Dodo products
+DODO_PRODUCT_ADVISOR_PROJECT_ID = os.getenv('DODO_PRODUCT_ADVISOR_PROJECT_ID')
+
+# Lookup tables resolved once at import: key -> (product_id, return_url)
+PLAN_CHECKOUTS = {
+    plan_id: (product_id, f"{FRONTEND_URL}/pricing?subscription=success&plan={plan_id}")
+    for plan_id, product_id in (('PRO', DODO_PRODUCT_PRO_ID), ('PRO_PLUS', DODO_PRODUCT_PRO_PLUS_ID))
+}
+ADVISOR_PRO_CHECKOUTS = {
+    cycle: (product_id, f"{FRONTEND_URL}/advisor/dashboard?advisor_subscription=success&cycle={cycle}")
+    for cycle, product_id in (
+        ('monthly', DODO_PRODUCT_ADVISOR_PRO_MONTHLY_ID),
+        ('yearly', DODO_PRODUCT_ADVISOR_PRO_YEARLY_ID),
+    )
+}
+CREDIT_PACK_PRODUCT_IDS = {
+    'starter': DODO_PRODUCT_PRO_ID,
+    'growth': DODO_PRODUCT_PRO_PLUS_ID,
+    'pro': DODO_PRODUCT_ADVISOR_PROJECT_ID,
+}
 # Dodo API base URL
 DODO_API_BASE = 'https://live.dodopayments.com' if DODO_ENVIRONMENT == 'live_mode' else 'https://test.dodopayments.com'
 
+# Shared Dodo client, see _get_dodo_client()
+_dodo_client = None
+_dodo_client_lock = Lock()
 
-def _get_dodo_client():
-    """Get Dodo Payments client"""
+# Resolved checkout contacts, so repeat checkouts skip the profile + Clerk lookups
+_checkout_contact_cache = TTLCache(maxsize=1024, ttl=600)
+
+
+def _is_dodo_outage(exc: Exception) -> bool:
+    """True for errors that mean Dodo itself is unhealthy (connection, timeout, 5xx)"""
     try:
-        from dodopayments import DodoPayments
-        return DodoPayments(
-            bearer_token=DODO_API_KEY,
-            environment=DODO_ENVIRONMENT
-        )
+        from dodopayments import APIConnectionError, APIStatusError
     except ImportError:
-        raise ValueError("dodopayments package not installed. Run: pip install dodopayments")
+        return False
+    if isinstance(exc, APIConnectionError):
+        return True
+    return isinstance(exc, APIStatusError) and exc.status_code >= 500
+
+
+# Fail fast on checkout creation while Dodo is erroring instead of tying up workers.
+# 4xx/validation errors come from one user's input and don't trip the breaker.
+_dodo_checkout_breaker = CircuitBreaker('dodo_checkout', fail_max=5, reset_timeout=30,
+                                        is_failure=_is_dodo_outage)
+
+
+class PaymentProviderUnavailable(ValueError):
+    """Raised when Dodo calls are short-circuited by the circuit breaker"""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Payment provider is temporarily unavailable. Please try again shortly.")
+        self.retry_after = retry_after
+
+
+def _get_dodo_client():
+    """Get the shared Dodo Payments client (created once, reuses its connection pool)"""
+    global _dodo_client
+    if _dodo_client is not None:
+        return _dodo_client
+    
+    with _dodo_client_lock:
+        if _dodo_client is None:
+            try:
+                from dodopayments import DodoPayments
+            except ImportError:
+                raise ValueError("dodopayments package not installed. Run: pip install dodopayments")
+            _dodo_client = DodoPayments(
+                bearer_token=DODO_API_KEY,
+                environment=DODO_ENVIRONMENT
+            )
+            atexit.register(_dodo_client.close)
+    return _dodo_client
+
+
+def invalidate_checkout_contact(clerk_user_id: str) -> None:
+    """Drop the cached checkout contact after a profile change or account deletion"""
+    _checkout_contact_cache.delete(clerk_user_id)
+
+
+def _call_dodo_checkout(func, **kwargs):
+    """Call a Dodo checkout/payment-link endpoint through the circuit breaker"""
+    try:
+        return _dodo_checkout_breaker.call(func, **kwargs)
+    except CircuitOpenError as e:
+        raise PaymentProviderUnavailable(e.retry_after)
+
+
+def _resolve_checkout_contact(clerk_user_id: str) -> Tuple[Optional[str], str, bool]:
+    """
+    Resolve the email and name to put on a checkout session.
+    
+    Lookup order: in-process cache -> founder profile -> X-User-Email header ->
+    Clerk API. The header is client-controlled, so it is only used for the
+    checkout session and never stored or cached (payment.succeeded resolves
+    founders by customer email). An email verified through the Clerk API is
+    written back through the same RPC (its backfill branch) so later lookups
+    are served by the database.
+    
+    Returns:
+        tuple: (email or None, name, whether a founder profile exists)
+    """
+    cached = _checkout_contact_cache.get(clerk_user_id)
+    if cached is not None:
+        return cached
+    
+    supabase = get_supabase()
+    # No fallback email: the RPC only reads the profile here
+    profile = supabase.rpc('get_or_sync_founder_email', {
+        'p_clerk_user_id': clerk_user_id,
+        'p_fallback_email': None,
+    }).execute()
+    
+    user_email = None
+    user_name = ''
+    if profile.data:
+        user_email = profile.data[0].get('email')
+        user_name = profile.data[0].get('name') or ''
+    
+    if not user_email or '@' not in user_email:
+        header_email = get_clerk_user_email()
+        if header_email and '@' in header_email:
+            return (header_email, user_name, bool(profile.data))
+        
+        user_email = fetch_clerk_user_email(clerk_user_id)
+        if profile.data and user_email and '@' in user_email:
+            try:
+                # Only a Clerk-verified email is passed as the fallback to persist
+                supabase.rpc('get_or_sync_founder_email', {
+                    'p_clerk_user_id': clerk_user_id,
+                    'p_fallback_email': user_email,
+                }).execute()
+            except Exception:
+                pass  # Write-back is best-effort
+    
+    contact = (user_email, user_name, bool(profile.data))
+    if user_email and '@' in user_email:
+        _checkout_contact_cache.set(clerk_user_id, contact)
+    return contact
+
+
+def _build_checkout_session(product_id: str, user_email: str, user_name: str,
+                            return_url: str, metadata: Dict[str, str]) -> Dict[str, Any]:
+    """Build the kwargs for a single-product Dodo checkout session"""
+    return {
+        "product_cart": [{"product_id": product_id, "quantity": 1}],
+        "customer": {
+            "email": user_email,
+            "name": user_name or user_email.split('@')[0],
+        },
+        "return_url": return_url,
+        "metadata": metadata,
+    }
 
 
 def create_subscription_checkout(clerk_user_id: str, plan_id: str) -> Dict[str, str]:
@@ -54,32 +209,16 @@ def create_subscription_checkout(clerk_user_id: str, plan_id: str) -> Dict[str,
     if not DODO_API_KEY:
         raise ValueError("Dodo Payments API not configured. Please set DODO_PAYMENTS_API_KEY.")
     
-    # Get product ID for the plan
-    product_id = None
-    if plan_id == 'PRO':
-        product_id = DODO_PRODUCT_PRO_ID
-    elif plan_id == 'PRO_PLUS':
-        product_id = DODO_PRODUCT_PRO_PLUS_ID
-    else:
+    # Get product ID and return URL for the plan
+    if plan_id not in PLAN_CHECKOUTS:
         raise ValueError(f"Invalid plan ID: {plan_id}")
     
+    product_id, return_url = PLAN_CHECKOUTS[plan_id]
     if not product_id:
         raise ValueError(f"Dodo product ID not configured for plan {plan_id}")
     
     # Get user's email from profile, fallback to Clerk API
-    supabase = get_supabase()
-    profile = supabase.table('founders').select('email, name').eq('clerk_user_id', clerk_user_id).execute()
-    
-    user_email = None
-    user_name = ''
-    
-    if profile.data:
-        user_email = profile.data[0].get('email')
-        user_name = profile.data[0].get('name', '')
-    
-    # If email is missing or empty, get it from Clerk API
-    if not user_email or '@' not in user_email:
-        user_email = get_clerk_user_email(clerk_user_id)
+    user_email, user_name, _ = _resolve_checkout_contact(clerk_user_id)
     
     if not user_email or '@' not in user_email:
         raise ValueError("User email not found. Please complete your profile or ensure your email is set in Clerk.")
@@ -87,25 +226,25 @@ def create_subscription_checkout(clerk_user_id: str, plan_id: str) -> Dict[str,
     try:
         client = _get_dodo_client()
         
-        session = client.checkout_sessions.create(
-            product_cart=[{"product_id": product_id, "quantity": 1}],
-            customer={
-                "email": user_email,
-                "name": user_name or user_email.split('@')[0]
-            },
-            return_url=f"{FRONTEND_URL}/pricing?subscription=success&plan={plan_id}",
-            metadata={
+        session = _call_dodo_checkout(client.checkout_sessions.create, **_build_checkout_session(
+            product_id,
+            user_email,
+            user_name,
+            return_url,
+            {
                 "clerk_user_id": clerk_user_id,
                 "plan_id": plan_id,
                 "subscription_type": "founder_plan"
             }
-        )
+        ))
         
         return {
             "checkout_url": session.checkout_url,
             "checkout_id": session.session_id
         }
         
+    except PaymentProviderUnavailable:
+        raise
     except Exception as e:
         error_msg = str(e)
         raise ValueError(f"Failed to create checkout session: {error_msg}")
@@ -140,48 +279,38 @@ def create_advisor_subscription_checkout(
     if not DODO_API_KEY:
         raise ValueError("Dodo Payments API not configured. Please set DODO_PAYMENTS_API_KEY.")
 
-    if billing_cycle not in ('monthly', 'yearly'):
+    if billing_cycle not in ADVISOR_PRO_CHECKOUTS:
         raise ValueError("billing_cycle must be 'monthly' or 'yearly'")
 
-    product_id = (
-        DODO_PRODUCT_ADVISOR_PRO_YEARLY_ID
-        if billing_cycle == 'yearly'
-        else DODO_PRODUCT_ADVISOR_PRO_MONTHLY_ID
-    )
+    product_id, return_url = ADVISOR_PRO_CHECKOUTS[billing_cycle]
     if not product_id:
         raise ValueError(f"Dodo product ID not configured for advisor {billing_cycle} subscription")
 
-    supabase = get_supabase()
-    profile = supabase.table('founders').select('email, name').eq('clerk_user_id', clerk_user_id).execute()
-    if not profile.data:
+    user_email, user_name, has_profile = _resolve_checkout_contact(clerk_user_id)
+    if not has_profile:
         raise ValueError("Profile not found")
-
-    user_email = profile.data[0].get('email')
-    user_name = profile.data[0].get('name', '')
-    if not user_email or '@' not in user_email:
-        user_email = get_clerk_user_email(clerk_user_id)
     if not user_email or '@' not in user_email:
         raise ValueError("User email not found. Please complete your profile.")
 
     try:
         client = _get_dodo_client()
-        session = client.checkout_sessions.create(
-            product_cart=[{"product_id": product_id, "quantity": 1}],
-            customer={
-                "email": user_email,
-                "name": user_name or user_email.split('@')[0],
-            },
-            return_url=f"{FRONTEND_URL}/advisor/dashboard?advisor_subscription=success&cycle={billing_cycle}",
-            metadata={
+        session = _call_dodo_checkout(client.checkout_sessions.create, **_build_checkout_session(
+            product_id,
+            user_email,
+            user_name,
+            return_url,
+            {
                 "clerk_user_id": clerk_user_id,
                 "subscription_type": "advisor_pro",
                 "billing_cycle": billing_cycle,
             },
-        )
+        ))
         return {
             "checkout_url": session.checkout_url,
             "checkout_id": session.session_id,
         }
+    except PaymentProviderUnavailable:
+        raise
     except Exception as e:
         raise ValueError(f"Failed to create checkout session: {e}")
 
@@ -243,10 +372,12 @@ def _activate_advisor_subscription(
     clerk_user_id: str,
     subscription_id: Optional[str],
     billing_cycle: str,
+    now: Optional[datetime] = None,
 ) -> None:
     """Mark the advisor as actively subscribed in the database.
 
     Used by the payment.succeeded / subscription.active webhook handlers.
+    `now` lets a handler reuse the timestamp it already took.
     """
     from utils.logger import log_info
 
@@ -258,10 +389,8 @@ def _activate_advisor_subscription(
     founder_id = founder.data[0]['id']
 
     # Period: 1 month for monthly, 1 year for yearly
-    if billing_cycle == 'yearly':
-        period_end = datetime.now(timezone.utc) + timedelta(days=365)
-    else:
-        period_end = datetime.now(timezone.utc) + timedelta(days=30)
+    now = now or datetime.now(timezone.utc)
+    period_end = now + timedelta(days=365 if billing_cycle == 'yearly' else 30)
 
     update = {
         'subscription_status': 'active',
@@ -372,6 +501,13 @@ def cancel_subscription(clerk_user_id: str) -> Dict[str, Any]:
         raise ValueError(f"Failed to cancel subscription: {error_msg}")
 
 
+def parse_webhook_body(body: bytes) -> Dict[str, Any]:
+    """Parse a raw webhook body, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
 # Keep old function name for backward compatibility
 def validate_webhook_event(body: bytes, headers: dict) -> Optional[Dict[str, Any]]:
     """
@@ -392,7 +528,7 @@ def validate_webhook_event(body: bytes, headers: dict) -> Optional[Dict[str, Any
         log_error("DODO_WEBHOOK_SECRET not configured - accepting webhook without verification")
         # In development, allow unverified webhooks
         try:
-            return json.loads(body)
+            return parse_webhook_body(body)
         except:
             return None
     
@@ -407,26 +543,38 @@ def validate_webhook_event(body: bytes, headers: dict) -> Optional[Dict[str, Any
             log_error("Missing webhook headers")
             return None
         
+        # Signature format: v1,<base64 HMAC-SHA256> (may list multiple versions).
+        # Drop anything that can't be a v1 signature before hashing the body,
+        # so malformed/garbage requests cost O(1) instead of a full HMAC pass.
+        candidates = [
+            sig[3:] for sig in webhook_signature.split(' ')
+            if sig.startswith('v1,') and len(sig) == _V1_SIGNATURE_LENGTH
+        ]
+        if not candidates:
+            log_error("Webhook signature verification failed")
+            return None
+        
         # Verify signature using HMAC-SHA256
-        # Signature format: v1,<base64-signature>
         expected_sig = _compute_webhook_signature(
-            webhook_id, webhook_timestamp, body.decode('utf-8'), DODO_WEBHOOK_SECRET
+            webhook_id, webhook_timestamp, body, DODO_WEBHOOK_SECRET
         )
         
-        # Compare signatures (webhook_signature may have multiple versions)
-        signatures = webhook_signature.split(' ')
+        # Compare raw digests
         verified = False
-        for sig in signatures:
-            if sig.startswith('v1,'):
-                if hmac.compare_digest(sig, expected_sig):
-                    verified = True
-                    break
+        for sig in candidates:
+            try:
+                provided_sig = base64.b64decode(sig, validate=True)
+            except (binascii.Error, ValueError):
+                continue
+            if hmac.compare_digest(provided_sig, expected_sig):
+                verified = True
+                break
         
         if not verified:
             log_error("Webhook signature verification failed")
             return None
         
-        event = json.loads(body)
+        event = parse_webhook_body(body)
         log_info(f"Webhook event validated successfully: {event.get('type', 'unknown')}")
         return event
         
@@ -435,26 +583,26 @@ def validate_webhook_event(body: bytes, headers: dict) -> Optional[Dict[str, Any
         return None
 
 
-def _compute_webhook_signature(webhook_id: str, timestamp: str, body: str, secret: str) -> str:
-    """Compute expected webhook signature using Standard Webhooks spec"""
-    import base64
+def _compute_webhook_signature(webhook_id: str, timestamp: str, body: bytes, secret: str) -> bytes:
+    """Compute the expected raw HMAC-SHA256 webhook digest using Standard Webhooks spec"""
+    # Message to sign: id.timestamp.body (raw body bytes, no decode/re-encode)
+    signed_content = f"{webhook_id}.{timestamp}.".encode('utf-8') + body
     
-    # Message to sign: id.timestamp.body
-    signed_content = f"{webhook_id}.{timestamp}.{body}"
-    
-    # Decode secret (may be base64 encoded with prefix)
-    secret_bytes = secret.encode('utf-8')
+    # One-shot HMAC-SHA256: passing the digest by name lets hmac.digest use
+    # OpenSSL's HMAC directly (hardware SHA extensions where the CPU has them)
+    return hmac.digest(_webhook_secret_bytes(secret), signed_content, 'sha256')
+
+
+@lru_cache(maxsize=4)
+def _webhook_secret_bytes(secret: str) -> bytes:
+    """Decode the webhook secret once (may be base64 encoded with prefix)"""
     if secret.startswith('whsec_'):
-        secret_bytes = base64.b64decode(secret[6:])
-    
-    # Compute HMAC-SHA256
-    signature = hmac.new(
-        secret_bytes,
-        signed_content.encode('utf-8'),
-        hashlib.sha256
-    ).digest()
-    
-    return f"v1,{base64.b64encode(signature).decode('utf-8')}"
+        return base64.b64decode(secret[6:])
+    return secret.encode('utf-8')
+
+
+# The subscription.* handlers below filter founders / advisor_profiles by
+# subscription_id; keep the partial indexes from migrations/014 in place.
 
 
 def handle_subscription_webhook(webhook_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -470,7 +618,8 @@ def handle_subscription_webhook(webhook_data: Dict[str, Any]) -> Dict[str, Any]:
     - subscription.on_hold: When subscription is put on hold
     
     Returns:
-        dict: Result of webhook processing
+        dict: Result of webhook processing. Errors that a redelivery cannot
+        fix carry "retryable": False.
     """
     from utils.logger import log_info
     
@@ -482,22 +631,10 @@ def handle_subscription_webhook(webhook_data: Dict[str, Any]) -> Dict[str, Any]:
         "data_keys": list(webhook_data.get('data', {}).keys()) if webhook_data.get('data') else []
     })
     
-    if event_type == 'payment.succeeded':
-        return handle_payment_succeeded(webhook_data)
-    elif event_type == 'subscription.active':
-        return handle_subscription_active(webhook_data)
-    elif event_type == 'subscription.renewed':
-        return handle_subscription_renewed(webhook_data)
-    elif event_type == 'subscription.updated':
-        return handle_subscription_updated(webhook_data)
-    elif event_type == 'subscription.cancelled':
-        return handle_subscription_canceled(webhook_data)
-    elif event_type == 'subscription.on_hold':
-        return handle_subscription_on_hold(webhook_data)
-    elif event_type == 'subscription.failed':
-        return handle_subscription_failed(webhook_data)
-    else:
+    handler = WEBHOOK_HANDLERS.get(event_type)
+    if handler is None:
         return {"status": "ignored", "message": f"Event {event_type} not handled"}
+    return handler(webhook_data)
 
 
 def _extract_metadata(data: Dict[str, Any]) -> Dict[str, Any]:
@@ -556,7 +693,6 @@ def handle_payment_succeeded(webhook_data: Dict[str, Any]) -> Dict[str, Any]:
         log_info(f"Processing payment.succeeded: {payment_id}")
         
         metadata = _extract_metadata(data)
-        subscription_type = metadata.get('subscription_type')
         clerk_user_id = metadata.get('clerk_user_id')
         
         supabase = get_supabase()
@@ -572,89 +708,27 @@ def handle_payment_succeeded(webhook_data: Dict[str, Any]) -> Dict[str, Any]:
         
         if not clerk_user_id:
             log_error(f"Cannot process payment {payment_id}: no clerk_user_id found")
-            return {"status": "error", "message": "Missing clerk_user_id"}
+            return {"status": "error", "message": "Missing clerk_user_id", "retryable": False}
+        
+        # One timestamp for the claim, period end and processing log
+        now = datetime.now(timezone.utc)
+        
+        # Idempotency: claim the payment before doing any work
+        if not _claim_webhook(supabase, payment_id, 'payment.succeeded', now):
+            log_info(f"Payment {payment_id} already processed (or in progress)")
+            return {"status": "success", "message": "Payment already processed", "idempotent": True}
         
-        # Check idempotency
         try:
-            processed_check = supabase.table('webhook_processing_log').select('id, status').eq('webhook_id', payment_id).eq('status', 'success').execute()
-            if processed_check.data:
-                log_info(f"Payment {payment_id} already processed successfully")
-                return {"status": "success", "message": "Payment already processed", "idempotent": True}
+            result = _apply_payment_succeeded(data, metadata, clerk_user_id, payment_id, now)
         except Exception:
-            pass
-        
-        if subscription_type == 'founder_plan':
-            plan_id = metadata.get('plan_id')
-            if not plan_id:
-                # Try to determine from product
-                product_id = data.get('product_id')
-                if product_id == DODO_PRODUCT_PRO_ID:
-                    plan_id = 'PRO'
-                elif product_id == DODO_PRODUCT_PRO_PLUS_ID:
-                    plan_id = 'PRO_PLUS'
-            
-            if not plan_id:
-                return {"status": "error", "message": "Missing plan_id"}
-            
-            subscription_id = data.get('subscription_id')
-            current_period_end = datetime.now(timezone.utc) + timedelta(days=30)
-            
-            plan_service.update_founder_plan(
-                clerk_user_id,
-                plan_id,
-                subscription_id=subscription_id,
-                subscription_status='active',
-                current_period_end=current_period_end
-            )
-            
-            _log_webhook_success(supabase, payment_id, 'payment.succeeded')
-            log_info(f"Plan {plan_id} activated for {clerk_user_id}")
-            return {"status": "success", "message": f"Plan {plan_id} activated"}
-
-        if subscription_type == 'advisor_pro':
-            billing_cycle = metadata.get('billing_cycle') or 'monthly'
-            # Sometimes billing_cycle isn't in metadata (e.g. renewal); infer from product_id
-            if billing_cycle not in ('monthly', 'yearly'):
-                product_id = data.get('product_id')
-                if product_id == DODO_PRODUCT_ADVISOR_PRO_YEARLY_ID:
-                    billing_cycle = 'yearly'
-                else:
-                    billing_cycle = 'monthly'
-
-            subscription_id = data.get('subscription_id')
-            _activate_advisor_subscription(clerk_user_id, subscription_id, billing_cycle)
-            _log_webhook_success(supabase, payment_id, 'payment.succeeded')
-            log_info(f"Advisor Pro ({billing_cycle}) activated for {clerk_user_id}")
-            return {"status": "success", "message": f"Advisor Pro {billing_cycle} activated"}
-
-        # Handle credit pack purchases
-        purchase_type = metadata.get('purchase_type')
-        if purchase_type == 'credit_pack':
-            from services import credit_service
-            
-            pack_key = metadata.get('pack_key')
-            credits_str = metadata.get('credits')
-            
-            if not pack_key or not credits_str:
-                return {"status": "error", "message": "Missing pack_key or credits in metadata"}
-            
-            credits_amount = int(credits_str)
-            
-            # Add credits to user's balance
-            credit_service.add_credits(
-                clerk_user_id=clerk_user_id,
-                amount=credits_amount,
-                transaction_type='purchase',
-                description=f"Purchased {pack_key} credit pack",
-                related_entity_id=payment_id,
-                related_entity_type='payment',
-            )
-            
-            _log_webhook_success(supabase, payment_id, 'payment.succeeded')
-            log_info(f"Credit pack {pack_key} ({credits_amount} credits) added for {clerk_user_id}")
-            return {"status": "success", "message": f"Added {credits_amount} credits"}
-
-        return {"status": "ignored", "message": f"Unknown subscription type: {subscription_type}"}
+            _release_webhook_claim(supabase, payment_id)
+            raise
+        
+        if result.get('status') == 'success':
+            _log_webhook_success(supabase, payment_id, 'payment.succeeded', now)
+        else:
+            _release_webhook_claim(supabase, payment_id)
+        return result
         
     except Exception as e:
         from utils.logger import log_error
@@ -662,6 +736,86 @@ def handle_payment_succeeded(webhook_data: Dict[str, Any]) -> Dict[str, Any]:
         return {"status": "error", "message": str(e)}
 
 
+def _apply_payment_succeeded(data: Dict[str, Any], metadata: Dict[str, Any],
+                             clerk_user_id: str, payment_id: str, now: datetime) -> Dict[str, Any]:
+    """Apply a claimed payment.succeeded event (plan, advisor pro or credit pack)"""
+    from utils.logger import log_info
+    
+    subscription_type = metadata.get('subscription_type')
+    
+    if subscription_type == 'founder_plan':
+        plan_id = metadata.get('plan_id')
+        if not plan_id:
+            # Try to determine from product
+            product_id = data.get('product_id')
+            if product_id == DODO_PRODUCT_PRO_ID:
+                plan_id = 'PRO'
+            elif product_id == DODO_PRODUCT_PRO_PLUS_ID:
+                plan_id = 'PRO_PLUS'
+        
+        if not plan_id:
+            return {"status": "error", "message": "Missing plan_id", "retryable": False}
+        
+        subscription_id = data.get('subscription_id')
+        current_period_end = now + timedelta(days=30)
+        
+        plan_service.update_founder_plan(
+            clerk_user_id,
+            plan_id,
+            subscription_id=subscription_id,
+            subscription_status='active',
+            current_period_end=current_period_end
+        )
+        
+        result_message = f"Plan {plan_id} activated"
+        log_info(f"Plan {plan_id} activated for {clerk_user_id}")
+
+    elif subscription_type == 'advisor_pro':
+        billing_cycle = metadata.get('billing_cycle') or 'monthly'
+        # Sometimes billing_cycle isn't in metadata (e.g. renewal); infer from product_id
+        if billing_cycle not in ('monthly', 'yearly'):
+            product_id = data.get('product_id')
+            if product_id == DODO_PRODUCT_ADVISOR_PRO_YEARLY_ID:
+                billing_cycle = 'yearly'
+            else:
+                billing_cycle = 'monthly'
+
+        subscription_id = data.get('subscription_id')
+        _activate_advisor_subscription(clerk_user_id, subscription_id, billing_cycle, now)
+        result_message = f"Advisor Pro {billing_cycle} activated"
+        log_info(f"Advisor Pro ({billing_cycle}) activated for {clerk_user_id}")
+
+    # Handle credit pack purchases
+    elif metadata.get('purchase_type') == 'credit_pack':
+        from services import credit_service
+        
+        pack_key = metadata.get('pack_key')
+        credits_str = metadata.get('credits')
+        
+        if not pack_key or not credits_str:
+            return {"status": "error", "message": "Missing pack_key or credits in metadata", "retryable": False}
+        
+        credits_amount = int(credits_str)
+        
+        # Add credits to user's balance
+        credit_service.add_credits(
+            clerk_user_id=clerk_user_id,
+            amount=credits_amount,
+            transaction_type='purchase',
+            description=f"Purchased {pack_key} credit pack",
+            related_entity_id=payment_id,
+            related_entity_type='payment',
+        )
+        
+        result_message = f"Added {credits_amount} credits"
+        log_info(f"Credit pack {pack_key} ({credits_amount} credits) added for {clerk_user_id}")
+
+    else:
+        return {"status": "ignored", "message": f"Unknown subscription type: {subscription_type}"}
+    
+    return {"status": "success", "message": result_message}
+
+
 def handle_subscription_active(webhook_data: Dict[str, Any]) -> Dict[str, Any]:
     """Handle subscription.active webhook - subscription is now active"""
     from utils.logger import log_info
@@ -696,11 +850,10 @@ def handle_subscription_active(webhook_data: Dict[str, Any]) -> Dict[str, Any]:
             _activate_advisor_subscription(clerk_user_id, subscription_id, cycle)
         elif subscription_id:
             # No metadata — try matching by subscription_id on advisor_profiles too
-            adv = supabase.table('advisor_profiles').select('user_id').eq('subscription_id', subscription_id).execute()
-            if adv.data:
-                supabase.table('advisor_profiles').update({
-                    'subscription_status': 'active'
-                }).eq('subscription_id', subscription_id).execute()
+            # (a no-op when no advisor has this subscription, so no existence check)
+            supabase.table('advisor_profiles').update({
+                'subscription_status': 'active'
+            }, returning=ReturnMethod.minimal).eq('subscription_id', subscription_id).execute()
 
         return {"status": "success", "message": "Subscription activated"}
 
@@ -720,40 +873,27 @@ def handle_subscription_renewed(webhook_data: Dict[str, Any]) -> Dict[str, Any]:
 
         supabase = get_supabase()
 
+        now = datetime.now(timezone.utc)
+
         # Try founder first
-        founder_period_end = datetime.now(timezone.utc) + timedelta(days=30)
-        founder_res = supabase.table('founders').update({
+        founder_period_end = now + timedelta(days=30)
+        supabase.table('founders').update({
             'subscription_status': 'active',
             'subscription_current_period_end': founder_period_end.isoformat()
-        }).eq('subscription_id', subscription_id).execute()
-
-        # Also try advisor — billing cycle determines period length
-        advisor = supabase.table('advisor_profiles').select(
-            'id, subscription_current_period_end'
-        ).eq('subscription_id', subscription_id).execute()
-        if advisor.data:
-            # Best-effort: detect cycle by previous period length; default monthly
-            previous_end = advisor.data[0].get('subscription_current_period_end')
-            cycle_days = 30
-            if previous_end:
-                try:
-                    prev = datetime.fromisoformat(str(previous_end).replace('Z', '+00:00'))
-                    if prev.tzinfo is None:
-                        prev = prev.replace(tzinfo=timezone.utc)
-                    delta = prev - (prev - timedelta(days=365))  # placeholder; fallback to 30
-                    # If the previous period was ~yearly (>= 300 days from creation), keep yearly
-                    # Simpler heuristic: default to 30, but use 365 if metadata says yearly
-                    metadata = _extract_metadata(data)
-                    if metadata.get('billing_cycle') == 'yearly':
-                        cycle_days = 365
-                except Exception:
-                    pass
-
-            new_period_end = datetime.now(timezone.utc) + timedelta(days=cycle_days)
-            supabase.table('advisor_profiles').update({
-                'subscription_status': 'active',
-                'subscription_current_period_end': new_period_end.isoformat(),
-            }).eq('subscription_id', subscription_id).execute()
+        }, returning=ReturnMethod.minimal).eq('subscription_id', subscription_id).execute()
+
+        # Also try advisor — billing cycle determines period length.
+        # Default monthly; use 365 days if metadata says yearly. The update is a
+        # no-op when no advisor has this subscription, so no existence check.
+        cycle_days = 30
+        if _extract_metadata(data).get('billing_cycle') == 'yearly':
+            cycle_days = 365
+
+        new_period_end = now + timedelta(days=cycle_days)
+        supabase.table('advisor_profiles').update({
+            'subscription_status': 'active',
+            'subscription_current_period_end': new_period_end.isoformat(),
+        }, returning=ReturnMethod.minimal).eq('subscription_id', subscription_id).execute()
 
         return {"status": "success", "message": "Subscription renewed"}
 
@@ -779,7 +919,10 @@ def handle_subscription_updated(webhook_data: Dict[str, Any]) -> Dict[str, Any]:
             update_data['subscription_status'] = status
         
         if update_data:
-            supabase.table('founders').update(update_data).eq('subscription_id', subscription_id).execute()
+            # Single write; the updated rows aren't needed back
+            supabase.table('founders').update(
+                update_data, returning=ReturnMethod.minimal
+            ).eq('subscription_id', subscription_id).execute()
         
         return {"status": "success", "message": "Subscription updated"}
         
@@ -808,44 +951,20 @@ def handle_subscription_canceled(webhook_data: Dict[str, Any]) -> Dict[str, Any]
 
         supabase = get_supabase()
 
-        # Founder side: mark as canceled, only downgrade if period ended
-        founder = supabase.table('founders').select(
-            'clerk_user_id, subscription_current_period_end'
-        ).eq('subscription_id', subscription_id).execute()
+        # Founder + advisor rows are marked cancelled in one statement; the
+        # advisor soft cutoff applies via the can_accept_bookings helper.
+        # Only downgrade the founder to FREE if the period has ended.
+        canceled = supabase.rpc('cancel_subscription_by_id', {
+            'p_subscription_id': subscription_id
+        }).execute()
         
-        if founder.data:
-            clerk_user_id = founder.data[0]['clerk_user_id']
-            period_end = founder.data[0].get('subscription_current_period_end')
-            
-            # Update status to canceled
-            supabase.table('founders').update({
-                'subscription_status': 'canceled'
-            }).eq('subscription_id', subscription_id).execute()
-            
-            # Only downgrade to FREE if period has ended
-            should_downgrade = True
-            if period_end:
-                try:
-                    end_dt = datetime.fromisoformat(str(period_end).replace('Z', '+00:00'))
-                    if end_dt.tzinfo is None:
-                        end_dt = end_dt.replace(tzinfo=timezone.utc)
-                    if end_dt > datetime.now(timezone.utc):
-                        # Period hasn't ended yet - don't downgrade
-                        should_downgrade = False
-                        log_info(f"Subscription {subscription_id} canceled but period ends {end_dt}, not downgrading yet")
-                except Exception as e:
-                    log_info(f"Error parsing period_end: {e}")
-            
-            if should_downgrade:
+        for row in canceled.data or []:
+            clerk_user_id = row['clerk_user_id']
+            if row.get('period_ended'):
                 plan_service.update_founder_plan(clerk_user_id, 'FREE')
                 log_info(f"Downgraded {clerk_user_id} to FREE (period ended)")
-
-        # Advisor side: mark cancelled (soft cutoff applies via the can_accept_bookings helper)
-        advisor = supabase.table('advisor_profiles').select('id').eq('subscription_id', subscription_id).execute()
-        if advisor.data:
-            supabase.table('advisor_profiles').update({
-                'subscription_status': 'cancelled',
-            }).eq('subscription_id', subscription_id).execute()
+            else:
+                log_info(f"Subscription {subscription_id} canceled but period not ended, not downgrading yet")
 
         return {"status": "success", "message": "Subscription canceled"}
 
@@ -867,12 +986,12 @@ def handle_subscription_on_hold(webhook_data: Dict[str, Any]) -> Dict[str, Any]:
 
         supabase.table('founders').update({
             'subscription_status': 'on_hold'
-        }).eq('subscription_id', subscription_id).execute()
+        }, returning=ReturnMethod.minimal).eq('subscription_id', subscription_id).execute()
 
         # Advisor side: 'past_due' is the closest analog
         supabase.table('advisor_profiles').update({
             'subscription_status': 'past_due',
-        }).eq('subscription_id', subscription_id).execute()
+        }, returning=ReturnMethod.minimal).eq('subscription_id', subscription_id).execute()
 
         return {"status": "success", "message": "Subscription on hold"}
 
@@ -894,7 +1013,7 @@ def handle_subscription_failed(webhook_data: Dict[str, Any]) -> Dict[str, Any]:
         
         supabase.table('founders').update({
             'subscription_status': 'failed'
-        }).eq('subscription_id', subscription_id).execute()
+        }, returning=ReturnMethod.minimal).eq('subscription_id', subscription_id).execute()
         
         return {"status": "success", "message": "Subscription failure recorded"}
         
@@ -902,13 +1021,75 @@ def handle_subscription_failed(webhook_data: Dict[str, Any]) -> Dict[str, Any]:
         return {"status": "error", "message": str(e)}
 
 
-def _log_webhook_success(supabase, webhook_id: str, webhook_type: str):
+# Dodo event type -> handler, used by handle_subscription_webhook
+WEBHOOK_HANDLERS = {
+    'payment.succeeded': handle_payment_succeeded,
+    'subscription.active': handle_subscription_active,
+    'subscription.renewed': handle_subscription_renewed,
+    'subscription.updated': handle_subscription_updated,
+    'subscription.cancelled': handle_subscription_canceled,
+    'subscription.on_hold': handle_subscription_on_hold,
+    'subscription.failed': handle_subscription_failed,
+}
+
+
+# Claims older than this are treated as abandoned (e.g. the worker died mid-processing)
+WEBHOOK_CLAIM_STALE_AFTER = timedelta(minutes=10)
+
+
+def _claim_webhook(supabase, webhook_id: str, webhook_type: str, now: Optional[datetime] = None) -> bool:
+    """
+    Claim a webhook for processing.
+    
+    Relies on the UNIQUE constraint on webhook_processing_log.webhook_id: the
+    insert is ON CONFLICT DO NOTHING, so exactly one concurrent delivery gets
+    the row back. A stale 'processing' claim is taken over so provider retries
+    are not lost when a previous attempt died.
+    
+    Returns:
+        bool: True if the caller owns the webhook, False if it is already
+        processed (or being processed)
+    """
+    now = now or datetime.now(timezone.utc)
+    now_iso = now.isoformat()
+    try:
+        claim = supabase.table('webhook_processing_log').upsert({
+            'webhook_id': webhook_id,
+            'webhook_type': webhook_type,
+            'processed_at': now_iso,
+            'status': 'processing'
+        }, on_conflict='webhook_id', ignore_duplicates=True).execute()
+        if claim.data:
+            return True
+        
+        reclaim = supabase.table('webhook_processing_log').update({
+            'processed_at': now_iso
+        }).eq('webhook_id', webhook_id).eq('status', 'processing').lt(
+            'processed_at', (now - WEBHOOK_CLAIM_STALE_AFTER).isoformat()
+        ).execute()
+        return bool(reclaim.data)
+    except Exception:
+        # Don't block payments if the log table is unavailable
+        return True
+
+
+def _release_webhook_claim(supabase, webhook_id: str):
+    """Drop an unfinished claim so Dodo's redelivery (the route answers non-2xx) can reprocess it"""
+    try:
+        supabase.table('webhook_processing_log').delete().eq(
+            'webhook_id', webhook_id
+        ).eq('status', 'processing').execute()
+    except Exception:
+        pass
+
+
+def _log_webhook_success(supabase, webhook_id: str, webhook_type: str, now: Optional[datetime] = None):
     """Log successful webhook processing"""
     try:
         supabase.table('webhook_processing_log').upsert({
             'webhook_id': webhook_id,
             'webhook_type': webhook_type,
-            'processed_at': datetime.now(timezone.utc).isoformat(),
+            'processed_at': (now or datetime.now(timezone.utc)).isoformat(),
             'status': 'success'
         }, on_conflict='webhook_id').execute()
     except Exception:
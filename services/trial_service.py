@@ -1,11 +1,13 @@
 """Pro Trial Request Service - handles free trial requests and approvals"""
 from config.database import get_supabase
+from utils.request_cache import cached_founder_id
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, Optional, List
 
 TRIAL_DURATION_DAYS = 7
 
 
+@cached_founder_id
 def _get_founder_id(clerk_user_id: str) -> str:
     """Get founder ID from clerk_user_id"""
     supabase = get_supabase()
@@ -1,5 +1,6 @@
 """Waitlist-related business logic"""
 from config.database import get_supabase
+from utils.validation import validate_email
 
 def join_waitlist(email):
     """Add email to waitlist"""
@@ -8,27 +9,26 @@ def join_waitlist(email):
     if not email:
         raise ValueError("Email is required")
     
-    # Basic email validation
-    if '@' not in email or '.' not in email.split('@')[1]:
+    # Validate before touching the database (precompiled pattern)
+    if not validate_email(email):
         raise ValueError("Invalid email format")
     
     supabase = get_supabase()
     
-    # Check if email already exists
-    existing = supabase.table('waitlist').select('email').eq('email', email).execute()
-    if existing.data:
+    # Insert email into waitlist; an existing email is a no-op and returns no row
+    result = supabase.table('waitlist').upsert(
+        {'email': email}, on_conflict='email', ignore_duplicates=True
+    ).execute()
+    
+    if not result.data:
         return {
             "message": "You're already on the waitlist!",
             "email": email,
             "already_exists": True
         }
     
-    # Insert email into waitlist
-    result = supabase.table('waitlist').insert({'email': email}).execute()
-    
     return {
         "message": "Successfully joined the waitlist!",
         "email": email,
         "already_exists": False
     }
-
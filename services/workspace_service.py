@@ -2,6 +2,43 @@
 from config.database import get_supabase
 from .notification_service import NotificationService, ApprovalService
 from services import email_service
+from utils.parallel import gather
+from utils.ttl_cache import TTLCache
+from utils.batch_writer import BatchWriter
+
+# (clerk_user_id, workspace_id) -> check_workspace_access row. Only granted
+# access is cached, so new participants are never locked out; the TTL bounds
+# how long other workers see a removed participant or an archived workspace.
+_access_cache = TTLCache(maxsize=100_000, ttl=30)
+
+_audit_writer = BatchWriter('workspace_audit_log')
+
+# founder_id -> display name for notification titles; names rarely change
+_founder_name_cache = TTLCache(maxsize=10000, ttl=300)
+
+# workspace_id -> formatted roles list; dropped by upsert_role
+_roles_cache = TTLCache(maxsize=1024, ttl=15)
+
+_VALID_STAGES = frozenset({'idea', 'mvp', 'revenue', 'other'})
+_CHECKIN_VERDICTS = frozenset({'on_track', 'at_risk', 'off_track'})
+_PARTNER_REVIEW_VERDICTS = frozenset({'ON_TRACK', 'AT_RISK', 'OFF_TRACK'})
+_DEFAULT_PARTNER_NAME = 'Partner'
+_PARTNER_REVIEW_VERDICT_DISPLAY = {'ON_TRACK': 'On track', 'AT_RISK': 'At risk', 'OFF_TRACK': 'Off track'}
+
+# Columns the workspace endpoints return, shared by the list endpoints and
+# the combined workspace context
+_ROLE_COLUMNS = (
+    'id, workspace_id, user_id, role_title, responsibilities, created_at, updated_at, '
+    'user:founders!user_id(id, name)'
+)
+_CHECKIN_COLUMNS = (
+    'id, workspace_id, week_start, summary, status, progress_percent, created_by_user_id, created_at, '
+    'creator:founders!created_by_user_id(id, name)'
+)
+_EQUITY_SCENARIO_COLUMNS = (
+    'id, workspace_id, label, data, is_current, created_by_user_id, created_at, updated_at, '
+    'approval_status, status, note, creator:founders!created_by_user_id(id, name)'
+)
 
 def _get_founder_id(clerk_user_id, email=None):
     """Helper to get founder ID from clerk_user_id.
@@ -24,21 +61,19 @@ def _get_founder_id(clerk_user_id, email=None):
     if not user_profile.data:
         # If email is provided, check for existing founder by email (case-insensitive)
         if email and email.strip():
-            email_lower = email.strip().lower()
-            all_founders = supabase.table('founders').select('id, email, clerk_user_id').execute()
-            if all_founders.data:
-                for founder in all_founders.data:
-                    founder_email = founder.get('email', '').strip().lower()
-                    if founder_email == email_lower:
-                        # Found existing founder with same email - update clerk_user_id
-                        supabase.table('founders').update({'clerk_user_id': clerk_user_id}).eq('id', founder['id']).execute()
-                        # Cache the result
-                        try:
-                            from utils.request_cache import set_cached_founder_id
-                            set_cached_founder_id(clerk_user_id, founder['id'])
-                        except ImportError:
-                            pass
-                        return founder['id']
+            # Case-insensitive match done in Postgres against an index (migrations/022)
+            match = supabase.rpc('find_founder_by_email', {'p_email': email}).execute()
+            if match.data:
+                founder = match.data[0]
+                # Found existing founder with same email - update clerk_user_id
+                supabase.table('founders').update({'clerk_user_id': clerk_user_id}).eq('id', founder['id']).execute()
+                # Cache the result
+                try:
+                    from utils.request_cache import set_cached_founder_id
+                    set_cached_founder_id(clerk_user_id, founder['id'])
+                except ImportError:
+                    pass
+                return founder['id']
         
         raise ValueError("Profile not found")
     
@@ -53,40 +88,91 @@ def _get_founder_id(clerk_user_id, email=None):
     
     return founder_id
 
+def _get_founder_name(founder_id, default=None):
+    """Display name for a founder, cached across requests"""
+    name = _founder_name_cache.get(founder_id)
+    if name is None:
+        supabase = get_supabase()
+        founder = supabase.table('founders').select('name').eq('id', founder_id).execute()
+        name = founder.data[0].get('name') if founder.data else None
+        if name:
+            _founder_name_cache.set(founder_id, name)
+    return name or default
+
+def _check_workspace_access(clerk_user_id, workspace_id):
+    """Fetch founder id, participant role and archived flag in one RPC call"""
+    try:
+        from utils.request_cache import get_cached_workspace_access
+        cached = get_cached_workspace_access(clerk_user_id, workspace_id)
+        if cached:
+            return cached
+    except ImportError:
+        pass
+    
+    cache_key = (clerk_user_id, workspace_id)
+    cached = _access_cache.get(cache_key)
+    if cached:
+        return cached
+    
+    supabase = get_supabase()
+    result = supabase.rpc('check_workspace_access', {
+        'p_clerk_user_id': clerk_user_id,
+        'p_workspace_id': workspace_id,
+    }).execute()
+    
+    if not result.data:
+        raise ValueError("Profile not found")
+    
+    access = result.data[0]
+    try:
+        from utils.request_cache import set_cached_founder_id, set_cached_workspace_access
+        set_cached_founder_id(clerk_user_id, access['founder_id'])
+        # Only granted access is memoized, same as _access_cache
+        if access.get('is_participant'):
+            set_cached_workspace_access(clerk_user_id, workspace_id, access)
+    except ImportError:
+        pass
+    if access.get('is_participant'):
+        _access_cache.set(cache_key, access)
+    return access
+
+def invalidate_workspace_access(workspace_id=None, clerk_user_id=None):
+    """Drop cached access checks for a workspace and/or user after participants
+    or archive state change"""
+    def matches(key):
+        return ((workspace_id is None or key[1] == workspace_id) and
+                (clerk_user_id is None or key[0] == clerk_user_id))
+    _access_cache.delete_where(matches)
+    try:
+        from utils.request_cache import invalidate_cached_workspace_access
+        invalidate_cached_workspace_access(workspace_id, clerk_user_id)
+    except ImportError:
+        pass
+    from services import feed_service
+    feed_service.invalidate_workspace_access(workspace_id, clerk_user_id)
+
 def _verify_workspace_access(clerk_user_id, workspace_id, allowed_roles=None, require_write=False):
     """Verify that the user is a participant in the workspace
     allowed_roles: list of roles allowed (None means any role is allowed)
     require_write: if True, fails for archived workspaces (they're read-only)
     """
-    founder_id = _get_founder_id(clerk_user_id)
-    supabase = get_supabase()
+    access = _check_workspace_access(clerk_user_id, workspace_id)
     
     # Check if workspace is archived (requires write access to fail)
-    if require_write:
-        workspace = supabase.table('workspaces').select('is_archived').eq('id', workspace_id).execute()
-        if workspace.data and workspace.data[0].get('is_archived'):
-            raise ValueError("This workspace has been archived and is read-only. No changes can be made.")
-    
-    # Try to select role column, but handle case where it might not exist yet
-    try:
-        participant_query = supabase.table('workspace_participants').select('id, role').eq('workspace_id', workspace_id).eq('user_id', founder_id)
-        participant = participant_query.execute()
-    except Exception:
-        # Fallback if role column doesn't exist yet
-        participant_query = supabase.table('workspace_participants').select('id').eq('workspace_id', workspace_id).eq('user_id', founder_id)
-        participant = participant_query.execute()
+    if require_write and access.get('is_archived'):
+        raise ValueError("This workspace has been archived and is read-only. No changes can be made.")
     
-    if not participant.data:
+    if not access.get('is_participant'):
         raise ValueError("Access denied: You are not a participant in this workspace")
     
     # Check role if specified
     if allowed_roles:
-        participant_role = participant.data[0].get('role')
+        participant_role = access.get('role')
         # If role is None/not set, treat as founder (has all permissions)
         if participant_role is not None and participant_role not in allowed_roles:
             raise ValueError(f"Access denied: This action requires one of these roles: {', '.join(allowed_roles)}")
     
-    return founder_id
+    return access['founder_id']
 
 
 def is_workspace_archived(workspace_id: str) -> bool:
@@ -97,42 +183,52 @@ def is_workspace_archived(workspace_id: str) -> bool:
 
 def _can_edit_workspace(clerk_user_id, workspace_id):
     """Check if user can edit workspace (not ADVISOR and not archived)"""
-    founder_id = _get_founder_id(clerk_user_id)
-    supabase = get_supabase()
+    access = _check_workspace_access(clerk_user_id, workspace_id)
     
     # Check if workspace is archived (read-only)
-    workspace = supabase.table('workspaces').select('is_archived').eq('id', workspace_id).execute()
-    if workspace.data and workspace.data[0].get('is_archived'):
+    if access.get('is_archived'):
         raise ValueError("This workspace has been archived and is read-only. No changes can be made.")
     
-    # Try to select role column, but handle case where it might not exist yet
-    try:
-        participant = supabase.table('workspace_participants').select('role').eq('workspace_id', workspace_id).eq('user_id', founder_id).execute()
-    except Exception:
-        # Fallback if role column doesn't exist yet - assume founder (can edit)
-        participant = supabase.table('workspace_participants').select('id').eq('workspace_id', workspace_id).eq('user_id', founder_id).execute()
-    
-    if not participant.data:
+    if not access.get('is_participant'):
         raise ValueError("Access denied: You are not a participant in this workspace")
     
-    role = participant.data[0].get('role')
     # If role is None/not set, treat as founder (can edit)
-    if role == 'ADVISOR':
+    if access.get('role') == 'ADVISOR':
         raise ValueError("Access denied: Advisors cannot edit workspace settings")
     
-    return founder_id
+    return access['founder_id']
+
+def _get_workspace_row(supabase, table, row_id, label, workspace_id=None, columns='workspace_id'):
+    """Load a workspace-owned row by id, raising if it is missing or belongs
+    to a different workspace than `workspace_id` (when given)"""
+    row = supabase.table(table).select(columns).eq('id', row_id).maybe_single().execute()
+    if not row:
+        raise ValueError(f"{label} not found")
+    if workspace_id is not None and row.data['workspace_id'] != workspace_id:
+        raise ValueError(f"{label} does not belong to this workspace")
+    return row.data
+
+def _verify_advisor_access(clerk_user_id, workspace_id, denied_message):
+    """Verify that the user is an ADVISOR participant and return their founder id"""
+    access = _check_workspace_access(clerk_user_id, workspace_id)
+    if not access.get('is_participant'):
+        raise ValueError("Access denied: You are not a participant in this workspace")
+    if access.get('role') != 'ADVISOR':
+        raise ValueError(denied_message)
+    return access['founder_id']
 
 def _log_audit(workspace_id, user_id, action, entity_type=None, entity_id=None, metadata=None):
-    """Log an audit entry for workspace mutations"""
-    supabase = get_supabase()
-    supabase.table('workspace_audit_log').insert({
+    """Queue an audit entry for workspace mutations
+    Entries are inserted in batches off the request path (utils.batch_writer).
+    """
+    _audit_writer.put({
         'workspace_id': workspace_id,
         'user_id': user_id,
         'action': action,
         'entity_type': entity_type,
         'entity_id': entity_id,
         'metadata': metadata
-    }).execute()
+    })
 
 def create_workspace_for_match(match_id, founder1_clerk_id=None, founder2_clerk_id=None):
     """Auto-create workspace when a match is created
@@ -141,43 +237,36 @@ def create_workspace_for_match(match_id, founder1_clerk_id=None, founder2_clerk_
     """
     supabase = get_supabase()
     
-    # Check if workspace already exists
-    existing = supabase.table('workspaces').select('id').eq('match_id', match_id).execute()
-    if existing.data:
-        return existing.data[0]['id']
-    
-    # Get match to find founders and project (one project, two founders)
-    match = supabase.table('matches').select('founder1_id, founder2_id, project_id').eq('id', match_id).execute()
+    # Get match, its founders' clerk IDs, project and any existing workspace
+    # in one query (one project, two founders)
+    match = supabase.table('matches').select(
+        'founder1_id, founder2_id, project_id, '
+        'founder1:founders!founder1_id(clerk_user_id), founder2:founders!founder2_id(clerk_user_id), '
+        'project:projects!project_id(id), workspaces(id)'
+    ).eq('id', match_id).execute()
     if not match.data:
         raise ValueError("Match not found")
     
     match_data = match.data[0]
+    
+    # Check if workspace already exists
+    if match_data.get('workspaces'):
+        return match_data['workspaces'][0]['id']
+    
     founder1_id = match_data['founder1_id']
     founder2_id = match_data['founder2_id']
     project_id = match_data.get('project_id')
     
     # Validate project exists if project_id is provided
-    if project_id:
-        project_check = supabase.table('projects').select('id').eq('id', project_id).execute()
-        if not project_check.data:
-            raise ValueError(f"Project {project_id} not found - cannot create workspace")
+    if project_id and not match_data.get('project'):
+        raise ValueError(f"Project {project_id} not found - cannot create workspace")
     
     # Check workspace limits for both founders
-    # Fetch clerk IDs from founder IDs if not provided
     try:
         from services import plan_service
         
-        # Get clerk IDs for both founders
-        founders = supabase.table('founders').select('id, clerk_user_id').in_('id', [founder1_id, founder2_id]).execute()
-        founder1_clerk_id = None
-        founder2_clerk_id = None
-        
-        if founders.data:
-            for founder in founders.data:
-                if founder['id'] == founder1_id:
-                    founder1_clerk_id = founder.get('clerk_user_id')
-                elif founder['id'] == founder2_id:
-                    founder2_clerk_id = founder.get('clerk_user_id')
+        founder1_clerk_id = founder1_clerk_id or (match_data.get('founder1') or {}).get('clerk_user_id')
+        founder2_clerk_id = founder2_clerk_id or (match_data.get('founder2') or {}).get('clerk_user_id')
         
         # Check limits for founder1
         if founder1_clerk_id:
@@ -198,167 +287,40 @@ def create_workspace_for_match(match_id, founder1_clerk_id=None, founder2_clerk_
         # If check fails for other reasons, log but don't block workspace creation (graceful degradation)
         pass
     
-    # Create workspace with project information if available (one project, two founders)
-    workspace_data = {
-        'match_id': match_id,
-        'stage': 'idea'
-    }
-    
-    # Add project_id if this is a project-based match
-    # After migration 006_add_project_id_to_workspaces.sql, this column will exist
-    if project_id:
-        workspace_data['project_id'] = project_id
-    
-    workspace = supabase.table('workspaces').insert(workspace_data).execute()
-    
-    if not workspace.data:
-        raise ValueError("Failed to create workspace")
-    
-    workspace_id = workspace.data[0]['id']
-    
-    # Create participants - use transaction-like pattern to ensure data integrity
+    # Create the workspace and both participants in one transaction
     try:
-        participants_result = supabase.table('workspace_participants').insert([
-            {'workspace_id': workspace_id, 'user_id': founder1_id},
-            {'workspace_id': workspace_id, 'user_id': founder2_id}
-        ]).execute()
-        
-        if not participants_result.data or len(participants_result.data) < 2:
-            # Participants creation failed - clean up workspace to prevent orphaned workspace
-            from utils.logger import log_error
-            log_error(f"Failed to create participants for workspace {workspace_id}, cleaning up workspace")
-            try:
-                supabase.table('workspaces').delete().eq('id', workspace_id).execute()
-            except Exception as cleanup_error:
-                log_error(f"Failed to cleanup workspace {workspace_id} after participant creation failure", error=cleanup_error)
-            raise ValueError("Failed to create workspace participants")
+        workspace = supabase.rpc('create_workspace_for_match_tx', {
+            'p_match_id': match_id,
+            'p_project_id': project_id,
+            'p_founder1_id': founder1_id,
+            'p_founder2_id': founder2_id,
+        }).execute()
     except Exception as e:
-        # If this is a ValueError we raised, re-raise it
-        if isinstance(e, ValueError):
-            raise
-        # For other exceptions, log and clean up
         from utils.logger import log_error
-        log_error(f"Error creating workspace participants: {e}")
-        try:
-            supabase.table('workspaces').delete().eq('id', workspace_id).execute()
-        except Exception as cleanup_error:
-            log_error(f"Failed to cleanup workspace {workspace_id} after participant creation failure", error=cleanup_error)
+        log_error(f"Error creating workspace for match {match_id}: {e}")
         raise ValueError(f"Failed to create workspace: {str(e)}")
     
-    return workspace_id
+    if not workspace.data:
+        raise ValueError("Failed to create workspace")
+    
+    return workspace.data
 
 def list_user_workspaces(clerk_user_id):
     """Get all workspaces for a user with project and founder information"""
     founder_id = _get_founder_id(clerk_user_id)
     supabase = get_supabase()
     
-    # Get all workspaces where user is a participant
-    participants = supabase.table('workspace_participants').select('workspace_id').eq('user_id', founder_id).execute()
+    # The view resolves the project, its owner and the other founder per
+    # workspace (migrations/026), so rows come back in the response shape
+    workspaces = supabase.table('user_workspace_overview').select(
+        'id, title, project_title, founder_names, stage, created_at, project, match_id, '
+        'other_founder, is_archived, archived_at, dissolution_status, dissolution_cooloff_ends_at'
+    ).eq('founder_id', founder_id).execute()
     
-    if not participants.data:
-        return []
-    
-    workspace_ids = [p['workspace_id'] for p in participants.data]
-    
-    # Get workspace details with project and match info (one project, two founders)
-    # Get project_id from matches table since workspaces doesn't have project_id column yet
-    workspaces = supabase.table('workspaces').select(
-        '*, match:matches!match_id(founder1_id, founder2_id, project_id, project:projects!project_id(*, founder:founders!founder_id(id, name, clerk_user_id)))'
-    ).in_('id', workspace_ids).execute()
-    
-    if not workspaces.data:
-        return []
-    
-    # Collect all founder IDs from matches to fetch in a single query (optimized)
-    founder_ids_to_fetch = set()
-    for workspace in workspaces.data:
-        match = workspace.get('match', {})
-        if match:
-            if match.get('founder1_id'):
-                founder_ids_to_fetch.add(match['founder1_id'])
-            if match.get('founder2_id'):
-                founder_ids_to_fetch.add(match['founder2_id'])
-    
-    # Fetch all founders in a single query
-    founders_map = {}
-    if founder_ids_to_fetch:
-        founders_list = list(founder_ids_to_fetch)
-        founders_result = supabase.table('founders').select('id, name, email').in_('id', founders_list).execute()
-        if founders_result.data:
-            for founder in founders_result.data:
-                founders_map[founder['id']] = founder
-    
-    # Format workspaces with project and founder info (one project, two founders)
-    formatted_workspaces = []
-    for workspace in workspaces.data:
-        match = workspace.get('match', {})
-        # Get project from match (since workspaces doesn't have project_id column yet)
-        project = match.get('project') if match else None
-        
-        # Determine the other founder from the match (using pre-fetched founders map)
-        other_founder = None
-        if match:
-            founder1_id = match.get('founder1_id')
-            founder2_id = match.get('founder2_id')
-            
-            if founder1_id == founder_id and founder2_id:
-                # Current user is founder1, so other founder is founder2
-                other_founder = founders_map.get(founder2_id)
-            elif founder2_id == founder_id and founder1_id:
-                # Current user is founder2, so other founder is founder1
-                other_founder = founders_map.get(founder1_id)
-        
-        # Build project title (one project, two founders)
-        project_title = None
-        founder_name = None
-        
-        if project:
-            project_title = project.get('title', 'Untitled Project')
-            if project.get('founder'):
-                founder_name = project['founder'].get('name', 'Unknown')
-        
-        # If no project, use workspace title or default
-        if not project_title:
-            project_title = workspace.get('title', 'Collaboration')
-        
-        formatted_workspaces.append({
-            'id': workspace['id'],
-            'title': workspace.get('title', 'Collaboration'),
-            'project_title': project_title,
-            'founder_names': [founder_name] if founder_name else [other_founder.get('name', 'Unknown')] if other_founder else ['Unknown'],
-            'stage': workspace.get('stage', 'idea'),
-            'created_at': workspace.get('created_at'),
-            'project': project,
-            'match_id': workspace.get('match_id'),
-            'other_founder': other_founder,
-            'is_archived': workspace.get('is_archived', False),
-            'archived_at': workspace.get('archived_at'),
-            'dissolution_status': workspace.get('dissolution_status', 'active'),
-            'dissolution_cooloff_ends_at': workspace.get('dissolution_cooloff_ends_at')
-        })
-    
-    return formatted_workspaces
+    return workspaces.data or []
 
-def get_workspace(clerk_user_id, workspace_id):
-    """Get workspace overview with participants and equity summary."""
-    founder_id = _verify_workspace_access(clerk_user_id, workspace_id)
-    supabase = get_supabase()
-    
-    # Get workspace
-    workspace = supabase.table('workspaces').select('*').eq('id', workspace_id).execute()
-    if not workspace.data:
-        raise ValueError("Workspace not found")
-    
-    workspace_data = workspace.data[0]
-    
-    # Get participants with user info (using JOIN to avoid N+1)
-    # Include clerk_user_id so frontend can identify the current user
-    participants = supabase.table('workspace_participants').select('*, user:founders!user_id(id, name, email, clerk_user_id)').eq('workspace_id', workspace_id).execute()
-    
-    # Get current equity scenario (only one, filtered by is_current)
-    equity = supabase.table('workspace_equity_scenarios').select('*').eq('workspace_id', workspace_id).eq('is_current', True).limit(1).execute()
-    current_equity = equity.data[0] if equity.data else None
-    
+def _format_workspace(workspace_data, participants, current_equity):
+    """Shape a workspace row, its participants and current equity for the API"""
     return {
         'id': workspace_data['id'],
         'match_id': workspace_data['match_id'],
@@ -373,7 +335,7 @@ def get_workspace(clerk_user_id, workspace_id):
             'role_label': p.get('role_label'),
             'weekly_commitment_hours': p.get('weekly_commitment_hours'),
             'timezone': p.get('timezone')
-        } for p in (participants.data or [])],
+        } for p in (participants or [])],
         'current_equity': current_equity,
         'is_archived': workspace_data.get('is_archived', False),
         'archived_at': workspace_data.get('archived_at'),
@@ -384,33 +346,74 @@ def get_workspace(clerk_user_id, workspace_id):
         'dissolution_reason': workspace_data.get('dissolution_reason'),
     }
 
+def _get_current_equity(supabase, workspace_id):
+    """Current equity scenario (only one, filtered by is_current)"""
+    return supabase.table('workspace_equity_scenarios').select('*').eq(
+        'workspace_id', workspace_id
+    ).eq('is_current', True).limit(1).execute()
+
+def get_workspace(clerk_user_id, workspace_id):
+    """Get workspace overview with participants and equity summary."""
+    founder_id = _verify_workspace_access(clerk_user_id, workspace_id)
+    supabase = get_supabase()
+    
+    # The workspace, participants and equity reads are independent, so issue
+    # them concurrently
+    workspace, participants, equity = gather(
+        lambda: supabase.table('workspaces').select(
+            'id, match_id, title, stage, created_at, updated_at, is_archived, archived_at, '
+            'dissolution_status, dissolution_requested_at, dissolution_requested_by, '
+            'dissolution_cooloff_ends_at, dissolution_reason'
+        ).eq('id', workspace_id).execute(),
+        # Participants with user info (using JOIN to avoid N+1)
+        # Include clerk_user_id so frontend can identify the current user
+        lambda: supabase.table('workspace_participants').select(
+            'user_id, role, role_label, weekly_commitment_hours, timezone, '
+            'user:founders!user_id(id, name, email, clerk_user_id)'
+        ).eq('workspace_id', workspace_id).execute(),
+        lambda: _get_current_equity(supabase, workspace_id),
+    )
+    
+    if not workspace.data:
+        raise ValueError("Workspace not found")
+    
+    current_equity = equity.data[0] if equity.data else None
+    return _format_workspace(workspace.data[0], participants.data, current_equity)
+
 def update_workspace(clerk_user_id, workspace_id, data):
     """Update workspace settings (title, stage, status, max_participants)"""
     """Update workspace title and stage"""
-    _can_edit_workspace(clerk_user_id, workspace_id)
+    founder_id = _can_edit_workspace(clerk_user_id, workspace_id)
     supabase = get_supabase()
     
     update_data = {}
     if 'title' in data:
         update_data['title'] = data['title']
     if 'stage' in data:
-        if data['stage'] not in ['idea', 'mvp', 'revenue', 'other']:
+        if data['stage'] not in _VALID_STAGES:
             raise ValueError("Invalid stage. Must be one of: idea, mvp, revenue, other")
         update_data['stage'] = data['stage']
     
     if not update_data:
         raise ValueError("No valid fields to update")
     
-    workspace = supabase.table('workspaces').update(update_data).eq('id', workspace_id).execute()
+    # The update returns the row with participants embedded, and the equity
+    # read does not depend on it, so the response needs no follow-up queries
+    workspace, equity = gather(
+        lambda: supabase.table('workspaces').update(update_data).eq('id', workspace_id).select(
+            '*, participants:workspace_participants(*, user:founders!user_id(id, name, email, clerk_user_id))'
+        ).execute(),
+        lambda: _get_current_equity(supabase, workspace_id),
+    )
     
     if not workspace.data:
         raise ValueError("Workspace not found")
     
-    founder_id = _get_founder_id(clerk_user_id)
     _log_audit(workspace_id, founder_id, 'update_workspace', 'workspace', workspace_id, update_data)
     
-    # Return the full workspace object with all related data
-    return get_workspace(clerk_user_id, workspace_id)
+    workspace_data = workspace.data[0]
+    current_equity = equity.data[0] if equity.data else None
+    return _format_workspace(workspace_data, workspace_data.pop('participants', None), current_equity)
 
 def get_participants(clerk_user_id, workspace_id):
     """Get all participants for a workspace"""
@@ -441,31 +444,33 @@ def get_onboarding_status(clerk_user_id, workspace_id):
     founder_id = _verify_workspace_access(clerk_user_id, workspace_id)
     supabase = get_supabase()
     
-    # Get current user's participant record
-    participant = supabase.table('workspace_participants').select(
-        'onboarding_completed_at, onboarding_step, commitment_hours, timezone, communication_preference'
-    ).eq('workspace_id', workspace_id).eq('user_id', founder_id).execute()
-    
-    if not participant.data:
-        raise ValueError("Participant not found")
+    # Get current user's and partner's participant records in one query
+    participants = supabase.table('workspace_participants').select(
+        'user_id, role, onboarding_completed_at, onboarding_step, commitment_hours, timezone, '
+        'communication_preference, user:founders!user_id(name)'
+    ).eq('workspace_id', workspace_id).execute()
     
-    p = participant.data[0]
+    p = None
+    partner = None
+    for row in (participants.data or []):
+        if row.get('user_id') == founder_id:
+            p = row
+        elif partner is None and row.get('role') is not None and row.get('role') != 'ADVISOR':
+            partner = row
     
-    # Get partner's onboarding status
-    partner = supabase.table('workspace_participants').select(
-        'onboarding_completed_at, user:founders!user_id(name)'
-    ).eq('workspace_id', workspace_id).neq('user_id', founder_id).neq('role', 'ADVISOR').execute()
+    if p is None:
+        raise ValueError("Participant not found")
     
     partner_completed = False
-    partner_name = 'Partner'
-    if partner.data:
-        partner_completed = partner.data[0].get('onboarding_completed_at') is not None
-        partner_name = partner.data[0].get('user', {}).get('name', 'Partner')
+    partner_name = _DEFAULT_PARTNER_NAME
+    if partner:
+        partner_completed = partner.get('onboarding_completed_at') is not None
+        partner_name = (partner.get('user') or {}).get('name') or _DEFAULT_PARTNER_NAME
     
     # Check workspace setup completeness
-    equity_setup = supabase.table('workspace_equity_scenarios').select('id').eq(
-        'workspace_id', workspace_id
-    ).eq('status', 'approved').execute()
+    equity_setup = supabase.table('workspace_equity_scenarios').select(
+        'id', count='exact', head=True
+    ).eq('workspace_id', workspace_id).eq('status', 'approved').execute()
     
     return {
         'completed': p.get('onboarding_completed_at') is not None,
@@ -476,7 +481,7 @@ def get_onboarding_status(clerk_user_id, workspace_id):
         'communication_preference': p.get('communication_preference'),
         'partner_completed': partner_completed,
         'partner_name': partner_name,
-        'equity_setup_done': len(equity_setup.data or []) > 0,
+        'equity_setup_done': (equity_setup.count or 0) > 0,
     }
 
 
@@ -518,20 +523,14 @@ def update_onboarding_progress(clerk_user_id, workspace_id, data):
 
 def update_participant(clerk_user_id, workspace_id, user_id, data):
     """Update participant role_label, weekly_commitment_hours"""
-    _verify_workspace_access(clerk_user_id, workspace_id)
+    founder_id = _verify_workspace_access(clerk_user_id, workspace_id)
     supabase = get_supabase()
     
     # Check if participant is an accountability partner - they cannot be updated via this endpoint
     # Accountability partners should remain as accountability partners only
-    try:
-        participant_check = supabase.table('workspace_participants').select('role').eq(
-            'workspace_id', workspace_id
-        ).eq('user_id', user_id).execute()
-    except Exception:
-        # Fallback if role column doesn't exist yet
-        participant_check = supabase.table('workspace_participants').select('id').eq(
-            'workspace_id', workspace_id
-        ).eq('user_id', user_id).execute()
+    participant_check = supabase.table('workspace_participants').select('role').eq(
+        'workspace_id', workspace_id
+    ).eq('user_id', user_id).execute()
     
     if not participant_check.data:
         raise ValueError("Participant not found")
@@ -551,28 +550,25 @@ def update_participant(clerk_user_id, workspace_id, user_id, data):
     if not update_data:
         raise ValueError("No valid fields to update")
     
-    participant = supabase.table('workspace_participants').update(update_data).eq('workspace_id', workspace_id).eq('user_id', user_id).execute()
+    # Return complete participant data with user info from the update itself
+    participant = supabase.table('workspace_participants').update(update_data).eq(
+        'workspace_id', workspace_id
+    ).eq('user_id', user_id).select('*, user:founders!user_id(id, name, email, clerk_user_id)').execute()
     
     if not participant.data:
         raise ValueError("Participant not found")
     
-    founder_id = _get_founder_id(clerk_user_id)
     _log_audit(workspace_id, founder_id, 'update_participant', 'workspace_participant', participant.data[0]['id'], update_data)
+    invalidate_workspace_access(workspace_id)
     
-    # Return complete participant data with user info
-    updated_participant = supabase.table('workspace_participants').select('*, user:founders!user_id(id, name, email, clerk_user_id)').eq('id', participant.data[0]['id']).execute()
-    
-    if updated_participant.data:
-        return updated_participant.data[0]
-    else:
-        raise ValueError("Failed to update participant")
+    return participant.data[0]
 
 def get_equity_scenarios(clerk_user_id, workspace_id):
     """Get all equity scenarios and current scenario"""
     _verify_workspace_access(clerk_user_id, workspace_id)
     supabase = get_supabase()
     
-    scenarios = supabase.table('workspace_equity_scenarios').select('*, creator:founders!created_by_user_id(id, name)').eq('workspace_id', workspace_id).order('created_at', desc=True).execute()
+    scenarios = supabase.table('workspace_equity_scenarios').select(_EQUITY_SCENARIO_COLUMNS).eq('workspace_id', workspace_id).order('created_at', desc=True).execute()
     
     current = None
     all_scenarios = []
@@ -618,111 +614,75 @@ def create_equity_scenario(clerk_user_id, workspace_id, data):
     
     # Ensure accountability partners are not included in equity scenarios
     if equity_data.get('users'):
-        # Get all participants to check their roles
-        try:
-            participants = supabase.table('workspace_participants').select('user_id, role').eq(
-                'workspace_id', workspace_id
-            ).execute()
-        except Exception:
-            # Fallback if role column doesn't exist yet
-            participants = supabase.table('workspace_participants').select('user_id').eq(
-                'workspace_id', workspace_id
-            ).execute()
-        
-        # Create a map of user_id to role
-        participant_roles = {}
-        for p in (participants.data or []):
-            participant_roles[p['user_id']] = p.get('role')
+        # Postgres returns only the proposed users who are advisors here
+        user_ids = [str(u['userId']) for u in equity_data['users'] if u.get('userId')]
+        advisors = supabase.rpc('equity_advisor_user_ids', {
+            'p_workspace_id': workspace_id,
+            'p_user_ids': user_ids,
+        }).execute() if user_ids else None
         
-        # Filter out accountability partners from equity users
-        equity_users = equity_data['users']
-        filtered_users = [
-            u for u in equity_users 
-            if participant_roles.get(u.get('userId')) != 'ADVISOR'
-        ]
-        
-        if len(filtered_users) != len(equity_users):
+        if advisors and advisors.data:
             raise ValueError("Advisors cannot be included in equity scenarios. They are not co-founders.")
-        
-        equity_data['users'] = filtered_users
     
     # Set is_current if specified, otherwise False
     is_current = data.get('is_current', False)
     
-    # Create scenario with pending approval status
-    scenario_data = {
-        'workspace_id': workspace_id,
-        'label': data['label'],
-        'data': equity_data,
-        'is_current': False,  # Can't be current until approved
-        'created_by_user_id': founder_id,
-        'approval_status': 'PENDING',
-        'status': 'active'  # New scenarios start as active (pending approval)
-    }
-    
-    scenario = supabase.table('workspace_equity_scenarios').insert(scenario_data).execute()
-    
-    if not scenario.data:
-        raise ValueError("Failed to create equity scenario")
-    
-    scenario_id = scenario.data[0]['id']
-    
-    # Create approval request
+    # Approval request; the scenario only becomes current once approved
     proposed_data = {
         'label': data['label'],
         'data': equity_data,
         'is_current': is_current
     }
     
+    # Insert the pending scenario and its approval, and link them, in one
+    # transaction (migrations/030) - a failed approval can't orphan a scenario
+    result = supabase.rpc('create_equity_scenario_with_approval', {
+        'p_workspace_id': workspace_id,
+        'p_proposer_id': founder_id,
+        'p_label': data['label'],
+        'p_data': equity_data,
+        'p_proposed_data': proposed_data,
+    }).execute()
     
-    try:
-        approval_id = approval_service.create_approval(
-            clerk_user_id=clerk_user_id,
-            workspace_id=workspace_id,
-            entity_type='EQUITY_SCENARIO',
-            entity_id=scenario_id,
-            proposed_data=proposed_data
-        )
-    except Exception as e:
-        # Clean up the scenario if approval fails
-        supabase.table('workspace_equity_scenarios').delete().eq('id', scenario_id).execute()
-        raise e
+    if not result.data:
+        raise ValueError("No approver found in workspace")
     
-    # Update scenario with approval ID
-    supabase.table('workspace_equity_scenarios').update({
-        'approval_id': approval_id
-    }).eq('id', scenario_id).execute()
+    created = result.data[0]
+    scenario = created['scenario']
+    scenario_id = scenario['id']
+    approval_id = created['approval_id']
+    
+    approval_service.notify_approval_requested(
+        workspace_id, created['approver_id'], founder_id, created['proposer_name'],
+        'EQUITY_SCENARIO', scenario_id, approval_id, proposed_data
+    )
     
     _log_audit(workspace_id, founder_id, 'create_equity_scenario', 'workspace_equity_scenario', scenario_id, {'label': data['label'], 'requires_approval': True})
     
-    return {**scenario.data[0], 'approval_id': approval_id, 'approval_status': 'PENDING'}
+    return {**scenario, 'approval_id': approval_id, 'approval_status': 'PENDING'}
 
 def set_current_equity_scenario(clerk_user_id, scenario_id):
     """Set an equity scenario as current (requires approval)"""
     supabase = get_supabase()
-    approval_service = ApprovalService()
     
     # Get scenario to verify access
-    scenario = supabase.table('workspace_equity_scenarios').select('*').eq('id', scenario_id).execute()
-    if not scenario.data:
-        raise ValueError("Equity scenario not found")
-    
-    workspace_id = scenario.data[0]['workspace_id']
+    scenario = _get_workspace_row(supabase, 'workspace_equity_scenarios', scenario_id, "Equity scenario", columns='*')
+    workspace_id = scenario['workspace_id']
     founder_id = _verify_workspace_access(clerk_user_id, workspace_id)
     
     # Check if scenario already has pending approval
-    current_approval_status = scenario.data[0].get('approval_status')
+    current_approval_status = scenario.get('approval_status')
     if current_approval_status == 'PENDING':
         # Return the existing pending status instead of creating a new approval
         return {
-            **scenario.data[0],
+            **scenario,
             'message': 'This equity scenario already has a pending approval'
         }
     
     # If already current, no need for approval
-    if scenario.data[0].get('is_current'):
+    if scenario.get('is_current'):
         return {
-            **scenario.data[0],
+            **scenario,
             'message': 'This scenario is already current'
         }
     
@@ -730,17 +690,14 @@ def set_current_equity_scenario(clerk_user_id, scenario_id):
     if current_approval_status != 'APPROVED':
         raise ValueError("Only approved scenarios can be set as current")
     
-    # Set all other scenarios to not current and mark as canceled
-    supabase.table('workspace_equity_scenarios').update({
-        'is_current': False,
-        'status': 'canceled'
-    }).eq('workspace_id', workspace_id).neq('id', scenario_id).execute()
-    
-    # Set this scenario as current and active
-    updated = supabase.table('workspace_equity_scenarios').update({
-        'is_current': True,
-        'status': 'active'
-    }).eq('id', scenario_id).execute()
+    # Set this scenario as current and active, and all others in the workspace
+    # to not current and canceled, under a workspace lock (migrations/032)
+    updated = supabase.rpc('set_current_equity_scenario_tx', {
+        'p_workspace_id': workspace_id,
+        'p_scenario_id': scenario_id,
+    }).execute()
+    if not updated.data:
+        raise ValueError("Only approved scenarios can be set as current")
     
     _log_audit(workspace_id, founder_id, 'set_current_equity_scenario', 'workspace_equity_scenario', scenario_id)
     
@@ -752,13 +709,8 @@ def update_equity_scenario_note(clerk_user_id, scenario_id, note):
     supabase = get_supabase()
     
     # Get scenario to verify access
-    scenario = supabase.table('workspace_equity_scenarios').select('*').eq('id', scenario_id).execute()
-    if not scenario.data:
-        raise ValueError("Equity scenario not found")
-    
-    workspace_id = scenario.data[0]['workspace_id']
-    
-    _verify_workspace_access(clerk_user_id, workspace_id)
+    workspace_id = _get_workspace_row(supabase, 'workspace_equity_scenarios', scenario_id, "Equity scenario")['workspace_id']
+    founder_id = _verify_workspace_access(clerk_user_id, workspace_id)
     
     # Validate note length
     if note and len(note) > 255:
@@ -767,8 +719,6 @@ def update_equity_scenario_note(clerk_user_id, scenario_id, note):
     # Update the note
     updated = supabase.table('workspace_equity_scenarios').update({'note': note or None}).eq('id', scenario_id).execute()
     
-    founder_id = _get_founder_id(clerk_user_id)
-    
     _log_audit(workspace_id, founder_id, 'update_equity_scenario_note', 'workspace_equity_scenario', scenario_id, {'note': note})
     
     return updated.data[0]
@@ -778,42 +728,42 @@ def generate_agreement_draft(clerk_user_id, workspace_id):
     founder_id = _verify_workspace_access(clerk_user_id, workspace_id)
     supabase = get_supabase()
     
-    # Get workspace info
-    workspace = supabase.table('workspaces').select('*').eq('id', workspace_id).execute()
+    # Workspace with its current equity scenario, participants and roles
+    # embedded, in a single query. Only the users and vesting keys of the
+    # scenario's JSONB data are sent back, not the whole blob.
+    workspace = supabase.table('workspaces').select(
+        'title, created_at, '
+        'equity:workspace_equity_scenarios!workspace_id(is_current, users:data->users, vesting:data->vesting), '
+        'participants:workspace_participants!workspace_id(user:founders!user_id(id, name, email)), '
+        'roles:workspace_roles!workspace_id(role_title, responsibilities, user:founders!user_id(id, name))'
+    ).eq('id', workspace_id).eq('equity.is_current', True).execute()
     if not workspace.data:
         raise ValueError("Workspace not found")
     
     workspace_data = workspace.data[0]
     
-    # Get current equity scenario
-    equity_scenario = supabase.table('workspace_equity_scenarios').select('*').eq('workspace_id', workspace_id).eq('is_current', True).execute()
-    if not equity_scenario.data:
+    if not workspace_data.get('equity'):
         raise ValueError("No current equity scenario found. Please set a current equity scenario before generating a draft.")
     
-    current_equity = equity_scenario.data[0]
-    equity_data = current_equity.get('data', {})
-    
-    # Get all workspace participants
-    participants = supabase.table('workspace_participants').select('*, user:founders!user_id(id, name, email)').eq('workspace_id', workspace_id).execute()
-    
-    # Get all roles
-    roles = supabase.table('workspace_roles').select('*, user:founders!user_id(id, name)').eq('workspace_id', workspace_id).execute()
+    current_equity = workspace_data['equity'][0]
+    vesting = current_equity.get('vesting') or {}
+    participants = workspace_data.get('participants') or []
+    roles = workspace_data.get('roles') or []
     
     # Format equity owners
     # The equity data structure is: { users: [{ userId, percent }], vesting: { years, cliffMonths } }
     equity_owners = []
-    users_data = equity_data.get('users', [])
+    # First entry per user wins, as with the previous linear scan
+    percent_by_user = {}
+    for user_equity_data in current_equity.get('users') or []:
+        percent_by_user.setdefault(user_equity_data.get('userId'), user_equity_data.get('percent', 0))
     
-    for participant in (participants.data or []):
+    for participant in participants:
         user = participant.get('user', {})
         user_id = user.get('id')
         
         # Find equity percentage for this user
-        user_equity = None
-        for user_equity_data in users_data:
-            if user_equity_data.get('userId') == user_id:
-                user_equity = user_equity_data.get('percent', 0)
-                break
+        user_equity = percent_by_user.get(user_id)
         
         if user_equity is not None:
             equity_owners.append({
@@ -825,7 +775,7 @@ def generate_agreement_draft(clerk_user_id, workspace_id):
     
     # Format roles
     formatted_roles = []
-    for role in (roles.data or []):
+    for role in roles:
         user = role.get('user', {})
         formatted_roles.append({
             'userId': user.get('id'),
@@ -842,8 +792,8 @@ def generate_agreement_draft(clerk_user_id, workspace_id):
         'generatedAt': datetime.now(timezone.utc).isoformat(),
         'createdAt': workspace_data.get('created_at'),
         'equity': {
-            'vestingYears': equity_data.get('vesting', {}).get('years', 4),
-            'cliffMonths': equity_data.get('vesting', {}).get('cliffMonths', 12),
+            'vestingYears': vesting.get('years', 4),
+            'cliffMonths': vesting.get('cliffMonths', 12),
             'owners': equity_owners
         },
         'roles': formatted_roles,
@@ -855,36 +805,28 @@ def generate_agreement_draft(clerk_user_id, workspace_id):
 def get_roles(clerk_user_id, workspace_id):
     """Get all roles for a workspace"""
     _verify_workspace_access(clerk_user_id, workspace_id)
-    supabase = get_supabase()
     
-    roles = supabase.table('workspace_roles').select('*, user:founders!user_id(id, name)').eq('workspace_id', workspace_id).execute()
+    cached = _roles_cache.get(workspace_id)
+    if cached is not None:
+        return cached
     
-    return [{
-        'id': r['id'],
-        'workspace_id': r['workspace_id'],
-        'user_id': r['user_id'],
-        'user': r.get('user', {}),
-        'role_title': r['role_title'],
-        'responsibilities': r.get('responsibilities'),
-        'created_at': r['created_at'],
-        'updated_at': r['updated_at']
-    } for r in (roles.data or [])]
+    supabase = get_supabase()
+    roles = supabase.table('workspace_roles').select(_ROLE_COLUMNS).eq('workspace_id', workspace_id).execute()
+    
+    # The select already projects exactly the fields the client expects
+    formatted = roles.data or []
+    _roles_cache.set(workspace_id, formatted)
+    return formatted
 
 def upsert_role(clerk_user_id, workspace_id, user_id, data):
     """Upsert role and responsibilities for a user"""
-    _verify_workspace_access(clerk_user_id, workspace_id)
+    founder_id = _verify_workspace_access(clerk_user_id, workspace_id)
     supabase = get_supabase()
     
     # Prevent adding accountability partners to roles - they are not co-founders
-    try:
-        participant_check = supabase.table('workspace_participants').select('role').eq(
-            'workspace_id', workspace_id
-        ).eq('user_id', user_id).execute()
-    except Exception:
-        # Fallback if role column doesn't exist yet
-        participant_check = supabase.table('workspace_participants').select('id').eq(
-            'workspace_id', workspace_id
-        ).eq('user_id', user_id).execute()
+    participant_check = supabase.table('workspace_participants').select('role').eq(
+        'workspace_id', workspace_id
+    ).eq('user_id', user_id).execute()
     
     if participant_check.data and participant_check.data[0].get('role') == 'ADVISOR':
         raise ValueError("Advisors cannot be assigned roles. They are not co-founders.")
@@ -892,9 +834,6 @@ def upsert_role(clerk_user_id, workspace_id, user_id, data):
     if 'role_title' not in data:
         raise ValueError("role_title is required")
     
-    # Check if role exists
-    existing = supabase.table('workspace_roles').select('id').eq('workspace_id', workspace_id).eq('user_id', user_id).execute()
-    
     role_data = {
         'workspace_id': workspace_id,
         'user_id': user_id,
@@ -902,17 +841,15 @@ def upsert_role(clerk_user_id, workspace_id, user_id, data):
         'responsibilities': data.get('responsibilities')
     }
     
-    if existing.data:
-        # Update
-        role = supabase.table('workspace_roles').update(role_data).eq('id', existing.data[0]['id']).execute()
-    else:
-        # Insert
-        role = supabase.table('workspace_roles').insert(role_data).execute()
+    # Insert or update in one statement (unique on workspace_id, user_id - migrations/029)
+    role = supabase.table('workspace_roles').upsert(
+        role_data, on_conflict='workspace_id,user_id'
+    ).execute()
     
     if not role.data:
         raise ValueError("Failed to upsert role")
     
-    founder_id = _get_founder_id(clerk_user_id)
+    _roles_cache.delete(workspace_id)
     _log_audit(workspace_id, founder_id, 'upsert_role', 'workspace_role', role.data[0]['id'], {'user_id': user_id, 'role_title': data['role_title']})
     
     return role.data[0]
@@ -922,19 +859,12 @@ def get_checkins(clerk_user_id, workspace_id, limit=3):
     _verify_workspace_access(clerk_user_id, workspace_id)
     supabase = get_supabase()
     
-    checkins = supabase.table('workspace_checkins').select('*, creator:founders!created_by_user_id(id, name)').eq('workspace_id', workspace_id).order('week_start', desc=True).limit(limit).execute()
+    checkins = supabase.table('workspace_checkins').select(_CHECKIN_COLUMNS).eq(
+        'workspace_id', workspace_id
+    ).order('week_start', desc=True).limit(limit).execute()
     
-    return [{
-        'id': c['id'],
-        'workspace_id': c['workspace_id'],
-        'week_start': c['week_start'],
-        'summary': c.get('summary'),
-        'status': c.get('status', 'on_track'),
-        'progress_percent': c.get('progress_percent'),
-        'created_by_user_id': c['created_by_user_id'],
-        'creator': c.get('creator', {}),
-        'created_at': c['created_at']
-    } for c in (checkins.data or [])]
+    # The select already projects exactly the fields the client expects
+    return checkins.data or []
 
 def create_checkin(clerk_user_id, workspace_id, data):
     """Create a new checkin - partners can view and comment but founders create"""
@@ -942,10 +872,6 @@ def create_checkin(clerk_user_id, workspace_id, data):
     supabase = get_supabase()
     notification_service = NotificationService()
     
-    # Get workspace title for notifications
-    workspace = supabase.table('workspaces').select('title').eq('id', workspace_id).execute()
-    workspace_title = workspace.data[0].get('title', 'workspace') if workspace.data else 'workspace'
-    
     if 'week_start' not in data:
         raise ValueError("week_start is required")
     
@@ -974,70 +900,61 @@ def create_checkin(clerk_user_id, workspace_id, data):
         'status': data['status'],
         'progress_percent': progress_percent,
         'created_by_user_id': founder_id
-    }).execute()
+    }).select('*, creator:founders!created_by_user_id(id, name)').execute()
     
     if not checkin.data:
         raise ValueError("Failed to create checkin")
     
-    # Fetch the newly created checkin with creator relationship
-    new_checkin = supabase.table('workspace_checkins').select('*, creator:founders!created_by_user_id(id, name)').eq('id', checkin.data[0]['id']).single().execute()
+    # The insert returns the new row with its creator relationship embedded
+    new_checkin = checkin.data[0]
+    creator = (new_checkin.get('creator') or {}).get('name') or 'Someone'
+    
+    _log_audit(workspace_id, founder_id, 'create_checkin', 'workspace_checkin', new_checkin['id'])
     
-    if not new_checkin.data:
-        raise ValueError("Failed to retrieve created checkin with creator info")
+    # The other participants (including partners) to notify, with the
+    # workspace title embedded; solo workspaces stop here
+    participants = supabase.table('workspace_participants').select(
+        'user_id, role, workspace:workspaces!workspace_id(title)'
+    ).eq('workspace_id', workspace_id).neq('user_id', founder_id).execute()
+    if not participants.data:
+        return new_checkin
     
-    _log_audit(workspace_id, founder_id, 'create_checkin', 'workspace_checkin', new_checkin.data['id'])
+    workspace_title = (participants.data[0].get('workspace') or {}).get('title') or 'workspace'
+    
+    # Partners get a review prompt, founders a status update; the content is
+    # the same for every recipient of each kind
+    partner_notification = {
+        'event_type': 'CHECKIN_CREATED_FOR_REVIEW',
+        'title': f"New check-in to review for {workspace_title}",
+        'metadata': {'status': data['status'], 'progress': progress_percent, 'workspace_title': workspace_title}
+    }
+    founder_notification = {
+        'event_type': 'CHECKIN_CREATED',
+        'title': f"{creator} posted weekly check-in: {data['status'].replace('_', ' ').title()}",
+        'metadata': {'status': data['status'], 'progress': progress_percent}
+    }
+    notifications = [{
+        'workspace_id': workspace_id,
+        'recipient_id': participant['user_id'],
+        'actor_id': founder_id,
+        'entity_type': 'workspace_checkin',
+        'entity_id': new_checkin['id'],
+        **(partner_notification if participant.get('role') == 'ADVISOR' else founder_notification)
+    } for participant in participants.data]
     
-    # Send notification to other participants (including partners)
-    # Try to select role, but handle case where column might not exist
     try:
-        participants = supabase.table('workspace_participants').select('user_id, role, founders!workspace_participants_user_id_fkey(name)').eq('workspace_id', workspace_id).execute()
-    except Exception:
-        # Fallback if role column doesn't exist yet
-        participants = supabase.table('workspace_participants').select('user_id, founders!workspace_participants_user_id_fkey(name)').eq('workspace_id', workspace_id).execute()
-    
-    creator = next((p.get('founders', {}).get('name') for p in participants.data if p['user_id'] == founder_id), 'Someone')
-    
-    for participant in participants.data or []:
-        if participant['user_id'] != founder_id:
-            try:
-                # Different notification for partners (only if role column exists)
-                if participant.get('role') == 'ADVISOR':
-                    notification_service.create_notification(
-                        workspace_id=workspace_id,
-                        recipient_id=participant['user_id'],
-                        actor_id=founder_id,
-                        event_type='CHECKIN_CREATED_FOR_REVIEW',
-                        title=f"New check-in to review for {workspace_title}",
-                        entity_type='workspace_checkin',
-                        entity_id=new_checkin.data['id'],
-                        metadata={'status': data['status'], 'progress': progress_percent, 'workspace_title': workspace_title}
-                    )
-                else:
-                    notification_service.create_notification(
-                        workspace_id=workspace_id,
-                        recipient_id=participant['user_id'],
-                        actor_id=founder_id,
-                        event_type='CHECKIN_CREATED',
-                        title=f"{creator} posted weekly check-in: {data['status'].replace('_', ' ').title()}",
-                        entity_type='workspace_checkin',
-                        entity_id=new_checkin.data['id'],
-                        metadata={'status': data['status'], 'progress': progress_percent}
-                    )
-            except Exception as e:
-                print(f"[NOTIFY] Failed to create checkin notification: {e}")
+        notification_service.create_notifications_bulk(notifications)
+    except Exception as e:
+        print(f"[NOTIFY] Failed to create checkin notifications: {e}")
     
-    return new_checkin.data
+    return new_checkin
 
 def add_checkin_comment(clerk_user_id, checkin_id, comment):
     """Add a comment to a check-in (partners can comment)"""
     supabase = get_supabase()
     
     # Get checkin to verify access
-    checkin = supabase.table('workspace_checkins').select('*, workspace:workspaces!workspace_id(id)').eq('id', checkin_id).execute()
-    if not checkin.data:
-        raise ValueError("Check-in not found")
-    
-    workspace_id = checkin.data[0]['workspace']['id']
+    workspace_id = _get_workspace_row(supabase, 'workspace_checkins', checkin_id, "Check-in")['workspace_id']
     founder_id = _verify_workspace_access(clerk_user_id, workspace_id)  # Any participant can comment
     
     if len(comment) > 1000:
@@ -1062,124 +979,102 @@ def add_checkin_comment(clerk_user_id, checkin_id, comment):
 
 def set_checkin_verdict(clerk_user_id, checkin_id, verdict):
     """Set verdict for a check-in (partners only)"""
-    if verdict not in ['on_track', 'at_risk', 'off_track']:
+    if verdict not in _CHECKIN_VERDICTS:
         raise ValueError("verdict must be one of: on_track, at_risk, off_track")
     
     supabase = get_supabase()
     
     # Get checkin to verify access
-    checkin = supabase.table('workspace_checkins').select('*, workspace:workspaces!workspace_id(id)').eq('id', checkin_id).execute()
-    if not checkin.data:
-        raise ValueError("Check-in not found")
-    
-    workspace_id = checkin.data[0]['workspace']['id']
-    founder_id = _get_founder_id(clerk_user_id)
-    
+    workspace_id = _get_workspace_row(supabase, 'workspace_checkins', checkin_id, "Check-in")['workspace_id']
     # Verify user is a partner
-    # Try to select role, but handle case where column might not exist
-    try:
-        participant = supabase.table('workspace_participants').select('role').eq(
-            'workspace_id', workspace_id
-        ).eq('user_id', founder_id).execute()
-    except Exception:
-        # Fallback if role column doesn't exist yet
-        participant = supabase.table('workspace_participants').select('id').eq(
-            'workspace_id', workspace_id
-        ).eq('user_id', founder_id).execute()
-    
-    if not participant.data:
-        raise ValueError("Access denied: You are not a participant in this workspace")
-    
-    role = participant.data[0].get('role')
-    if role != 'ADVISOR':
-        raise ValueError("Only advisors can set verdicts")
-    
-    # Update or insert verdict
-    # Assuming we have a workspace_checkin_verdicts table
-    existing_verdict = supabase.table('workspace_checkin_verdicts').select('id').eq(
-        'checkin_id', checkin_id
-    ).eq('user_id', founder_id).execute()
+    founder_id = _verify_advisor_access(clerk_user_id, workspace_id, "Only advisors can set verdicts")
     
+    # Update or insert verdict in one statement (unique on checkin_id, user_id - migrations/029)
     verdict_data = {
         'checkin_id': checkin_id,
         'user_id': founder_id,
         'verdict': verdict
     }
     
-    if existing_verdict.data:
-        verdict_result = supabase.table('workspace_checkin_verdicts').update(verdict_data).eq(
-            'id', existing_verdict.data[0]['id']
-        ).execute()
-    else:
-        verdict_result = supabase.table('workspace_checkin_verdicts').insert(verdict_data).execute()
+    verdict_result = supabase.table('workspace_checkin_verdicts').upsert(
+        verdict_data, on_conflict='checkin_id,user_id'
+    ).execute()
     
     if not verdict_result.data:
         raise ValueError("Failed to set verdict")
     
     # Notify founders
     notification_service = NotificationService()
-    participants = supabase.table('workspace_participants').select('user_id').eq(
-        'workspace_id', workspace_id
-    ).neq('role', 'ADVISOR').execute()
+    participants, partner_name_str = gather(
+        lambda: supabase.table('workspace_participants').select('user_id').eq(
+            'workspace_id', workspace_id
+        ).neq('role', 'ADVISOR').neq('user_id', founder_id).execute(),
+        lambda: _get_founder_name(founder_id, _DEFAULT_PARTNER_NAME),
+    )
+    title = f"{partner_name_str} set verdict: {verdict.replace('_', ' ').title()}"
     
-    partner_name = supabase.table('founders').select('name').eq('id', founder_id).execute()
-    partner_name_str = partner_name.data[0]['name'] if partner_name.data else 'Partner'
+    notifications = [{
+        'workspace_id': workspace_id,
+        'recipient_id': participant['user_id'],
+        'actor_id': founder_id,
+        'event_type': 'CHECKIN_VERDICT_SET',
+        'title': title,
+        'entity_type': 'workspace_checkin_verdict',
+        'entity_id': verdict_result.data[0]['id'],
+        'metadata': {'checkin_id': checkin_id, 'verdict': verdict}
+    } for participant in (participants.data or [])]
     
-    for participant in (participants.data or []):
-        try:
-            notification_service.create_notification(
-                workspace_id=workspace_id,
-                recipient_id=participant['user_id'],
-                actor_id=founder_id,
-                event_type='CHECKIN_VERDICT_SET',
-                title=f"{partner_name_str} set verdict: {verdict.replace('_', ' ').title()}",
-                entity_type='workspace_checkin_verdict',
-                entity_id=verdict_result.data[0]['id'],
-                metadata={'checkin_id': checkin_id, 'verdict': verdict}
-            )
-        except Exception as e:
-            print(f"[NOTIFY] Failed to create verdict notification: {e}")
+    try:
+        notification_service.create_notifications_bulk(notifications)
+    except Exception as e:
+        print(f"[NOTIFY] Failed to create verdict notifications: {e}")
     
     _log_audit(workspace_id, founder_id, 'set_checkin_verdict', 'workspace_checkin_verdict', verdict_result.data[0]['id'], {'verdict': verdict})
     
     return verdict_result.data[0]
 
-def get_checkin_partner_review(clerk_user_id, workspace_id, checkin_id):
-    """Get partner review for a check-in (partners only)"""
+def _check_checkin_review_access(clerk_user_id, workspace_id, checkin_id, denied_message):
+    """Verify the checkin is in the workspace and the user is one of its
+    partners, in one RPC call (migrations/033).
+    Returns (founder_id, id of the user's existing review or None).
+    """
     supabase = get_supabase()
+    result = supabase.rpc('check_checkin_review_access', {
+        'p_clerk_user_id': clerk_user_id,
+        'p_workspace_id': workspace_id,
+        'p_checkin_id': checkin_id,
+    }).execute()
     
-    # Get checkin to verify it exists
-    checkin = supabase.table('workspace_checkins').select('*, workspace:workspaces!workspace_id(id)').eq('id', checkin_id).execute()
-    if not checkin.data:
-        raise ValueError("Check-in not found")
+    if not result.data:
+        raise ValueError("Profile not found")
     
-    # Verify workspace matches
-    if checkin.data[0]['workspace']['id'] != workspace_id:
+    access = result.data[0]
+    if access.get('checkin_workspace_id') is None:
+        raise ValueError("Check-in not found")
+    if access['checkin_workspace_id'] != workspace_id:
         raise ValueError("Check-in does not belong to this workspace")
-    
-    founder_id = _get_founder_id(clerk_user_id)
-    
-    # Verify user is a partner
-    try:
-        participant = supabase.table('workspace_participants').select('role').eq(
-            'workspace_id', workspace_id
-        ).eq('user_id', founder_id).execute()
-    except Exception:
-        participant = supabase.table('workspace_participants').select('id').eq(
-            'workspace_id', workspace_id
-        ).eq('user_id', founder_id).execute()
-    
-    if not participant.data:
+    if not access.get('is_participant'):
         raise ValueError("Access denied: You are not a participant in this workspace")
+    if access.get('role') != 'ADVISOR':
+        raise ValueError(denied_message)
     
-    role = participant.data[0].get('role')
-    if role != 'ADVISOR':
-        raise ValueError("Only advisors can view their reviews")
+    try:
+        from utils.request_cache import set_cached_founder_id
+        set_cached_founder_id(clerk_user_id, access['founder_id'])
+    except ImportError:
+        pass
+    return access['founder_id'], access.get('review_id')
+
+def get_checkin_partner_review(clerk_user_id, workspace_id, checkin_id):
+    """Get partner review for a check-in (partners only)"""
+    _, review_id = _check_checkin_review_access(
+        clerk_user_id, workspace_id, checkin_id, "Only advisors can view their reviews"
+    )
+    if review_id is None:
+        return None
     
-    # Get existing review
-    review = supabase.table('workspace_checkin_partner_reviews').select('*').eq(
-        'checkin_id', checkin_id
-    ).eq('partner_user_id', founder_id).execute()
+    supabase = get_supabase()
+    review = supabase.table('workspace_checkin_partner_reviews').select('*').eq('id', review_id).execute()
     
     if review.data:
         return review.data[0]
@@ -1187,7 +1082,7 @@ def get_checkin_partner_review(clerk_user_id, workspace_id, checkin_id):
 
 def upsert_checkin_partner_review(clerk_user_id, workspace_id, checkin_id, verdict, comment):
     """Create or update partner review for a check-in (partners only)"""
-    if verdict not in ['ON_TRACK', 'AT_RISK', 'OFF_TRACK']:
+    if verdict not in _PARTNER_REVIEW_VERDICTS:
         raise ValueError("verdict must be one of: ON_TRACK, AT_RISK, OFF_TRACK")
     
     if comment and len(comment) > 500:
@@ -1196,38 +1091,10 @@ def upsert_checkin_partner_review(clerk_user_id, workspace_id, checkin_id, verdi
     supabase = get_supabase()
     notification_service = NotificationService()
     
-    # Get checkin to verify it exists
-    checkin = supabase.table('workspace_checkins').select('*, workspace:workspaces!workspace_id(id)').eq('id', checkin_id).execute()
-    if not checkin.data:
-        raise ValueError("Check-in not found")
-    
-    # Verify workspace matches
-    if checkin.data[0]['workspace']['id'] != workspace_id:
-        raise ValueError("Check-in does not belong to this workspace")
-    
-    founder_id = _get_founder_id(clerk_user_id)
-    
-    # Verify user is a partner
-    try:
-        participant = supabase.table('workspace_participants').select('role').eq(
-            'workspace_id', workspace_id
-        ).eq('user_id', founder_id).execute()
-    except Exception:
-        participant = supabase.table('workspace_participants').select('id').eq(
-            'workspace_id', workspace_id
-        ).eq('user_id', founder_id).execute()
-    
-    if not participant.data:
-        raise ValueError("Access denied: You are not a participant in this workspace")
-    
-    role = participant.data[0].get('role')
-    if role != 'ADVISOR':
-        raise ValueError("Only advisors can create/update reviews")
-    
-    # Check if review exists
-    existing_review = supabase.table('workspace_checkin_partner_reviews').select('id').eq(
-        'checkin_id', checkin_id
-    ).eq('partner_user_id', founder_id).execute()
+    # Checkin, partner access and any existing review, in one round-trip
+    founder_id, existing_review_id = _check_checkin_review_access(
+        clerk_user_id, workspace_id, checkin_id, "Only advisors can create/update reviews"
+    )
     
     review_data = {
         'checkin_id': checkin_id,
@@ -1237,10 +1104,10 @@ def upsert_checkin_partner_review(clerk_user_id, workspace_id, checkin_id, verdi
         'comment': comment or None
     }
     
-    if existing_review.data:
+    if existing_review_id:
         # Update existing review
         review_result = supabase.table('workspace_checkin_partner_reviews').update(review_data).eq(
-            'id', existing_review.data[0]['id']
+            'id', existing_review_id
         ).execute()
         is_new = False
     else:
@@ -1252,34 +1119,31 @@ def upsert_checkin_partner_review(clerk_user_id, workspace_id, checkin_id, verdi
         raise ValueError("Failed to save review")
     
     # Notify founders
-    participants = supabase.table('workspace_participants').select('user_id').eq(
-        'workspace_id', workspace_id
-    ).neq('role', 'ADVISOR').execute()
+    participants, partner_name_str = gather(
+        lambda: supabase.table('workspace_participants').select('user_id').eq(
+            'workspace_id', workspace_id
+        ).neq('role', 'ADVISOR').neq('user_id', founder_id).execute(),
+        lambda: _get_founder_name(founder_id, _DEFAULT_PARTNER_NAME),
+    )
     
-    partner_name = supabase.table('founders').select('name').eq('id', founder_id).execute()
-    partner_name_str = partner_name.data[0]['name'] if partner_name.data else 'Partner'
+    # Same title for every recipient
+    title = f"{partner_name_str} reviewed this week's check-in: {_PARTNER_REVIEW_VERDICT_DISPLAY.get(verdict, verdict)}"
     
-    # Map verdict to display text
-    verdict_display = {
-        'ON_TRACK': 'On track',
-        'AT_RISK': 'At risk',
-        'OFF_TRACK': 'Off track'
-    }.get(verdict, verdict)
+    notifications = [{
+        'workspace_id': workspace_id,
+        'recipient_id': participant['user_id'],
+        'actor_id': founder_id,
+        'event_type': 'CHECKIN_CREATED',  # Using existing event type
+        'title': title,
+        'entity_type': 'workspace_checkin_partner_review',
+        'entity_id': review_result.data[0]['id'],
+        'metadata': {'checkin_id': checkin_id, 'verdict': verdict, 'is_new': is_new}
+    } for participant in (participants.data or [])]
     
-    for participant in (participants.data or []):
-        try:
-            notification_service.create_notification(
-                workspace_id=workspace_id,
-                recipient_id=participant['user_id'],
-                actor_id=founder_id,
-                event_type='CHECKIN_CREATED',  # Using existing event type
-                title=f"{partner_name_str} reviewed this week's check-in: {verdict_display}",
-                entity_type='workspace_checkin_partner_review',
-                entity_id=review_result.data[0]['id'],
-                metadata={'checkin_id': checkin_id, 'verdict': verdict, 'is_new': is_new}
-            )
-        except Exception as e:
-            print(f"[NOTIFY] Failed to create partner review notification: {e}")
+    try:
+        notification_service.create_notifications_bulk(notifications)
+    except Exception as e:
+        print(f"[NOTIFY] Failed to create partner review notifications: {e}")
     
     _log_audit(workspace_id, founder_id, 'upsert_checkin_partner_review', 'workspace_checkin_partner_review', review_result.data[0]['id'], {'verdict': verdict, 'is_new': is_new})
     
@@ -1290,14 +1154,8 @@ def get_checkin_partner_reviews_for_founders(clerk_user_id, workspace_id, checki
     _verify_workspace_access(clerk_user_id, workspace_id)
     supabase = get_supabase()
     
-    # Get checkin to verify it exists
-    checkin = supabase.table('workspace_checkins').select('*, workspace:workspaces!workspace_id(id)').eq('id', checkin_id).execute()
-    if not checkin.data:
-        raise ValueError("Check-in not found")
-    
-    # Verify workspace matches
-    if checkin.data[0]['workspace']['id'] != workspace_id:
-        raise ValueError("Check-in does not belong to this workspace")
+    # Get checkin to verify it exists in this workspace
+    _get_workspace_row(supabase, 'workspace_checkins', checkin_id, "Check-in", workspace_id)
     
     # Get all partner reviews for this check-in with partner info
     reviews = supabase.table('workspace_checkin_partner_reviews').select(
@@ -1313,7 +1171,9 @@ def get_workspace_context(clerk_user_id, workspace_id):
     supabase = get_supabase()
     
     # Get workspace basic info
-    workspace = supabase.table('workspaces').select('*').eq('id', workspace_id).execute()
+    workspace = supabase.table('workspaces').select(
+        'id, match_id, title, stage, created_at, updated_at'
+    ).eq('id', workspace_id).execute()
     if not workspace.data:
         raise ValueError("Workspace not found")
     
@@ -1321,23 +1181,22 @@ def get_workspace_context(clerk_user_id, workspace_id):
     
     # 1. Participants with user info (includes clerk_user_id for current user identification)
     participants = supabase.table('workspace_participants').select(
-        '*, user:founders!user_id(id, name, email, clerk_user_id)'
+        'id, user_id, role, role_label, weekly_commitment_hours, timezone, created_at, updated_at, '
+        'user:founders!user_id(id, name, email, clerk_user_id)'
     ).eq('workspace_id', workspace_id).execute()
     
     # 2. Roles with user info
-    roles = supabase.table('workspace_roles').select(
-        '*, user:founders!user_id(id, name)'
-    ).eq('workspace_id', workspace_id).execute()
+    roles = supabase.table('workspace_roles').select(_ROLE_COLUMNS).eq('workspace_id', workspace_id).execute()
     
     # 3. Recent checkins with creator info (limit 10 for overview)
-    checkins = supabase.table('workspace_checkins').select(
-        '*, creator:founders!created_by_user_id(id, name)'
-    ).eq('workspace_id', workspace_id).order('week_start', desc=True).limit(10).execute()
+    checkins = supabase.table('workspace_checkins').select(_CHECKIN_COLUMNS).eq(
+        'workspace_id', workspace_id
+    ).order('week_start', desc=True).limit(10).execute()
     
     # 4. Equity scenarios with creator info
-    equity_scenarios = supabase.table('workspace_equity_scenarios').select(
-        '*, creator:founders!created_by_user_id(id, name)'
-    ).eq('workspace_id', workspace_id).order('created_at', desc=True).execute()
+    equity_scenarios = supabase.table('workspace_equity_scenarios').select(_EQUITY_SCENARIO_COLUMNS).eq(
+        'workspace_id', workspace_id
+    ).order('created_at', desc=True).execute()
     
     # Process equity data
     current_equity = None
@@ -1452,11 +1311,10 @@ def get_weekly_partner_checkins(clerk_user_id, workspace_id, limit=10):
 
 def get_current_week_checkins(clerk_user_id, workspace_id):
     """Get check-ins for the current week"""
-    _verify_workspace_access(clerk_user_id, workspace_id)
+    founder_id = _verify_workspace_access(clerk_user_id, workspace_id)
     supabase = get_supabase()
     
     current_week = _get_week_start()
-    founder_id = _get_founder_id(clerk_user_id)
     
     checkins = supabase.table('weekly_partner_checkins').select(
         '*, user:founders!user_id(id, name, profile_picture_url)'
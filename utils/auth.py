@@ -2,6 +2,26 @@
 from flask import request
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.ttl_cache import TTLCache
+
+# Reused across requests so Clerk lookups keep their connection alive;
+# transient gateway errors are retried on the pooled connection
+_clerk_session = requests.Session()
+_clerk_session.headers['Content-Type'] = 'application/json'
+_clerk_session.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+))
+
+# Clerk user lookups are cached per process; users Clerk reports as missing
+# are remembered for a shorter time
+CLERK_USER_TTL = int(os.getenv('CLERK_USER_TTL', '60'))
+_clerk_user_cache = TTLCache(maxsize=10000, ttl=CLERK_USER_TTL)
+_clerk_missing_cache = TTLCache(maxsize=10000, ttl=10)
 
 
 def get_clerk_user_id():
@@ -10,28 +30,50 @@ def get_clerk_user_id():
 
 
 def _fetch_clerk_user(clerk_user_id: str):
-    """Fetch user data from Clerk API"""
+    """Fetch user data from Clerk API, cached for CLERK_USER_TTL seconds"""
     clerk_secret_key = os.getenv('CLERK_SECRET_KEY')
     if not clerk_secret_key or not clerk_user_id:
         return None
     
+    cached = _clerk_user_cache.get(clerk_user_id)
+    if cached is not None:
+        return cached
+    if _clerk_missing_cache.get(clerk_user_id):
+        return None
+    
     try:
-        headers = {
-            'Authorization': f'Bearer {clerk_secret_key}',
-            'Content-Type': 'application/json'
-        }
-        response = requests.get(
+        response = _clerk_session.get(
             f'https://api.clerk.com/v1/users/{clerk_user_id}',
-            headers=headers,
+            headers={'Authorization': f'Bearer {clerk_secret_key}'},
             timeout=5
         )
         if response.status_code == 200:
-            return response.json()
+            user_data = response.json()
+            _clerk_user_cache.set(clerk_user_id, user_data)
+            return user_data
+        if response.status_code == 404:
+            _clerk_missing_cache.set(clerk_user_id, True)
     except Exception:
         pass
     return None
 
 
+def invalidate_clerk_user(clerk_user_id: str):
+    """Drop cached Clerk data for a user (e.g. after account deletion)"""
+    _clerk_user_cache.delete(clerk_user_id)
+    _clerk_missing_cache.delete(clerk_user_id)
+
+
+def fetch_clerk_user_email(clerk_user_id: str):
+    """Primary email for a user from the Clerk API (cached)
+    Does not touch the Flask request, so it can run on utils.parallel threads.
+    """
+    user_data = _fetch_clerk_user(clerk_user_id)
+    if user_data:
+        return (user_data.get('email_addresses') or [{}])[0].get('email_address')
+    return None
+
+
 def get_clerk_user_email(clerk_user_id: str = None):
     """
     Extract Clerk user email from request headers or fetch from Clerk API
@@ -50,9 +92,7 @@ def get_clerk_user_email(clerk_user_id: str = None):
     
     # If not in headers and clerk_user_id provided, try Clerk API
     if clerk_user_id:
-        user_data = _fetch_clerk_user(clerk_user_id)
-        if user_data:
-            return user_data.get('email_addresses', [{}])[0].get('email_address')
+        return fetch_clerk_user_email(clerk_user_id)
     
     return None
 
@@ -0,0 +1,37 @@
+"""
+In-process background work queue.
+Runs fire-and-forget jobs on a small thread pool so request handlers can
+respond before slow, non-critical work (scores, milestones, emails)
+finishes. Jobs are lost if the worker process dies, so only submit work
+whose loss is tolerable or recoverable.
+"""
+import os
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from utils.logger import log_error
+
+BACKGROUND_WORKERS = int(os.environ.get('BACKGROUND_WORKERS', '4'))
+
+_executor = ThreadPoolExecutor(max_workers=BACKGROUND_WORKERS, thread_name_prefix='background')
+
+
+def _run(func, args, kwargs):
+    """Run a job, logging failures and resetting the thread's request cache"""
+    try:
+        return func(*args, **kwargs)
+    except Exception:
+        log_error(f"Background job {getattr(func, '__name__', func)} failed",
+                  traceback_str=traceback.format_exc())
+    finally:
+        # Pool threads are reused, so never leak request-scoped cache between jobs
+        try:
+            from utils.request_cache import clear_cache
+            clear_cache()
+        except ImportError:
+            pass
+
+
+def submit(func, *args, **kwargs) -> Future:
+    """Queue `func(*args, **kwargs)` to run in the background"""
+    return _executor.submit(_run, func, args, kwargs)
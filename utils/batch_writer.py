@@ -0,0 +1,88 @@
+"""
+Batched, fire-and-forget table inserts.
+Rows are queued in memory and a daemon thread flushes them every
+`flush_interval` seconds with multi-row inserts of up to `max_batch` rows.
+Rows must share the same keys. Pending rows are flushed at interpreter
+exit, but are lost if the worker process is killed, so only use this for
+writes whose loss is tolerable (audit trails, analytics).
+"""
+import atexit
+import queue
+import threading
+import time
+import traceback
+from typing import Dict, List
+
+from postgrest.exceptions import APIError
+
+from utils.logger import log_error
+
+
+class BatchWriter:
+    """Queue rows for `table` and insert them in batches on a background thread"""
+
+    def __init__(self, table: str, max_batch: int = 50, flush_interval: float = 0.1):
+        self.table = table
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue()
+        self._flush_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=f'batch-writer-{table}', daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def put(self, row: Dict) -> None:
+        """Queue a row for insertion; never blocks on the network"""
+        self._queue.put(row)
+
+    def _drain(self) -> List[Dict]:
+        rows = []
+        while len(rows) < self.max_batch:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    def _insert_rows(self, rows) -> None:
+        from config.database import get_supabase
+        get_supabase().table(self.table).insert(rows).execute()
+
+    def _insert(self, rows: List[Dict]) -> None:
+        try:
+            self._insert_rows(rows)
+            return
+        except APIError:
+            # Rejected by PostgREST; retry the rows one by one below
+            if len(rows) == 1:
+                log_error(f"Insert into {self.table} failed", traceback_str=traceback.format_exc())
+                return
+        except Exception:
+            # Network or server trouble; a per-row retry would just fail N times
+            log_error(f"Batch insert of {len(rows)} rows into {self.table} failed",
+                      traceback_str=traceback.format_exc())
+            return
+        # One bad row fails the whole multi-row insert; retry row by row so
+        # only the offending rows are dropped
+        failed = 0
+        for row in rows:
+            try:
+                self._insert_rows(row)
+            except Exception:
+                failed += 1
+        if failed:
+            log_error(f"Batch insert into {self.table} dropped {failed} of {len(rows)} rows")
+
+    def flush(self) -> None:
+        """Insert everything currently queued, at most `max_batch` rows per insert"""
+        with self._flush_lock:
+            while True:
+                rows = self._drain()
+                if not rows:
+                    return
+                self._insert(rows)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
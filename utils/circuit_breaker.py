@@ -0,0 +1,74 @@
+"""
+Minimal circuit breaker for calls to external providers.
+After `fail_max` consecutive failures the breaker opens and calls fail fast
+for `reset_timeout` seconds, after which a single trial call is let through.
+Only exceptions accepted by `is_failure` count; anything else (e.g. a
+provider rejecting one user's bad input) is re-raised without tripping it.
+"""
+import time
+from threading import Lock
+from typing import Any, Callable, Optional
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the breaker is open"""
+
+    def __init__(self, name: str, retry_after: int):
+        super().__init__(f"{name} circuit is open")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Thread-safe consecutive-failure circuit breaker"""
+
+    def __init__(self, name: str, fail_max: int = 5, reset_timeout: float = 30,
+                 is_failure: Optional[Callable[[Exception], bool]] = None):
+        self.name = name
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.is_failure = is_failure or (lambda exc: True)
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = Lock()
+
+    def _check(self) -> bool:
+        """Raise while open; return True if the caller is the half-open trial"""
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0:
+                raise CircuitOpenError(self.name, int(remaining) + 1)
+            # Half-open: only one trial call at a time, everyone else still fails fast
+            if self._trial_in_flight:
+                raise CircuitOpenError(self.name, 1)
+            self._trial_in_flight = True
+            return True
+
+    def _close(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Call `func`, tracking failures and failing fast while open"""
+        is_trial = self._check()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            counted = self.is_failure(e)
+            with self._lock:
+                if counted:
+                    self._failures += 1
+                    if is_trial or self._failures >= self.fail_max:
+                        # A failed trial re-opens the breaker for another full timeout
+                        self._opened_at = time.monotonic()
+                        self._trial_in_flight = False
+                elif is_trial:
+                    # The provider answered, so it is reachable again
+                    self._close()
+            raise
+        with self._lock:
+            self._close()
+        return result
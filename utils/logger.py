@@ -5,6 +5,11 @@ import sys
 import json
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # optional; fall back to stdlib json
+    orjson = None
+
 # Configure logging
 log_level = os.environ.get('LOG_LEVEL', 'INFO').upper()
 logging.basicConfig(
@@ -17,14 +22,27 @@ logging.basicConfig(
 
 logger = logging.getLogger('founders_matching')
 
+
+def _dumps(metadata: dict) -> str:
+    """Encode log metadata as JSON, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(metadata, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(metadata)
+
+def _format_message(message: str, metadata: dict = None) -> str:
+    """Append JSON-encoded metadata to a log message"""
+    if not metadata:
+        return message
+    try:
+        return f"{message} | {_dumps(metadata)}"
+    except:
+        return f"{message} | {str(metadata)}"
+
 def log_error(message: str, error: Exception = None, traceback_str: str = None, metadata: dict = None):
     """Log error with optional exception, traceback, and metadata"""
-    log_msg = message
-    if metadata:
-        try:
-            log_msg = f"{message} | {json.dumps(metadata)}"
-        except:
-            log_msg = f"{message} | {str(metadata)}"
+    if not logger.isEnabledFor(logging.ERROR):
+        return
+    log_msg = _format_message(message, metadata)
     
     if error:
         logger.error(f"{log_msg}: {str(error)}", exc_info=error)
@@ -35,33 +53,18 @@ def log_error(message: str, error: Exception = None, traceback_str: str = None,
 
 def log_warning(message: str, metadata: dict = None):
     """Log warning with optional metadata"""
-    log_msg = message
-    if metadata:
-        try:
-            log_msg = f"{message} | {json.dumps(metadata)}"
-        except:
-            log_msg = f"{message} | {str(metadata)}"
-    logger.warning(log_msg)
+    if logger.isEnabledFor(logging.WARNING):
+        logger.warning(_format_message(message, metadata))
 
 def log_info(message: str, metadata: dict = None):
     """Log info with optional metadata"""
-    log_msg = message
-    if metadata:
-        try:
-            log_msg = f"{message} | {json.dumps(metadata)}"
-        except:
-            log_msg = f"{message} | {str(metadata)}"
-    logger.info(log_msg)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(_format_message(message, metadata))
 
 def log_debug(message: str, metadata: dict = None):
     """Log debug (only in development) with optional metadata"""
-    log_msg = message
-    if metadata:
-        try:
-            log_msg = f"{message} | {json.dumps(metadata)}"
-        except:
-            log_msg = f"{message} | {str(metadata)}"
-    logger.debug(log_msg)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(_format_message(message, metadata))
 
 
 def sanitize_error_for_user(error: Exception) -> str:
@@ -0,0 +1,24 @@
+"""
+Run independent blocking calls concurrently.
+Request handlers often issue several PostgREST queries that do not depend on
+each other; running them on a shared thread pool turns N serial round-trips
+into roughly one. Calls run outside the request thread, so they must not rely
+on request-scoped state (flask.request, utils.request_cache).
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List
+
+PARALLEL_WORKERS = int(os.environ.get('PARALLEL_WORKERS', '16'))
+
+_executor = ThreadPoolExecutor(max_workers=PARALLEL_WORKERS, thread_name_prefix='parallel')
+
+
+def gather(*calls: Callable[[], Any]) -> List[Any]:
+    """Run zero-argument callables concurrently and return their results in order.
+    The first exception raised by any call is re-raised.
+    """
+    if len(calls) <= 1:
+        return [call() for call in calls]
+    futures = [_executor.submit(call) for call in calls]
+    return [future.result() for future in futures]
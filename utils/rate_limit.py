@@ -1,26 +1,54 @@
 """Rate limiting configuration for API endpoints"""
+from flask import g, request
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 import os
 
+from utils.logger import log_warning
+
+# Connection pool for a Redis-backed limiter (one pool per worker process);
+# limit checks run on every request, so keep them on warm connections and
+# fail fast if Redis stalls
+RATE_LIMIT_REDIS_MAX_CONNECTIONS = int(os.environ.get('RATE_LIMIT_REDIS_MAX_CONNECTIONS', '50'))
+RATE_LIMIT_REDIS_TIMEOUT = float(os.environ.get('RATE_LIMIT_REDIS_TIMEOUT', '0.5'))
+
 def get_rate_limit_key():
-    """Get rate limit key function - uses Clerk user ID if available, otherwise IP"""
-    from flask import request
-    clerk_user_id = request.headers.get('X-Clerk-User-Id')
-    if clerk_user_id:
-        return f"user:{clerk_user_id}"
-    return get_remote_address()
+    """Get rate limit key function - uses Clerk user ID if available, otherwise IP
+    Flask-Limiter calls this once per limit it checks, so the key is computed
+    once per request and kept on flask.g.
+    """
+    key = g.get('_rate_limit_key')
+    if key is None:
+        clerk_user_id = request.headers.get('X-Clerk-User-Id')
+        key = f"user:{clerk_user_id}" if clerk_user_id else get_remote_address()
+        g._rate_limit_key = key
+    return key
 
 def init_rate_limiter(app):
     """Initialize rate limiter with Flask app"""
     # Default rate limits (per minute)
     default_limit = os.environ.get('RATE_LIMIT_DEFAULT', '100 per minute')
     
+    # Optional: Redis URL for distributed rate limiting. Without it each
+    # gunicorn worker counts separately, so limits are effectively multiplied
+    # by the number of workers.
+    storage_uri = os.environ.get('RATE_LIMIT_STORAGE_URI')
+    storage_options = {}
+    if storage_uri and storage_uri.startswith(('redis://', 'rediss://')):
+        storage_options = {
+            'max_connections': RATE_LIMIT_REDIS_MAX_CONNECTIONS,
+            'socket_timeout': RATE_LIMIT_REDIS_TIMEOUT,
+            'socket_connect_timeout': RATE_LIMIT_REDIS_TIMEOUT,
+        }
+    elif not storage_uri and os.environ.get('FLASK_ENV') == 'production':
+        log_warning("RATE_LIMIT_STORAGE_URI is not set; rate limits are counted per worker process")
+    
     limiter = Limiter(
         app=app,
         key_func=get_rate_limit_key,
         default_limits=[default_limit],
-        storage_uri=os.environ.get('RATE_LIMIT_STORAGE_URI'),  # Optional: Redis URL for distributed rate limiting
+        storage_uri=storage_uri,
+        storage_options=storage_options,
         headers_enabled=True  # Include rate limit headers in response
     )
     
@@ -1,11 +1,14 @@
 """
 Request-scoped cache for reducing redundant database queries.
-This cache is cleared at the end of each request.
+This cache is cleared at the end of each request; founder_id lookups are
+additionally kept in a short-lived process-wide cache.
 """
 from threading import local
 from typing import Any, Optional, Dict
 from functools import wraps
 
+from utils.ttl_cache import TTLCache
+
 # Thread-local storage for request-scoped data
 _request_local = local()
 
@@ -40,15 +43,43 @@ def cache_delete(key: str) -> None:
         del cache[key]
 
 
+# clerk_user_id -> founder_id never changes once a founder row exists (account
+# deletion is a soft delete), so it is also kept process-wide across requests
+_founder_id_cache = TTLCache(maxsize=10000, ttl=300)
+
+
 # Cached founder data accessors
 def get_cached_founder_id(clerk_user_id: str) -> Optional[str]:
-    """Get cached founder_id for a clerk_user_id"""
-    return cache_get(f'founder_id:{clerk_user_id}')
+    """Get cached founder_id for a clerk_user_id (request cache, then process cache)"""
+    founder_id = cache_get(f'founder_id:{clerk_user_id}')
+    if founder_id is None:
+        founder_id = _founder_id_cache.get(clerk_user_id)
+        if founder_id is not None:
+            cache_set(f'founder_id:{clerk_user_id}', founder_id)
+    return founder_id
 
 
 def set_cached_founder_id(clerk_user_id: str, founder_id: str) -> None:
     """Cache founder_id for a clerk_user_id"""
     cache_set(f'founder_id:{clerk_user_id}', founder_id)
+    _founder_id_cache.set(clerk_user_id, founder_id)
+
+
+def cached_founder_id(func):
+    """
+    Decorator for clerk_user_id -> founder_id lookups.
+    Checks the request and process caches before calling the lookup and
+    stores whatever it finds; misses (None or an exception) are not cached.
+    """
+    @wraps(func)
+    def wrapper(clerk_user_id, *args, **kwargs):
+        founder_id = get_cached_founder_id(clerk_user_id)
+        if founder_id is None:
+            founder_id = func(clerk_user_id, *args, **kwargs)
+            if founder_id is not None:
+                set_cached_founder_id(clerk_user_id, founder_id)
+        return founder_id
+    return wrapper
 
 
 def get_cached_founder_data(clerk_user_id: str) -> Optional[Dict]:
@@ -71,6 +102,27 @@ def set_cached_plan(clerk_user_id: str, plan: Dict) -> None:
     cache_set(f'plan:{clerk_user_id}', plan)
 
 
+def get_cached_workspace_access(clerk_user_id: str, workspace_id: str) -> Optional[Dict]:
+    """Get the cached workspace access check for this request"""
+    return cache_get(f'workspace_access:{clerk_user_id}:{workspace_id}')
+
+
+def set_cached_workspace_access(clerk_user_id: str, workspace_id: str, access: Dict) -> None:
+    """Cache a workspace access check for the rest of this request"""
+    cache_set(f'workspace_access:{clerk_user_id}:{workspace_id}', access)
+
+
+def invalidate_cached_workspace_access(workspace_id: Optional[str] = None,
+                                       clerk_user_id: Optional[str] = None) -> None:
+    """Drop this request's workspace access checks for a workspace and/or user"""
+    cache = get_cache()
+    for key in [k for k in cache if k.startswith('workspace_access:')]:
+        _, key_user, key_workspace = key.split(':', 2)
+        if ((workspace_id is None or key_workspace == workspace_id) and
+                (clerk_user_id is None or key_user == clerk_user_id)):
+            del cache[key]
+
+
 def cached(key_prefix: str):
     """
     Decorator for caching function results.
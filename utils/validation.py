@@ -1,8 +1,17 @@
 """Input validation and sanitization utilities"""
 import re
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 from flask import request
 
+# Precompiled patterns
+_EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_URL_PATTERN = re.compile(r'^https?://[^\s/$.?#].[^\s]*$')
+
+# Control characters stripped by sanitize_string (everything below 0x20
+# except tab, newline and carriage return), as a str.translate table
+_CONTROL_CHARS_TABLE = dict.fromkeys([*range(0x00, 0x09), 0x0b, 0x0c, *range(0x0e, 0x20)])
+
 
 def sanitize_string(value: Any, max_length: Optional[int] = None, allow_empty: bool = True) -> Optional[str]:
     """Sanitize string input"""
@@ -13,7 +22,7 @@ def sanitize_string(value: Any, max_length: Optional[int] = None, allow_empty: b
     sanitized = str(value).strip()
     
     # Remove null bytes and control characters (except newlines and tabs)
-    sanitized = re.sub(r'[\x00-\x08\x0b-\x0c\x0e-\x1f]', '', sanitized)
+    sanitized = sanitized.translate(_CONTROL_CHARS_TABLE)
     
     # Enforce max length
     if max_length and len(sanitized) > max_length:
@@ -26,16 +35,14 @@ def validate_email(email: str) -> bool:
     """Validate email format"""
     if not email:
         return False
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    return bool(_EMAIL_PATTERN.match(email))
 
 
 def validate_url(url: str) -> bool:
     """Validate URL format"""
     if not url:
         return False
-    pattern = r'^https?://[^\s/$.?#].[^\s]*$'
-    return bool(re.match(pattern, url))
+    return bool(_URL_PATTERN.match(url))
 
 
 def sanitize_list(value: Any, max_items: Optional[int] = None) -> List[str]:
@@ -70,6 +77,14 @@ def validate_integer(value: Any, min_value: Optional[int] = None, max_value: Opt
         return None
 
 
+@lru_cache(maxsize=256)
+def _enum_set(allowed_values: tuple, case_sensitive: bool) -> frozenset:
+    """Allowed enum values as a set, built once per distinct list of values"""
+    if case_sensitive:
+        return frozenset(allowed_values)
+    return frozenset(v.upper() for v in allowed_values)
+
+
 def validate_enum(value: Any, allowed_values: List[str], case_sensitive: bool = True) -> Optional[str]:
     """Validate value is in allowed enum values"""
     if not value:
@@ -79,9 +94,8 @@ def validate_enum(value: Any, allowed_values: List[str], case_sensitive: bool =
     
     if not case_sensitive:
         str_value = str_value.upper()
-        allowed_values = [v.upper() for v in allowed_values]
     
-    return str_value if str_value in allowed_values else None
+    return str_value if str_value in _enum_set(tuple(allowed_values), case_sensitive) else None
 
 
 def sanitize_json_input(data: Dict[str, Any], schema: Dict[str, Any]) -> Dict[str, Any]: